@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:12
+
+import olympic_games_ticketing.uuids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_alter_user_registration_key'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='registration_key',
+            field=models.UUIDField(default=olympic_games_ticketing.uuids.default_uuid, editable=False),
+        ),
+    ]
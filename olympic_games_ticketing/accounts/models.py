@@ -1,7 +1,6 @@
-import uuid
-
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from olympic_games_ticketing.uuids import default_uuid
 
 from accounts.managers import CustomUserManager
 from accounts.validators import name_validator
@@ -19,8 +18,8 @@ class User(AbstractUser):
     full name is always provided. Those fields are also validated using a name
     validation regex.
 
-    The 'registration_key' field creates a random UUID and the 'editable' attribute
-    is set to False.
+    The 'registration_key' field creates a UUID (random, or time-ordered when
+    USE_TIME_ORDERED_UUIDS is enabled) and the 'editable' attribute is set to False.
     """
 
     username = None
@@ -34,7 +33,7 @@ class User(AbstractUser):
         max_length=150, validators=[name_validator], verbose_name="Nom"
     )
     registration_key = models.UUIDField(
-        default=uuid.uuid4,
+        default=default_uuid,
         editable=False,
     )
 
@@ -1,7 +1,6 @@
-import uuid
-
 from django.db import IntegrityError
 from django.test import TestCase
+from olympic_games_ticketing.uuids import default_uuid
 
 from accounts.models import User
 
@@ -108,10 +107,10 @@ class TestCustomUserModel(TestCase):
         """Test that a registration key is generated for the user."""
         self.assertIsNotNone(self.user.registration_key)
 
-    def test_registration_key_field_default_attribute_is_uuid4(self):
-        """Test that registration key default attribute is 'uuid.uuid4'."""
+    def test_registration_key_field_default_attribute_is_default_uuid(self):
+        """Test that registration key default attribute is 'default_uuid'."""
         registration_key_field = self.user._meta.get_field("registration_key")
-        self.assertIs(registration_key_field.default, uuid.uuid4)
+        self.assertIs(registration_key_field.default, default_uuid)
 
     def test_registration_key_field_editable_attribute_is_false(self):
         """Test that registration key is not editable."""
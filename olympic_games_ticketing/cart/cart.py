@@ -1,18 +1,31 @@
-from decimal import Decimal
-
-from products.models import Offer
+from products.catalog import get_catalog
+from products.money import from_cents
+from products.pricing import total_cents
 
 
 class Cart:
-    """Manage the shopping cart stored in the user's session."""
+    """
+    Manage the shopping cart stored in the user's session.
+
+    The session only holds `{offer_id: quantity}`; names, images, seats and
+    prices are read from the shared cached catalog when the cart is displayed.
+    """
 
     def __init__(self, request):
-        """Ensure a cart exists in the session, creating it if absent."""
+        """
+        Ensure a cart exists in the session, creating it if absent, and convert
+        carts stored in the former format (a dict of offer details per offer).
+        """
         self.session = request.session
         cart = self.session.get("session_key")
 
-        if "session_key" not in request.session:
+        if cart is None:
             cart = self.session["session_key"] = {}
+        elif any(isinstance(item, dict) for item in cart.values()):
+            cart = self.session["session_key"] = {
+                offer_id: item["quantity"] if isinstance(item, dict) else item
+                for offer_id, item in cart.items()
+            }
 
         self.cart = cart
 
@@ -20,19 +33,12 @@ class Cart:
         """
         Add a single offer to the cart.
 
-        Each offer can only appear once in the cart. If the offer is not already
-        in the cart, it is added with its details.
+        Each offer can only appear once in the cart.
         """
         offer_id = str(offer.id)
 
         if offer_id not in self.cart:
-            self.cart[offer_id] = {
-                "name": offer.name,
-                "image": offer.thumbnail.url,
-                "seats": offer.seats,
-                "price": str(offer.price),
-                "quantity": 1,
-            }
+            self.cart[offer_id] = 1
 
         self.save()
 
@@ -50,32 +56,41 @@ class Cart:
 
     def __iter__(self):
         """
-        Iterate over the items in the cart and enrich them with related Offer objects,
-        decimal prices, and total line prices.
+        Iterate over the cart lines of the offers still on sale, as new dicts
+        holding the catalog offer, its current price, the quantity and the line
+        total. The session data is never modified.
         """
-        offer_ids = self.cart.keys()
-        offers = Offer.objects.filter(is_active=True, id__in=offer_ids)
-        cart = self.cart.copy()
-
-        for offer in offers:
-            cart[str(offer.id)]["offer"] = offer
-
-        for item in cart.values():
-            item["price"] = Decimal(item["price"])
-            item["total_price"] = item["price"] * item["quantity"]
-            yield item
+        catalog = get_catalog()
+
+        for offer_id, quantity in self.cart.items():
+            offer = catalog.get(int(offer_id))
+            if offer is None:
+                continue
+            yield {
+                "offer": offer,
+                "name": offer.name,
+                "price": offer.price,
+                "quantity": quantity,
+                "total_price": from_cents(offer.price_cents * quantity),
+            }
 
     def __len__(self):
         """
         Return the total quantity of all items in the cart.
         """
-        return sum(item["quantity"] for item in self.cart.values())
+        return sum(self.cart.values())
+
+    def get_quantities(self):
+        """Return the quantity of each offer in the cart, keyed by offer id."""
+        return {int(offer_id): quantity for offer_id, quantity in self.cart.items()}
 
     def get_total_price(self):
-        """Return the total price of the cart."""
-        return sum(
-            Decimal(item["price"]) * item["quantity"] for item in self.cart.values()
-        )
+        """
+        Return the total price of the cart at current prices, leaving out the
+        offers that are no longer on sale (0 when there is nothing to pay).
+        """
+        cents = total_cents(self.get_quantities())
+        return from_cents(cents) if cents else 0
 
     def clear(self):
         """Remove all items from the cart and clear the session data."""
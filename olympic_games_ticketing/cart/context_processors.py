@@ -1,6 +1,13 @@
+from django.utils.functional import SimpleLazyObject
+
 from .cart import Cart
 
 
 def cart(request):
-    """Add the shopping cart instance to the template context."""
-    return {"cart": Cart(request)}
+    """
+    Add the shopping cart instance to the template context.
+
+    The cart is created on first use, so pages that do not display it do not
+    touch the session.
+    """
+    return {"cart": SimpleLazyObject(lambda: Cart(request))}
@@ -0,0 +1,84 @@
+import copy
+from types import SimpleNamespace
+
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
+from django.test import TestCase
+from products.models import Offer
+
+from cart.cart import Cart
+
+
+class TestCart(TestCase):
+    """Tests for the session cart."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up two offers on sale and one withdrawn from sale."""
+        cls.solo = Offer.objects.create(name="Solo", slug="solo", price=25)
+        cls.duo = Offer.objects.create(name="Duo", slug="duo", seats=2, price=45)
+        cls.withdrawn = Offer.objects.create(
+            name="Famille", slug="famille", seats=4, price=80, is_active=False
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.request = SimpleNamespace(session=SessionStore())
+
+    def test_session_only_stores_offer_ids_and_quantities(self):
+        """Verify the compact representation persisted in the session."""
+        cart = Cart(self.request)
+        cart.add_offer(self.solo)
+        cart.add_offer(self.duo)
+        cart.add_offer(self.solo)
+        self.assertEqual(
+            self.request.session["session_key"],
+            {str(self.solo.pk): 1, str(self.duo.pk): 1},
+        )
+        self.assertEqual(len(cart), 2)
+
+    def test_former_session_format_is_converted_on_read(self):
+        """Verify that carts holding offer details are reduced to quantities."""
+        self.request.session["session_key"] = {
+            str(self.duo.pk): {
+                "name": "Duo",
+                "image": "/media/images/duo.jpg",
+                "seats": 2,
+                "price": "40.00",
+                "quantity": 1,
+            }
+        }
+        cart = Cart(self.request)
+        self.assertEqual(self.request.session["session_key"], {str(self.duo.pk): 1})
+        self.assertEqual(cart.get_total_price(), 45)
+
+    def test_iteration_hydrates_lines_from_the_catalog(self):
+        """Verify the lines, the skipped withdrawn offer and the total."""
+        cart = Cart(self.request)
+        for offer in (self.solo, self.duo, self.withdrawn):
+            cart.add_offer(offer)
+        lines = list(cart)
+        self.assertEqual([line["name"] for line in lines], ["Solo", "Duo"])
+        self.assertEqual(lines[1]["offer"].seats, 2)
+        self.assertEqual(lines[1]["total_price"], 45)
+        self.assertEqual(cart.get_total_price(), 70)
+
+    def test_iteration_never_mutates_the_session(self):
+        """Verify that iterating leaves the persisted cart untouched."""
+        cart = Cart(self.request)
+        cart.add_offer(self.solo)
+        self.request.session.modified = False
+        before = copy.deepcopy(self.request.session["session_key"])
+        list(cart)
+        list(cart)
+        self.assertEqual(self.request.session["session_key"], before)
+        self.assertFalse(self.request.session.modified)
+
+    def test_iteration_reads_the_cached_catalog(self):
+        """Verify that displaying the cart costs no query once cached."""
+        cart = Cart(self.request)
+        cart.add_offer(self.solo)
+        list(cart)
+        with self.assertNumQueries(0):
+            list(cart)
+            cart.get_total_price()
@@ -1,4 +1,5 @@
 from accounts.models import User
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
 from django.urls import reverse
@@ -164,6 +165,16 @@ class TestAddOfferToCartView(TestCase):
         )
         self.assertEqual(response.json(), {"quantity": 2})
 
+    def test_add_offer_not_on_sale_returns_404(self):
+        """Test that offers withdrawn from sale cannot be added to the cart."""
+        Offer.objects.filter(pk=2).update(is_active=False)
+        cache.clear()
+        self.addCleanup(cache.clear)
+        response = self.client.post(
+            self.cart_add_url, {"offer_id": 2, "action": "post"}, xhr=True
+        )
+        self.assertEqual(response.status_code, 404)
+
 
 class TestRemoveOfferFromCartView(TestCase):
     """Tests for verifying the behavior of the remove offer from cart view."""
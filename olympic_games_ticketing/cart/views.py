@@ -1,7 +1,7 @@
 from django.contrib.auth.decorators import login_required
-from django.http import JsonResponse
-from django.shortcuts import get_object_or_404, render
-from products.models import Offer
+from django.http import Http404, JsonResponse
+from django.shortcuts import render
+from products.catalog import get_catalog
 
 from .cart import Cart
 
@@ -25,13 +25,16 @@ def add_offer_to_cart(
     """
     Add an offer to the shopping cart.
 
-    Handles POST requests to add a single offer to the cart.
+    Handles POST requests to add a single offer to the cart. Only offers on
+    sale, as listed in the cached catalog, can be added.
     """
     cart = Cart(request)
 
     if request.POST.get("action") == "post":
         offer_id = int(request.POST.get("offer_id"))
-        offer = get_object_or_404(Offer, id=offer_id)
+        offer = get_catalog().get(offer_id)
+        if offer is None:
+            raise Http404("Cette offre n'est pas en vente.")
         cart.add_offer(offer=offer)
         cart_quantity = cart.__len__()
         response = JsonResponse({"quantity": cart_quantity})
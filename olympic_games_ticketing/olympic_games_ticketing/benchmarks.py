@@ -0,0 +1,186 @@
+"""
+Helpers shared by the benchmark management commands.
+
+Benchmarks seed synthetic data in bulk inside a transaction that is rolled
+back at the end, so they can run against any database without leaving data
+behind.
+"""
+
+import statistics
+import time
+from contextlib import contextmanager
+from decimal import Decimal
+from importlib import import_module
+
+from accounts.models import User
+from cart.cart import Cart
+from django.conf import settings
+from django.db import transaction
+from django.test import RequestFactory
+from orders.models import Order, OrderItem
+from products.models import Offer
+from tickets.models import Ticket
+
+
+class _Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back(using="default"):
+    """Run the block in a transaction that is always rolled back."""
+    try:
+        with transaction.atomic(using=using):
+            yield
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+def time_call(func, repeat=20):
+    """Call `func` `repeat` times and return the median duration in milliseconds."""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def _bulk_create(model, objects, batch_size):
+    created = []
+    for start in range(0, len(objects), batch_size):
+        created += model.objects.bulk_create(objects[start : start + batch_size])
+    return created
+
+
+def seed_orders(
+    users=1000, orders=10000, tickets_per_order=2, offers=20, batch_size=2000
+):
+    """
+    Bulk-insert a synthetic catalog and order history.
+
+    Creates `offers` offers (one in five inactive), `users` users, and
+    `orders` orders spread evenly over the users, each with one order item
+    and `tickets_per_order` tickets. Returns the created offers, users and
+    orders.
+    """
+    offer_objects = _bulk_create(
+        Offer,
+        [
+            Offer(
+                name=f"Benchmark offer {i}",
+                slug=f"benchmark-offer-{i}",
+                description="",
+                seats=1 + i % 4,
+                price=Decimal(25 + i % 4 * 20),
+                is_active=i % 5 != 0,
+            )
+            for i in range(offers)
+        ],
+        batch_size,
+    )
+    user_objects = _bulk_create(
+        User,
+        [
+            User(
+                email=f"benchmark-{i}@example.com",
+                first_name="Benchmark",
+                last_name="User",
+                password="!",
+            )
+            for i in range(users)
+        ],
+        batch_size,
+    )
+
+    order_objects = []
+    for start in range(0, orders, batch_size):
+        batch = _bulk_create(
+            Order,
+            [
+                Order(user=user_objects[i % users], total=Decimal(25))
+                for i in range(start, min(start + batch_size, orders))
+            ],
+            batch_size,
+        )
+        items = []
+        tickets = []
+        for order in batch:
+            offer = offer_objects[order.pk % offers]
+            items.append(
+                OrderItem(
+                    order=order,
+                    offer=offer,
+                    name=offer.name,
+                    price=offer.price,
+                    quantity=1,
+                )
+            )
+            for seat in range(tickets_per_order):
+                ticket = Ticket(
+                    order=order,
+                    offer=offer,
+                    final_key=f"benchmark-{order.pk}-{seat}",
+                )
+                ticket.assign_final_key()
+                tickets.append(ticket)
+        _bulk_create(OrderItem, items, batch_size)
+        _bulk_create(Ticket, tickets, batch_size)
+        order_objects += batch
+
+    return offer_objects, user_objects, order_objects
+
+
+def benchmark_pages(user, order):
+    """
+    Return the template, context and request of the pages extending
+    base.html, keyed by label: home, offers list, offer detail, a cart
+    holding every offer on sale and the confirmation of `order`, as seen by
+    `user`.
+    """
+    factory = RequestFactory()
+    engine = import_module(settings.SESSION_ENGINE)
+
+    def request_for(path):
+        request = factory.get(path)
+        request.user = user
+        request.session = engine.SessionStore()
+        return request
+
+    offers = list(Offer.objects.filter(is_active=True).order_by("seats"))
+    cart_request = request_for("/cart/summary/")
+    cart = Cart(cart_request)
+    for offer in offers:
+        cart.add_offer(offer)
+
+    tickets = list(Ticket.objects.filter(order=order).select_related("offer"))
+    tickets_by_offer = {}
+    for ticket in tickets:
+        # The QR images are only referenced by URL: no need to render them.
+        ticket.qr_code.name = ticket.qr_code_filename
+        tickets_by_offer.setdefault(ticket.offer.name, []).append(ticket)
+
+    return {
+        "home": ("home.html", {"hydrate_header": True}, request_for("/")),
+        "offers list": (
+            "products/offers-list.html",
+            {"offers": offers, "hydrate_header": True},
+            request_for("/products/offers/"),
+        ),
+        "offer detail": (
+            "products/offer-detail.html",
+            {"offer": offers[0]},
+            request_for(f"/products/offers/{offers[0].slug}/"),
+        ),
+        "cart summary": (
+            "cart/cart-summary.html",
+            {"cart": cart},
+            cart_request,
+        ),
+        "order confirmation": (
+            "orders/order-confirmation.html",
+            {"order": order, "tickets_by_offer": tickets_by_offer},
+            request_for("/orders/create/"),
+        ),
+    }
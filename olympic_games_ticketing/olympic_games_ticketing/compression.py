@@ -0,0 +1,185 @@
+"""
+Compression of the dynamic responses (HTML pages, JSON, exports).
+
+Static files and the prerendered pages (see `prerender.py`) are compressed
+ahead of time and served by WhiteNoise; `CompressionMiddleware` covers
+everything rendered by the views. It prefers brotli, when the `brotli`
+package is installed and the client accepts it, over gzip, except for the
+responses holding a CSRF token: unlike gzip, brotli output is not padded with
+random bytes against the BREACH attack.
+"""
+
+import re
+
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from django.utils.text import compress_sequence, compress_string
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Media types worth compressing; images, PDF and ZIP files are already
+# compressed.
+COMPRESSIBLE_CONTENT_TYPES = {
+    "application/javascript",
+    "application/json",
+    "application/x-ndjson",
+    "application/xml",
+    "image/svg+xml",
+}
+
+_ACCEPT_ENCODING_RE = re.compile(r"\s*([\w*-]+)\s*(?:;\s*q\s*=\s*([\d.]+))?\s*")
+
+# Random bytes added to gzip bodies, as in Django's GZipMiddleware, to
+# mitigate the BREACH attack.
+GZIP_MAX_RANDOM_BYTES = 100
+
+
+def accepted_encodings(header):
+    """
+    Return the quality of each content coding of an Accept-Encoding header,
+    keyed by coding.
+    """
+    encodings = {}
+    for part in header.split(","):
+        match = _ACCEPT_ENCODING_RE.fullmatch(part)
+        if match is None:
+            continue
+        coding, quality = match.groups()
+        try:
+            encodings[coding.lower()] = float(quality) if quality else 1.0
+        except ValueError:
+            continue
+    return encodings
+
+
+def negotiate_encoding(header, allow_brotli=True):
+    """
+    Return the coding to compress a response with, "br" or "gzip", or None.
+
+    The coding with the highest quality wins; on a tie brotli is preferred
+    for its better ratio. Codings with a quality of 0 are refused, and so is
+    brotli without `allow_brotli`.
+    """
+    encodings = accepted_encodings(header)
+    wildcard = encodings.get("*", 0)
+    best_quality, best_coding = 0, None
+    codings = ("br", "gzip") if brotli is not None and allow_brotli else ("gzip",)
+    for coding in codings:
+        quality = encodings.get(coding, wildcard)
+        if quality > best_quality:
+            best_quality, best_coding = quality, coding
+    return best_coding
+
+
+def compress_brotli(data):
+    return brotli.compress(data, quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+
+def compress_brotli_sequence(sequence):
+    """
+    Compress the chunks as they come, yielding compressed data whenever the
+    compressor produces some, like Django's `compress_sequence()` for gzip.
+    """
+    compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+    for chunk in sequence:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _compress_brotli_async(iterator):
+    compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+    async for chunk in iterator:
+        data = compressor.process(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+
+async def _compress_gzip_async(iterator):
+    async for chunk in iterator:
+        yield compress_string(chunk, max_random_bytes=GZIP_MAX_RANDOM_BYTES)
+
+
+def _holds_csrf_token(request):
+    # get_token() flags the CSRF cookie for an update; CsrfViewMiddleware
+    # resets the flag once the cookie is set, but leaves it in request.META.
+    return "CSRF_COOKIE_NEEDS_UPDATE" in request.META
+
+
+def _is_compressible(response):
+    content_type = response.get("Content-Type", "").split(";")[0].strip().lower()
+    return (
+        content_type.startswith("text/") or content_type in COMPRESSIBLE_CONTENT_TYPES
+    )
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """
+    Compress responses with brotli or gzip, as negotiated with the client.
+
+    - Bodies shorter than `COMPRESSION_MIN_LENGTH` bytes, already encoded
+      responses and media types that do not compress are left as is.
+    - Streamed responses are compressed as they are produced, so exports
+      keep streaming without their whole body in memory.
+    - Non-streamed bodies are only replaced when compression shrinks them.
+    - Responses that used the CSRF token are only gzipped, with random
+      padding, so their length does not reveal the token (BREACH).
+    """
+
+    def process_response(self, request, response):
+        if not response.streaming and (
+            len(response.content) < settings.COMPRESSION_MIN_LENGTH
+        ):
+            return response
+        if response.has_header("Content-Encoding") or not _is_compressible(response):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        coding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", ""),
+            allow_brotli=not _holds_csrf_token(request),
+        )
+        if coding is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                compress = (
+                    _compress_brotli_async if coding == "br" else _compress_gzip_async
+                )
+                response.streaming_content = compress(response.streaming_content)
+            elif coding == "br":
+                response.streaming_content = compress_brotli_sequence(
+                    response.streaming_content
+                )
+            else:
+                response.streaming_content = compress_sequence(
+                    response.streaming_content,
+                    max_random_bytes=GZIP_MAX_RANDOM_BYTES,
+                )
+            del response.headers["Content-Length"]
+        else:
+            if coding == "br":
+                compressed = compress_brotli(response.content)
+            else:
+                compressed = compress_string(
+                    response.content, max_random_bytes=GZIP_MAX_RANDOM_BYTES
+                )
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        # A strong ETag would claim the compressed body is byte-for-byte the
+        # uncompressed one.
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = coding
+        return response
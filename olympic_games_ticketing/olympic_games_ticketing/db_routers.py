@@ -0,0 +1,106 @@
+"""
+Routing of the catalog and order history reads to a read replica.
+
+When a `replica` database is configured, reads of the offers, orders, order
+items, tickets and sales rollups go to it, and everything else, including
+every write, to `default` (the primary). Reads that must see the latest
+writes stay on the primary:
+
+- reads inside a transaction on the primary;
+- reads inside `pin_to_primary()`, used by the caches, which must not be
+  filled from a lagging replica;
+- every request of a visitor for `REPLICA_PIN_SECONDS` after one of their
+  writes (checkout, then its confirmation page), through
+  `ReplicaPinningMiddleware`.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA_DB_ALIAS = "replica"
+
+REPLICA_PIN_COOKIE = "pin_primary"
+
+# Models whose reads may be served by the replica, by label.
+REPLICA_MODELS = {
+    "products.offer",
+    "orders.order",
+    "orders.orderitem",
+    "orders.salesrollup",
+    "tickets.ticket",
+}
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+_pinned = ContextVar("pinned_to_primary", default=False)
+
+
+def replica_configured():
+    return REPLICA_DB_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def pin_to_primary():
+    """Send every read of the block to the primary database."""
+    token = _pinned.set(True)
+    try:
+        yield
+    finally:
+        _pinned.reset(token)
+
+
+class ReplicaRouter:
+    """Database router sending the catalog and order history reads to the replica."""
+
+    def db_for_read(self, model, **hints):
+        if (
+            model._meta.label_lower in REPLICA_MODELS
+            and replica_configured()
+            and not _pinned.get()
+            and not connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return REPLICA_DB_ALIAS
+        return None
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary.
+        return {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+
+
+class ReplicaPinningMiddleware:
+    """
+    Pin the requests of a visitor to the primary after they wrote.
+
+    Requests with an unsafe method read from the primary and set a cookie
+    that pins the visitor's next requests for `REPLICA_PIN_SECONDS`, longer
+    than the replication lag, so they read their own writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        writes = request.method not in SAFE_METHODS
+        if not writes and REPLICA_PIN_COOKIE not in request.COOKIES:
+            return self.get_response(request)
+
+        with pin_to_primary():
+            response = self.get_response(request)
+        if writes:
+            response.set_cookie(
+                REPLICA_PIN_COOKIE,
+                "1",
+                max_age=settings.REPLICA_PIN_SECONDS,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
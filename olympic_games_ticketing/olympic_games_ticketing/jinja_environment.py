@@ -0,0 +1,25 @@
+"""
+Jinja2 environment for the optional Jinja2 template backend.
+
+With `USE_JINJA2_TEMPLATES`, the hot pages (offers list, cart summary, order
+confirmation) are rendered from the equivalent templates in the `jinja2/`
+directories; every other page keeps its Django template. The templates get
+the same context processors plus the `static()` and `url()` helpers, and
+numbers and dates are localized on output as in Django templates.
+"""
+
+from django.templatetags.static import static
+from django.urls import reverse
+from django.utils.formats import localize
+from jinja2 import Environment
+
+
+def url(name, *args, **kwargs):
+    """Reverse a URL name, like the `{% url %}` tag."""
+    return reverse(name, args=args, kwargs=kwargs)
+
+
+def environment(**options):
+    env = Environment(finalize=localize, **options)
+    env.globals.update({"static": static, "url": url})
+    return env
@@ -0,0 +1,177 @@
+"""
+In-process stand-in for the S3 object API, used by tests and benchmarks.
+
+It serves path-style `PUT`, `HEAD`, `GET` and `DELETE` object requests from
+an in-memory dictionary over a local HTTP server, so the real boto3 client
+and connection pool are exercised without network access or AWS credentials.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+NO_SUCH_KEY = (
+    b'<?xml version="1.0" encoding="UTF-8"?>'
+    b"<Error><Code>NoSuchKey</Code><Message>Not found</Message></Error>"
+)
+SLOW_DOWN = (
+    b'<?xml version="1.0" encoding="UTF-8"?>'
+    b"<Error><Code>SlowDown</Code><Message>Please reduce your request rate.</Message>"
+    b"</Error>"
+)
+
+
+def _decode_aws_chunked(body):
+    """Strip the `aws-chunked` framing botocore uses for trailing checksums."""
+    data = []
+    position = 0
+    while True:
+        line_end = body.index(b"\r\n", position)
+        size = int(body[position:line_end].split(b";")[0], 16)
+        if size == 0:
+            return b"".join(data)
+        start = line_end + 2
+        data.append(body[start : start + size])
+        position = start + size + 2
+
+
+class _S3RequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connection_count += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _key(self):
+        return unquote(urlsplit(self.path).path).lstrip("/")
+
+    def _respond(self, status, body=b"", headers=None):
+        self.send_response(status)
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().split(b";")[0], 16)
+                if size == 0:
+                    while self.rfile.readline() not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(self.rfile.read(size))
+                self.rfile.readline()
+            body = b"".join(chunks)
+        else:
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if "aws-chunked" in self.headers.get("Content-Encoding", ""):
+            body = _decode_aws_chunked(body)
+        return body
+
+    def do_PUT(self):
+        body = self._read_body()
+        server = self.server
+        time.sleep(server.latency)
+        with server.lock:
+            server.put_count += 1
+            if server.failures_left:
+                server.failures_left -= 1
+                fail = True
+            else:
+                server.objects[self._key()] = body
+                fail = False
+        if fail:
+            self._respond(503, SLOW_DOWN, {"Content-Type": "application/xml"})
+        else:
+            self._respond(200, headers={"ETag": '"local"'})
+
+    def do_GET(self):
+        time.sleep(self.server.latency)
+        body = self.server.objects.get(self._key())
+        if body is None:
+            self._respond(404, NO_SUCH_KEY, {"Content-Type": "application/xml"})
+        else:
+            self._respond(200, body, {"Content-Type": "application/octet-stream"})
+
+    def do_HEAD(self):
+        time.sleep(self.server.latency)
+        if self._key() in self.server.objects:
+            self._respond(200, headers={"ETag": '"local"'})
+        else:
+            self._respond(404)
+
+    def do_DELETE(self):
+        with self.server.lock:
+            self.server.objects.pop(self._key(), None)
+        self._respond(204)
+
+
+class LocalS3Server(ThreadingHTTPServer):
+    """
+    Local S3 stand-in running in a background thread.
+
+    - `latency`: seconds added to every object request, to emulate the round
+      trip to the real service.
+    - `fail_next(count)`: answer the next `count` PUT requests with a 503
+      "SlowDown" error, to exercise client retries.
+
+    Usable as a context manager, which starts and stops the server.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, latency=0.0):
+        super().__init__(("127.0.0.1", 0), _S3RequestHandler)
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.objects = {}
+        self.connection_count = 0
+        self.put_count = 0
+        self.failures_left = 0
+        self._thread = None
+
+    @property
+    def endpoint_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def fail_next(self, count):
+        with self.lock:
+            self.failures_left = count
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def storage_options(self, bucket_name="local-bucket"):
+        """Return the settings pointing an S3 storage backend at this server."""
+        return {
+            "bucket_name": bucket_name,
+            "endpoint_url": self.endpoint_url,
+            "access_key": "local",
+            "secret_key": "local",
+            "region_name": "us-east-1",
+            "addressing_style": "path",
+            "custom_domain": None,
+        }
@@ -0,0 +1,36 @@
+"""
+Lightweight locks stored in the default cache.
+
+With Redis (`REDIS_URL` set) a lock is shared by every process and server;
+with the local-memory fallback it only covers the current process, which is
+enough for a single-process deployment and for development.
+"""
+
+import uuid
+from contextlib import contextmanager
+
+from django.core.cache import cache
+
+
+class LockUnavailable(Exception):
+    """Raised when a lock is already held by someone else."""
+
+
+@contextmanager
+def cache_lock(key, timeout):
+    """
+    Hold the lock `key` for the duration of the block, without waiting.
+
+    The lock is taken with an atomic `cache.add()` (`SET NX` on Redis) and
+    raises `LockUnavailable` immediately when it is already held. It expires
+    after `timeout` seconds, so a crashed process cannot hold it forever, and
+    is only released by its owner.
+    """
+    token = uuid.uuid4().hex
+    if not cache.add(key, token, timeout):
+        raise LockUnavailable(key)
+    try:
+        yield
+    finally:
+        if cache.get(key) == token:
+            cache.delete(key)
@@ -0,0 +1,167 @@
+"""
+Caching of the pages rendered the same for every visitor.
+
+Such pages render their header as for an anonymous visitor, with the
+`hydrate_header` template variable set; the visitor's links and cart
+quantity are then loaded from the `header-state` endpoint by `header.js`.
+
+`public_page` lets browsers and shared caches keep them; `cached_page`
+keeps their rendered response in the default cache, so only one worker at a
+time renders a page, even when a sale opens and its entry has just expired.
+"""
+
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.utils.cache import patch_cache_control
+
+from olympic_games_ticketing.db_routers import pin_to_primary
+from olympic_games_ticketing.locks import LockUnavailable, cache_lock
+
+PAGE_CACHE_GENERATION_KEY = "pages:generation"
+
+# How often a request finding no entry at all polls for the one being
+# rendered by another worker, in seconds.
+COLD_CACHE_POLL_INTERVAL = 0.05
+
+
+def _is_shareable(request, response):
+    """
+    Return whether a response is safe to share between visitors: it sets no
+    cookie and nothing visitor-specific (session, CSRF token) was read.
+    """
+    session = getattr(request, "session", None)
+    return not (
+        response.cookies
+        or (session is not None and session.accessed)
+        or request.META.get("CSRF_COOKIE_NEEDS_UPDATE")
+    )
+
+
+def public_page(view):
+    """
+    Let browsers and shared caches (CDN, proxies) keep the responses of a
+    view for `PUBLIC_PAGE_MAX_AGE` seconds.
+
+    Responses that turn out to depend on the visitor are marked private
+    instead.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if _is_shareable(request, response):
+            patch_cache_control(
+                response, public=True, max_age=settings.PUBLIC_PAGE_MAX_AGE
+            )
+        else:
+            patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wrapper
+
+
+def invalidate_pages():
+    """
+    Mark every cached page as stale.
+
+    Entries are not deleted: each is re-rendered by the next request for it,
+    while concurrent requests keep being served the stale copy.
+    """
+    cache.set(PAGE_CACHE_GENERATION_KEY, time.time_ns(), None)
+
+
+def _cache_key(request):
+    path = hashlib.md5(
+        request.get_full_path().encode(), usedforsecurity=False
+    ).hexdigest()
+    return f"pages:{path}"
+
+
+def _to_entry(response, generation):
+    return {
+        "content": response.content,
+        "status": response.status_code,
+        "headers": dict(response.items()),
+        "generation": generation,
+        "fresh_until": time.time() + settings.PAGE_CACHE_TIMEOUT,
+    }
+
+
+def _from_entry(entry):
+    return HttpResponse(
+        entry["content"], status=entry["status"], headers=entry["headers"]
+    )
+
+
+def _render(view, request, args, kwargs, key, generation):
+    """
+    Render the page and store it when it is the same for every visitor.
+
+    The page is rendered from the primary database, so a lagging replica
+    cannot put outdated offers back in the cache after an invalidation.
+    """
+    with pin_to_primary():
+        response = view(request, *args, **kwargs)
+    if (
+        response.status_code == 200
+        and not response.streaming
+        and _is_shareable(request, response)
+    ):
+        cache.set(
+            key,
+            _to_entry(response, generation),
+            settings.PAGE_CACHE_TIMEOUT + settings.PAGE_CACHE_STALE_TIMEOUT,
+        )
+    return response
+
+
+def cached_page(view):
+    """
+    Serve the GET and HEAD responses of a view from the default cache.
+
+    - An entry is fresh for `PAGE_CACHE_TIMEOUT` seconds and until
+      `invalidate_pages()` is called; it is then kept as a stale copy for
+      `PAGE_CACHE_STALE_TIMEOUT` more seconds.
+    - A stale or missing entry is re-rendered by a single worker, holding a
+      cache lock for at most `PAGE_CACHE_LOCK_TIMEOUT` seconds. Meanwhile,
+      the other workers serve the stale copy or, when there is none, wait
+      for the new one as long as the lock is held.
+    - Only 200 responses that set no cookie and read nothing specific to the
+      visitor are stored.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return view(request, *args, **kwargs)
+
+        key = _cache_key(request)
+        lock_key = f"{key}:lock"
+        deadline = time.monotonic() + settings.PAGE_CACHE_LOCK_TIMEOUT
+        while True:
+            cached = cache.get_many([key, PAGE_CACHE_GENERATION_KEY])
+            entry = cached.get(key)
+            generation = cached.get(PAGE_CACHE_GENERATION_KEY)
+            if (
+                entry is not None
+                and entry["generation"] == generation
+                and entry["fresh_until"] > time.time()
+            ):
+                return _from_entry(entry)
+
+            try:
+                with cache_lock(lock_key, timeout=settings.PAGE_CACHE_LOCK_TIMEOUT):
+                    return _render(view, request, args, kwargs, key, generation)
+            except LockUnavailable:
+                if entry is not None:
+                    return _from_entry(entry)
+                if time.monotonic() >= deadline:
+                    return view(request, *args, **kwargs)
+                time.sleep(COLD_CACHE_POLL_INTERVAL)
+
+    return wrapper
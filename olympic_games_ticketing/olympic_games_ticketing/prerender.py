@@ -0,0 +1,132 @@
+"""
+Static copies of the pages rendered the same for every visitor.
+
+When `PRERENDER_ROOT` is set, `prerender_pages()` writes the home and offers
+list pages there as `<url>/index.html`, and `PrerenderWhiteNoiseMiddleware`
+serves them like static files: no view, template or query runs for these
+URLs. Like the static files, each page is also written compressed, as
+`index.html.gz` and, when `brotli` is installed, `index.html.br`, for
+WhiteNoise to serve to the clients accepting them. The files are written by
+the `prerender_catalog` command at deploy time and rewritten after every
+offer change; a missing file falls back to the view.
+"""
+
+import gzip
+import inspect
+import os
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest
+from django.urls import resolve, reverse
+from whitenoise.middleware import WhiteNoiseMiddleware
+from whitenoise.responders import MissingFileError
+
+from olympic_games_ticketing.compression import brotli
+from olympic_games_ticketing.db_routers import pin_to_primary
+
+# URL names of the prerendered pages; they must not depend on the visitor.
+PRERENDERED_PAGES = ("home", "offers")
+
+
+def _page_path(root, url):
+    return Path(root, url.lstrip("/"), "index.html")
+
+
+def render_page(url):
+    """Render a page as for an anonymous visitor and return its HTML."""
+    request = HttpRequest()
+    request.method = "GET"
+    request.path = request.path_info = url
+    request.META = {"SERVER_NAME": "localhost", "SERVER_PORT": "80"}
+    request.user = AnonymousUser()
+
+    match = resolve(url)
+    # The bare view: the page cache could return a stale copy.
+    response = inspect.unwrap(match.func)(request, *match.args, **match.kwargs)
+    if response.status_code != 200:
+        raise ValueError(f"{url} returned a {response.status_code} response.")
+    return response.content
+
+
+def _write_atomically(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        file.write(content)
+    os.chmod(file.name, 0o644)
+    os.replace(file.name, path)
+
+
+def _write_page(path, content):
+    """
+    Write a page and its compressed variants, the variants first: the page
+    never has variants older than itself.
+
+    The pages hold no secret, so they are compressed at the highest levels
+    and without the random padding of the dynamic responses.
+    """
+    _write_atomically(
+        path.with_name(path.name + ".gz"),
+        gzip.compress(content, compresslevel=9, mtime=0),
+    )
+    brotli_path = path.with_name(path.name + ".br")
+    if brotli is not None:
+        _write_atomically(brotli_path, brotli.compress(content))
+    else:
+        brotli_path.unlink(missing_ok=True)
+    _write_atomically(path, content)
+
+
+def prerender_pages(root=None):
+    """
+    Write the prerendered pages under `root` (default: `PRERENDER_ROOT`) and
+    return their paths.
+
+    Each file is replaced atomically, so a page is never served half
+    written. The pages are rendered from the primary database: a lagging
+    replica would leave stale files until the next offer change.
+    """
+    root = root or settings.PRERENDER_ROOT
+    paths = []
+    with pin_to_primary():
+        for name in PRERENDERED_PAGES:
+            url = reverse(name)
+            path = _page_path(root, url)
+            _write_page(path, render_page(url))
+            paths.append(path)
+    return paths
+
+
+def refresh_prerendered_pages():
+    """Rewrite the prerendered pages, when the prerender mode is enabled."""
+    if settings.PRERENDER_ROOT:
+        prerender_pages()
+
+
+class PrerenderWhiteNoiseMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise middleware also serving the prerendered pages.
+
+    Unlike the static files, indexed once at startup, the prerendered pages
+    are looked up on each request, so their rewrites are served at once with
+    matching headers.
+    """
+
+    def __call__(self, request):
+        if settings.PRERENDER_ROOT and request.method in ("GET", "HEAD"):
+            static_file = self.find_prerendered_page(request.path_info)
+            if static_file is not None:
+                return self.serve(static_file, request)
+        return super().__call__(request)
+
+    def find_prerendered_page(self, url):
+        if url not in {reverse(name) for name in PRERENDERED_PAGES}:
+            return None
+        try:
+            return self.get_static_file(
+                str(_page_path(settings.PRERENDER_ROOT, url)), url
+            )
+        except MissingFileError:
+            return None
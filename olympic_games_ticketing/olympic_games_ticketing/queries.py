@@ -0,0 +1,48 @@
+"""
+Query helpers shared by the apps' write paths.
+"""
+
+from django.db import router, transaction
+from django.db.models import Case, F, Value, When
+
+
+def bulk_increment(model, deltas):
+    """
+    Add per-row amounts to numeric fields of many rows in a single UPDATE.
+
+    `deltas` maps primary keys to `{field_name: amount}`. Each field is set to
+    `field + CASE WHEN pk = ... THEN amount ... ELSE 0 END`, so the increments
+    are applied by the database and concurrent writers never overwrite each
+    other. The rows are first locked with `SELECT ... FOR UPDATE` in primary
+    key order, so that transactions updating overlapping rows queue up
+    instead of deadlocking.
+
+    Returns the number of rows updated.
+    """
+    if not deltas:
+        return 0
+
+    pks = sorted(deltas)
+    field_names = sorted({name for amounts in deltas.values() for name in amounts})
+    with transaction.atomic(using=router.db_for_write(model)):
+        list(
+            model.objects.select_for_update()
+            .filter(pk__in=pks)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        return model.objects.filter(pk__in=pks).update(
+            **{
+                name: F(name)
+                + Case(
+                    *(
+                        When(pk=pk, then=Value(amounts[name]))
+                        for pk, amounts in deltas.items()
+                        if name in amounts
+                    ),
+                    default=Value(0),
+                    output_field=model._meta.get_field(name),
+                )
+                for name in field_names
+            }
+        )
@@ -15,6 +15,7 @@ import sys
 from pathlib import Path
 
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 from dotenv import load_dotenv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -63,7 +64,9 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "olympic_games_ticketing.prerender.PrerenderWhiteNoiseMiddleware",
+    "olympic_games_ticketing.compression.CompressionMiddleware",
+    "olympic_games_ticketing.db_routers.ReplicaPinningMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -74,32 +77,123 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = "olympic_games_ticketing.urls"
 
+# Templates are compiled once per process by the cached loader in production;
+# in development they are read again on every render so edits show at once.
+
+TEMPLATE_LOADERS = [
+    "django.template.loaders.filesystem.Loader",
+    "django.template.loaders.app_directories.Loader",
+]
+
+TEMPLATE_CONTEXT_PROCESSORS = [
+    "django.template.context_processors.request",
+    "django.contrib.auth.context_processors.auth",
+    "django.contrib.messages.context_processors.messages",
+    "cart.context_processors.cart",
+]
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "olympic_games_ticketing/templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
-            "context_processors": [
-                "django.template.context_processors.request",
-                "django.contrib.auth.context_processors.auth",
-                "django.contrib.messages.context_processors.messages",
-                "cart.context_processors.cart",
-            ],
+            "context_processors": TEMPLATE_CONTEXT_PROCESSORS,
+            "loaders": (
+                TEMPLATE_LOADERS
+                if DEBUG
+                else [("django.template.loaders.cached.Loader", TEMPLATE_LOADERS)]
+            ),
         },
     },
 ]
 
+# Render the hot pages (offers list, cart summary, order confirmation) with
+# Jinja2, from the templates in the jinja2/ directories; the other pages keep
+# their Django templates
+
+USE_JINJA2_TEMPLATES = os.environ.get("USE_JINJA2_TEMPLATES", "") == "True"
+
+JINJA2_TEMPLATE_ENGINE = {
+    "BACKEND": "django.template.backends.jinja2.Jinja2",
+    "DIRS": [BASE_DIR / "olympic_games_ticketing/jinja2"],
+    "APP_DIRS": True,
+    "OPTIONS": {
+        "environment": "olympic_games_ticketing.jinja_environment.environment",
+        "context_processors": TEMPLATE_CONTEXT_PROCESSORS,
+    },
+}
+
+if USE_JINJA2_TEMPLATES:
+    TEMPLATES.insert(0, JINJA2_TEMPLATE_ENGINE)
+
 WSGI_APPLICATION = "olympic_games_ticketing.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
+# Connections to PostgreSQL, chosen by DATABASE_POOL_MODE (compare them with
+# the benchmark_connections command):
+# - "persistent" (default): each worker keeps its own connection for up to
+#   500 seconds and checks it with a query at the start of each request;
+# - "pgbouncer": DATABASE_URL points to PgBouncer in transaction pooling mode;
+#   each request opens a short-lived connection to it, and server-side cursors
+#   are disabled since they cannot outlive a transaction behind such a pooler:
+#   QuerySet.iterator() then fetches the whole result at once, so large reads
+#   must be paged by key instead (as the exports are, in orders/exports.py);
+# - "psycopg": Django's native pool, shared by the threads of each process and
+#   sized by DATABASE_POOL_MIN_SIZE and DATABASE_POOL_MAX_SIZE; requires
+#   psycopg 3 with its pool ("psycopg[binary,pool]") instead of psycopg2.
+
+DATABASE_POOL_MODE = os.environ.get("DATABASE_POOL_MODE", "persistent")
+
+DATABASE_CONNECTION_OPTIONS = {
+    "persistent": {"conn_max_age": 500, "conn_health_checks": True},
+    "pgbouncer": {"conn_max_age": 0, "disable_server_side_cursors": True},
+    "psycopg": {"conn_max_age": 0},
+}
+
+if DATABASE_POOL_MODE not in DATABASE_CONNECTION_OPTIONS:
+    raise ImproperlyConfigured(
+        f"DATABASE_POOL_MODE must be one of {', '.join(DATABASE_CONNECTION_OPTIONS)}."
+    )
+
+DATABASE_POOL_OPTIONS = {
+    "min_size": int(os.environ.get("DATABASE_POOL_MIN_SIZE", "2")),
+    "max_size": int(os.environ.get("DATABASE_POOL_MAX_SIZE", "10")),
+    # Seconds a request waits for a free connection before failing
+    "timeout": int(os.environ.get("DATABASE_POOL_TIMEOUT", "10")),
+}
+
+# Without DATABASE_URL, the SQLite database is tuned for concurrent requests
+# unless SQLITE_TUNING is "False" (compare both with the
+# benchmark_sqlite_checkouts command):
+# - transactions take the write lock when they start, so concurrent checkouts
+#   wait for each other instead of failing with "database is locked" when a
+#   transaction that has read tries to write;
+# - write-ahead logging lets reads run while a transaction writes, and only
+#   syncs the log at checkpoints (synchronous=NORMAL), which loses no data on
+#   an application crash, only possibly the last commits on a power loss;
+# - waiting connections retry for up to busy_timeout milliseconds, and each
+#   connection maps up to 128 MB of the file and caches up to 20 MB of pages.
+
+SQLITE_TUNING = os.environ.get("SQLITE_TUNING", "") != "False"
+
+SQLITE_TUNED_OPTIONS = {
+    "transaction_mode": "IMMEDIATE",
+    # Run on every new connection
+    "init_command": (
+        "PRAGMA journal_mode=WAL;"
+        "PRAGMA synchronous=NORMAL;"
+        "PRAGMA busy_timeout=5000;"
+        "PRAGMA mmap_size=134217728;"
+        "PRAGMA cache_size=-20000"
+    ),
+}
+
 if "DATABASE_URL" in os.environ:
     DATABASES = {
         "default": dj_database_url.config(
-            conn_max_age=500,
-            conn_health_checks=True,
+            **DATABASE_CONNECTION_OPTIONS[DATABASE_POOL_MODE]
         )
     }
 else:
@@ -107,9 +201,51 @@ else:
         "default": {
             "ENGINE": "django.db.backends.sqlite3",
             "NAME": BASE_DIR / "db.sqlite3",
+            "OPTIONS": SQLITE_TUNED_OPTIONS if SQLITE_TUNING else {},
         }
     }
 
+# Optional read replica of the primary database, serving the catalog and order
+# history reads (see olympic_games_ticketing/db_routers.py)
+
+if "DATABASE_REPLICA_URL" in os.environ:
+    DATABASES["replica"] = dj_database_url.parse(
+        os.environ["DATABASE_REPLICA_URL"],
+        **DATABASE_CONNECTION_OPTIONS[DATABASE_POOL_MODE],
+    )
+
+if DATABASE_POOL_MODE == "psycopg":
+    for database in DATABASES.values():
+        if database["ENGINE"] == "django.db.backends.postgresql":
+            database.setdefault("OPTIONS", {})["pool"] = DATABASE_POOL_OPTIONS
+
+DATABASE_ROUTERS = ["olympic_games_ticketing.db_routers.ReplicaRouter"]
+
+# Without a replica, the tests use one mirroring the primary database
+TEST_RUNNER = "olympic_games_ticketing.test_runner.ReplicaMirrorRunner"
+
+# How long a visitor's requests keep reading from the primary after one of
+# their writes, in seconds; longer than the replication lag
+
+REPLICA_PIN_SECONDS = int(os.environ.get("REPLICA_PIN_SECONDS", "10"))
+
+# Generate time-ordered (version 7) instead of random (version 4) UUIDs for
+# User.registration_key, Order.order_key and Ticket.unique_suffix
+
+USE_TIME_ORDERED_UUIDS = os.environ.get("USE_TIME_ORDERED_UUIDS", "") == "True"
+
+# Longest time the checkout transaction waits for a row lock (PostgreSQL only),
+# and duration above which its lock hold time is logged as a warning, in ms
+
+CHECKOUT_LOCK_TIMEOUT_MS = int(os.environ.get("CHECKOUT_LOCK_TIMEOUT_MS", "2000"))
+CHECKOUT_SLOW_TRANSACTION_MS = int(
+    os.environ.get("CHECKOUT_SLOW_TRANSACTION_MS", "250")
+)
+
+# Expiry of the per-user lock serializing checkouts, in seconds
+
+CHECKOUT_USER_LOCK_TIMEOUT = int(os.environ.get("CHECKOUT_USER_LOCK_TIMEOUT", "60"))
+
 # Caches
 
 if "REDIS_URL" in os.environ:
@@ -129,6 +265,30 @@ else:
         }
     }
 
+# Lifetime of the pages shared by all visitors (home, offers list) in browser
+# and shared caches, in seconds
+
+PUBLIC_PAGE_MAX_AGE = int(os.environ.get("PUBLIC_PAGE_MAX_AGE", "60"))
+
+# Server-side cache of these pages: time an entry is fresh, time it is then
+# kept as a stale copy served while one worker re-renders it, and longest
+# time a re-render may hold the lock, in seconds
+
+PAGE_CACHE_TIMEOUT = int(os.environ.get("PAGE_CACHE_TIMEOUT", "60"))
+PAGE_CACHE_STALE_TIMEOUT = int(os.environ.get("PAGE_CACHE_STALE_TIMEOUT", "300"))
+PAGE_CACHE_LOCK_TIMEOUT = int(os.environ.get("PAGE_CACHE_LOCK_TIMEOUT", "10"))
+
+# Directory where these pages are prerendered as static files served by
+# WhiteNoise (see the prerender_catalog command); unset to disable
+
+PRERENDER_ROOT = os.environ.get("PRERENDER_ROOT") or None
+
+# Compression of the dynamic responses: smallest body worth compressing, in
+# bytes, and brotli quality (0-11; higher compresses more but costs more CPU)
+
+COMPRESSION_MIN_LENGTH = int(os.environ.get("COMPRESSION_MIN_LENGTH", "200"))
+COMPRESSION_BROTLI_QUALITY = int(os.environ.get("COMPRESSION_BROTLI_QUALITY", "5"))
+
 
 # Customizing authentication
 
@@ -187,11 +347,16 @@ else:
 
 USE_S3 = os.environ.get("USE_S3", "") != "False"
 
+# Number of threads used for concurrent media uploads, and size of the
+# connection pool of the S3 client they share
+MEDIA_UPLOAD_MAX_WORKERS = int(os.environ.get("MEDIA_UPLOAD_MAX_WORKERS", "8"))
+
 if USE_S3:
     AWS_ACCESS_KEY_ID = os.environ.get("AWS_ACCESS_KEY_ID")
     AWS_SECRET_ACCESS_KEY = os.environ.get("AWS_SECRET_ACCESS_KEY")
     AWS_STORAGE_BUCKET_NAME = os.environ.get("AWS_STORAGE_BUCKET_NAME")
     AWS_S3_REGION_NAME = os.environ.get("AWS_S3_REGION_NAME", "eu-west-3")
+    AWS_S3_ENDPOINT_URL = os.environ.get("AWS_S3_ENDPOINT_URL")
     AWS_S3_CUSTOM_DOMAIN = f"{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com"
     AWS_S3_FILE_OVERWRITE = False
     AWS_QUERYSTRING_AUTH = False
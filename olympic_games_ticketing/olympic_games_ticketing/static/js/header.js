@@ -0,0 +1,51 @@
+/**
+ * Initialize the script:
+ * - On shared (cached) pages, load the visitor's state into the header
+ */
+
+function initHeaderState() {
+  const nav = document.getElementById("header-nav");
+
+  if (nav && nav.dataset.headerStateUrl) {
+    loadHeaderState(nav);
+  }
+}
+
+initHeaderState();
+
+/**
+ * Fetch the login state and cart quantity of the visitor
+ * @param {HTMLElement} nav - The header navigation
+ */
+
+function loadHeaderState(nav) {
+  fetch(nav.dataset.headerStateUrl, {
+    credentials: "same-origin",
+    headers: { Accept: "application/json" },
+  })
+    .then((response) => response.json())
+    .then((data) => updateHeader(nav, data))
+    .catch((error) =>
+      console.error("Erreur lors du chargement de l'en-tête :", error),
+    );
+}
+
+/**
+ * Show the links matching the login state and the cart quantity
+ * @param {HTMLElement} nav - The header navigation
+ * @param {Object} data - Response data from the server
+ */
+
+function updateHeader(nav, data) {
+  const state = data.authenticated ? "authenticated" : "anonymous";
+
+  nav.querySelectorAll("[data-header-auth]").forEach((list) => {
+    list.hidden = list.dataset.headerAuth !== state;
+  });
+
+  const cartQuantityHeader = document.getElementById("cart-quantity-header");
+
+  if (cartQuantityHeader && typeof data.cart_quantity === "number") {
+    cartQuantityHeader.textContent = data.cart_quantity;
+  }
+}
@@ -1,5 +1,17 @@
+import hashlib
+import posixpath
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from botocore.config import Config
+from django.conf import settings
+from django.utils.deconstruct import deconstructible
 from storages.backends.s3boto3 import S3Boto3Storage
 
+_client_lock = threading.Lock()
+_upload_executor = None
+_upload_executor_lock = threading.Lock()
+
 
 class PublicMediaStorage(S3Boto3Storage):
     """
@@ -7,8 +19,143 @@ class PublicMediaStorage(S3Boto3Storage):
 
     Stores uploaded files in the 'media/' prefix of the S3 bucket,
     with no ACLs and no overwriting of existing files.
+
+    Each thread gets its own S3 resource, since boto3 resources are not
+    thread-safe, but all of them wrap a single low-level client, which is:
+    every upload, existence check and deletion of every thread goes through
+    one HTTP connection pool. The client is tuned for concurrent uploads:
+    its pool is sized for the `save_many()` workers and transient failures
+    (throttling, 5xx, dropped connections) are retried by botocore's
+    standard retry mode.
     """
 
     location = "media"
     default_acl = None
     file_overwrite = False
+    retry_max_attempts = 5
+
+    _shared_resource = None
+
+    def __init__(self, **settings_overrides):
+        super().__init__(**settings_overrides)
+        self.client_config = Config(
+            max_pool_connections=settings.MEDIA_UPLOAD_MAX_WORKERS,
+            retries={"max_attempts": self.retry_max_attempts, "mode": "standard"},
+            tcp_keepalive=True,
+        ).merge(self.client_config)
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop("_shared_resource", None)
+        return state
+
+    @property
+    def connection(self):
+        """
+        Return the S3 resource of the current thread, wrapping the client
+        shared by all threads, which is created once.
+        """
+        connection = getattr(self._connections, "connection", None)
+        if connection is None:
+            if self._shared_resource is None:
+                with _client_lock:
+                    if self._shared_resource is None:
+                        self._shared_resource = super().connection
+            resource = self._shared_resource
+            connection = type(resource)(client=resource.meta.client)
+            self._connections.connection = connection
+        return connection
+
+
+@deconstructible
+class HashedUploadTo:
+    """
+    `upload_to` callable spreading files over a hashed, multi-level tree.
+
+    The directory is derived from a hash of the file name, e.g.
+    `tickets/ticket_1_2_<uuid>.png` is stored as `tickets/3f/a2/ticket_1_2_<uuid>.png`.
+    With the default two levels of two hex digits, files are spread over
+    65,536 directories (or S3 key prefixes), so no single one grows without
+    bounds, and the path of a file is still computable from its name alone.
+    """
+
+    def __init__(self, prefix, levels=2, width=2):
+        self.prefix = prefix
+        self.levels = levels
+        self.width = width
+
+    def __call__(self, instance, filename):
+        filename = posixpath.basename(filename)
+        digest = hashlib.md5(filename.encode(), usedforsecurity=False).hexdigest()
+        parts = [
+            digest[level * self.width : (level + 1) * self.width]
+            for level in range(self.levels)
+        ]
+        return posixpath.join(self.prefix, *parts, filename)
+
+
+def _get_upload_executor():
+    """Return the process-wide thread pool used for media uploads."""
+    global _upload_executor
+    if _upload_executor is None:
+        with _upload_executor_lock:
+            if _upload_executor is None:
+                _upload_executor = ThreadPoolExecutor(
+                    max_workers=settings.MEDIA_UPLOAD_MAX_WORKERS,
+                    thread_name_prefix="media-upload",
+                )
+    return _upload_executor
+
+
+def save_many(storage, files, max_length=None):
+    """
+    Save many files to `storage` concurrently.
+
+    `files` is an iterable of `(name, content)` pairs; it is consumed lazily,
+    so contents can be produced while earlier files are being uploaded.
+    Returns the names actually used by the storage, in the same order.
+    If any upload fails, its exception is raised once all uploads are done.
+    """
+    executor = _get_upload_executor()
+    futures = [
+        executor.submit(storage.save, name, content, max_length=max_length)
+        for name, content in files
+    ]
+    wait(futures)
+    return [future.result() for future in futures]
+
+
+def _copy(storage, old_name, new_name, max_length):
+    with storage.open(old_name) as content:
+        return storage.save(new_name, content, max_length=max_length)
+
+
+def copy_many(storage, names, max_length=None):
+    """
+    Copy many files within `storage` concurrently.
+
+    `names` is an iterable of `(old_name, new_name)` pairs; each file is read
+    and written by the same worker. Returns the names actually used for the
+    copies, in the same order.
+    If any copy fails, its exception is raised once all copies are done.
+    """
+    executor = _get_upload_executor()
+    futures = [
+        executor.submit(_copy, storage, old_name, new_name, max_length)
+        for old_name, new_name in names
+    ]
+    wait(futures)
+    return [future.result() for future in futures]
+
+
+def delete_many(storage, names):
+    """
+    Delete many files from `storage` concurrently.
+
+    If any deletion fails, its exception is raised once all deletions are done.
+    """
+    executor = _get_upload_executor()
+    futures = [executor.submit(storage.delete, name) for name in names]
+    wait(futures)
+    for future in futures:
+        future.result()
@@ -0,0 +1,27 @@
+"""
+Test runner adding a read replica to the test databases.
+
+Without DATABASE_REPLICA_URL, the tests of the replica routing run against a
+`replica` alias mirroring `default`: it uses the test database of the primary
+through its own connection, so the tests can check which connection served
+each read.
+"""
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.runner import DiscoverRunner
+
+from olympic_games_ticketing.db_routers import REPLICA_DB_ALIAS
+
+
+class ReplicaMirrorRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        if REPLICA_DB_ALIAS not in settings.DATABASES:
+            # connections.settings is settings.DATABASES, with the defaults
+            # of every alias filled in.
+            primary = connections.settings[DEFAULT_DB_ALIAS]
+            connections.settings[REPLICA_DB_ALIAS] = {
+                **primary,
+                "TEST": {**primary["TEST"], "MIRROR": DEFAULT_DB_ALIAS},
+            }
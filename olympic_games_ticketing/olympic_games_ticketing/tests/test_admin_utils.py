@@ -0,0 +1,108 @@
+import uuid
+from unittest import mock
+
+from accounts.models import User
+from django.contrib import admin
+from django.test import RequestFactory, TestCase
+from orders.models import Order
+
+from olympic_games_ticketing.admin_utils import (
+    ESTIMATED_COUNT_THRESHOLD,
+    EstimatedCountPaginator,
+    ScalableModelAdmin,
+    estimated_row_count,
+    parse_uuid,
+)
+
+
+class TestEstimatedCountPaginator(TestCase):
+    """Tests for the paginator used by the large admin changelists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up two users to count."""
+        for name in ("john", "jane"):
+            User.objects.create_user(
+                email=f"{name}@example.com",
+                first_name="John",
+                last_name="Doe",
+                password="paris2024",
+            )
+
+    def test_estimate_is_unavailable_without_postgresql(self):
+        """Verify that SQLite provides no table statistics."""
+        self.assertIsNone(estimated_row_count(User))
+
+    def test_exact_count_without_estimate(self):
+        """Verify the fallback to an exact count."""
+        paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 1)
+        self.assertEqual(paginator.count, 2)
+
+    def test_estimate_is_used_for_large_unfiltered_querysets(self):
+        """Verify that a large estimate replaces the COUNT(*) query."""
+        with mock.patch(
+            "olympic_games_ticketing.admin_utils.estimated_row_count",
+            return_value=ESTIMATED_COUNT_THRESHOLD * 3,
+        ):
+            paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 100)
+            with self.assertNumQueries(0):
+                self.assertEqual(paginator.count, ESTIMATED_COUNT_THRESHOLD * 3)
+
+    def test_filtered_and_small_querysets_are_counted(self):
+        """Verify that filters and small estimates keep an exact count."""
+        with mock.patch(
+            "olympic_games_ticketing.admin_utils.estimated_row_count",
+            return_value=ESTIMATED_COUNT_THRESHOLD * 3,
+        ):
+            filtered = User.objects.filter(email__startswith="john").order_by("pk")
+            self.assertEqual(EstimatedCountPaginator(filtered, 100).count, 1)
+        with mock.patch(
+            "olympic_games_ticketing.admin_utils.estimated_row_count",
+            return_value=10,
+        ):
+            paginator = EstimatedCountPaginator(User.objects.order_by("pk"), 100)
+            self.assertEqual(paginator.count, 2)
+
+    def test_parse_uuid(self):
+        """Verify that only valid UUIDs are parsed."""
+        value = uuid.uuid4()
+        self.assertEqual(parse_uuid(str(value)), value)
+        self.assertIsNone(parse_uuid("not-a-uuid"))
+
+
+class TestScalableModelAdminSearch(TestCase):
+    """Tests for the default exact search of the large admin changelists."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up an order to search."""
+        user = User.objects.create_user(
+            email="john@example.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.order = Order.objects.create(user=user, total=25)
+
+    def setUp(self):
+        """Set up an admin searching the orders by key and email."""
+        self.model_admin = ScalableModelAdmin(Order, admin.site)
+        self.model_admin.search_fields = ["order_key", "=user__email"]
+
+    def search(self, search_term):
+        request = RequestFactory().get("/")
+        queryset, may_have_duplicates = self.model_admin.get_search_results(
+            request, Order.objects.all(), search_term
+        )
+        self.assertFalse(may_have_duplicates)
+        return list(queryset)
+
+    def test_search_matches_every_field_exactly(self):
+        """Verify that the term is matched exactly against each search field."""
+        self.assertEqual(self.search(str(self.order.order_key)), [self.order])
+        self.assertEqual(self.search(" john@example.com "), [self.order])
+        self.assertEqual(self.search("john@"), [])
+
+    def test_search_ignores_fields_the_term_does_not_fit(self):
+        """Verify that a term which is not a valid UUID does not raise."""
+        self.assertEqual(self.search("not-a-uuid"), [])
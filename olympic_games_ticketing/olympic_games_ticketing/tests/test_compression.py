@@ -0,0 +1,152 @@
+import gzip
+from unittest import mock, skipUnless
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from olympic_games_ticketing import compression
+from olympic_games_ticketing.compression import (
+    CompressionMiddleware,
+    negotiate_encoding,
+)
+
+BODY = b"<p>Les offres de la billetterie des Jeux Olympiques</p>" * 50
+
+
+class TestNegotiateEncoding(SimpleTestCase):
+    """Tests for the Accept-Encoding negotiation."""
+
+    def test_highest_quality_wins_and_brotli_wins_ties(self):
+        """Verify the choice between brotli and gzip."""
+        with mock.patch.object(compression, "brotli", mock.Mock()):
+            self.assertEqual(negotiate_encoding("gzip, deflate, br"), "br")
+            self.assertEqual(negotiate_encoding("br;q=0.5, gzip"), "gzip")
+            self.assertEqual(negotiate_encoding("*"), "br")
+
+    def test_refused_and_unsupported_codings(self):
+        """Verify q=0, unknown codings and a missing brotli package."""
+        self.assertIsNone(negotiate_encoding(""))
+        self.assertIsNone(negotiate_encoding("gzip;q=0, deflate"))
+        self.assertIsNone(negotiate_encoding("*;q=0"))
+        with mock.patch.object(compression, "brotli", None):
+            self.assertEqual(negotiate_encoding("br, gzip"), "gzip")
+            self.assertIsNone(negotiate_encoding("br"))
+
+    def test_brotli_can_be_refused(self):
+        """Verify gzip is negotiated instead of brotli without `allow_brotli`."""
+        with mock.patch.object(compression, "brotli", mock.Mock()):
+            self.assertEqual(negotiate_encoding("br, gzip", allow_brotli=False), "gzip")
+            self.assertIsNone(negotiate_encoding("br", allow_brotli=False))
+
+
+class TestCompressionMiddleware(SimpleTestCase):
+    """Tests for the compression of dynamic responses."""
+
+    def process(self, response, accept_encoding="gzip"):
+        request = RequestFactory().get(
+            "/", headers={"accept-encoding": accept_encoding}
+        )
+        return CompressionMiddleware(lambda request: response)(request)
+
+    def test_html_is_gzipped(self):
+        """Verify the body, headers and weakened ETag of a gzipped page."""
+        response = HttpResponse(BODY, headers={"ETag": '"abc"'})
+        response = self.process(response)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(response["ETag"], 'W/"abc"')
+        self.assertEqual(response["Content-Length"], str(len(response.content)))
+        self.assertEqual(gzip.decompress(response.content), BODY)
+
+    @skipUnless(compression.brotli, "brotli is not installed")
+    def test_html_is_brotli_compressed_when_accepted(self):
+        """Verify brotli is used when the client accepts it."""
+        response = self.process(HttpResponse(BODY), "gzip, br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(compression.brotli.decompress(response.content), BODY)
+
+    def test_pages_with_a_csrf_token_are_gzipped_with_random_padding(self):
+        """Verify the length of a page holding a CSRF token varies, even with br."""
+
+        def page_with_form(request):
+            get_token(request)
+            return HttpResponse(BODY)
+
+        lengths = set()
+        for _ in range(5):
+            request = RequestFactory().get("/", headers={"accept-encoding": "br, gzip"})
+            response = CompressionMiddleware(page_with_form)(request)
+            self.assertEqual(response["Content-Encoding"], "gzip")
+            self.assertEqual(gzip.decompress(response.content), BODY)
+            lengths.add(len(response.content))
+        self.assertGreater(len(lengths), 1)
+
+    def test_small_and_incompressible_bodies_are_left_as_is(self):
+        """Verify short bodies, binary files and encoded bodies are skipped."""
+        for response in (
+            HttpResponse(b"<p>court</p>"),
+            HttpResponse(BODY, content_type="application/pdf"),
+            HttpResponse(BODY, headers={"Content-Encoding": "gzip"}),
+        ):
+            with self.subTest(content_type=response["Content-Type"]):
+                content = response.content
+                response = self.process(response)
+                self.assertEqual(response.content, content)
+                self.assertNotIn("Vary", response)
+
+    @override_settings(COMPRESSION_MIN_LENGTH=10_000)
+    def test_minimum_length_is_configurable(self):
+        """Verify bodies below COMPRESSION_MIN_LENGTH are not compressed."""
+        response = self.process(HttpResponse(BODY))
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_uncompressed_when_no_coding_is_accepted(self):
+        """Verify the response still varies on Accept-Encoding."""
+        response = self.process(HttpResponse(BODY), "identity")
+        self.assertEqual(response.content, BODY)
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+
+    def test_streamed_export_is_compressed_lazily(self):
+        """Verify the export is only produced as the compressed body is read."""
+        produced = []
+
+        def rows():
+            for i in range(3):
+                produced.append(i)
+                yield f"{i},{'x' * 300}\n".encode()
+
+        response = StreamingHttpResponse(rows(), content_type="text/csv")
+        response = self.process(response)
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertFalse(response.has_header("Content-Length"))
+        self.assertEqual(produced, [])
+
+        body = b"".join(response.streaming_content)
+        self.assertEqual(produced, [0, 1, 2])
+        self.assertEqual(
+            gzip.decompress(body),
+            b"".join(f"{i},{'x' * 300}\n".encode() for i in range(3)),
+        )
+
+    @skipUnless(compression.brotli, "brotli is not installed")
+    def test_streamed_export_is_brotli_compressed(self):
+        """Verify the streamed brotli body decompresses to the whole export."""
+        lines = [f"{i},{'x' * 300}\n".encode() for i in range(5)]
+        response = StreamingHttpResponse(
+            iter(lines), content_type="application/x-ndjson"
+        )
+        response = self.process(response, "br")
+        body = b"".join(response.streaming_content)
+        self.assertEqual(compression.brotli.decompress(body), b"".join(lines))
+
+
+class TestCompressedPages(TestCase):
+    """Tests for the compression of the pages served by the views."""
+
+    @skipUnless(compression.brotli, "brotli is not installed")
+    def test_forms_are_not_brotli_compressed(self):
+        """Verify a page rendering a CSRF token is gzipped, even with br."""
+        response = self.client.get(reverse("login"), HTTP_ACCEPT_ENCODING="br, gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
@@ -0,0 +1,155 @@
+from unittest import mock
+
+from accounts.models import User
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from orders.models import Order
+from products.models import Offer
+
+from olympic_games_ticketing.db_routers import (
+    REPLICA_DB_ALIAS,
+    REPLICA_PIN_COOKIE,
+    ReplicaRouter,
+    pin_to_primary,
+)
+
+
+class ReplicaQueriesMixin:
+    """
+    Without DATABASE_REPLICA_URL, the replica mirrors the primary (see
+    olympic_games_ticketing/test_runner.py): the tests check which connection
+    ran the queries rather than which rows they saw.
+    """
+
+    databases = {DEFAULT_DB_ALIAS, REPLICA_DB_ALIAS}
+
+    def capture_replica_queries(self):
+        return CaptureQueriesContext(connections[REPLICA_DB_ALIAS])
+
+
+class TestReplicaRouter(SimpleTestCase):
+    """Tests for the database chosen by the replica router."""
+
+    def setUp(self):
+        """Route as if a replica was configured, whatever the settings."""
+        patcher = mock.patch(
+            "olympic_games_ticketing.db_routers.replica_configured",
+            return_value=True,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.router = ReplicaRouter()
+
+    def test_catalog_reads_go_to_the_replica(self):
+        """Test that reads of the offers and orders are sent to the replica."""
+        self.assertEqual(self.router.db_for_read(Offer), REPLICA_DB_ALIAS)
+        self.assertEqual(self.router.db_for_read(Order), REPLICA_DB_ALIAS)
+
+    def test_other_reads_are_left_to_the_default_routing(self):
+        """Test that reads of the accounts are not routed to the replica."""
+        self.assertIsNone(self.router.db_for_read(User))
+
+    def test_pinned_reads_are_left_to_the_default_routing(self):
+        """Test that reads inside `pin_to_primary()` are not routed to the replica."""
+        with pin_to_primary():
+            self.assertIsNone(self.router.db_for_read(Offer))
+        self.assertEqual(self.router.db_for_read(Offer), REPLICA_DB_ALIAS)
+
+    def test_reads_without_replica_are_left_to_the_default_routing(self):
+        """Test that nothing is routed to the replica when none is configured."""
+        with mock.patch(
+            "olympic_games_ticketing.db_routers.replica_configured",
+            return_value=False,
+        ):
+            self.assertIsNone(self.router.db_for_read(Offer))
+
+    def test_writes_go_to_the_primary(self):
+        """Test that writes of every model are sent to the primary."""
+        self.assertEqual(self.router.db_for_write(Offer), DEFAULT_DB_ALIAS)
+        self.assertEqual(self.router.db_for_write(User), DEFAULT_DB_ALIAS)
+
+
+class TestReplicaReads(ReplicaQueriesMixin, TransactionTestCase):
+    """Tests for the reads served by the replica database."""
+
+    def setUp(self):
+        """Create an offer."""
+        cache.clear()
+        Offer.objects.create(
+            name="Solo",
+            slug="solo",
+            description="A single seat offer.",
+            seats=1,
+            price=25,
+            is_active=True,
+        )
+
+    def test_reads_outside_transactions_use_the_replica(self):
+        """Test that a read outside any transaction is run on the replica."""
+        with self.capture_replica_queries() as queries:
+            Offer.objects.count()
+        self.assertEqual(len(queries), 1)
+
+    def test_reads_inside_transactions_use_the_primary(self):
+        """Test that a read inside a transaction is run on the primary."""
+        with self.capture_replica_queries() as queries, transaction.atomic():
+            self.assertEqual(Offer.objects.count(), 1)
+        self.assertEqual(len(queries), 0)
+
+    def test_pinned_reads_use_the_primary(self):
+        """Test that a read inside `pin_to_primary()` is run on the primary."""
+        with self.capture_replica_queries() as queries, pin_to_primary():
+            self.assertEqual(Offer.objects.count(), 1)
+        self.assertEqual(len(queries), 0)
+
+    def test_offers_list_is_rendered_from_the_primary(self):
+        """Test that the cached offers list page is not filled from the replica."""
+        with self.capture_replica_queries() as queries:
+            response = self.client.get(reverse("offers"))
+        self.assertContains(response, "Solo")
+        self.assertEqual(len(queries), 0)
+
+
+class TestReplicaPinningMiddleware(ReplicaQueriesMixin, TransactionTestCase):
+    """Tests for pinning a visitor to the primary after their writes."""
+
+    def setUp(self):
+        """Log in a user with an order."""
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        self.order = Order.objects.create(user=self.user, total=25)
+        self.client.force_login(self.user)
+        self.confirmation_url = reverse("orders:confirmation")
+
+    def test_writes_set_the_pin_cookie(self):
+        """Test that a POST request sets the cookie pinning the visitor."""
+        response = self.client.post(reverse("orders:create"))
+        self.assertIn(REPLICA_PIN_COOKIE, response.cookies)
+        self.assertTrue(response.cookies[REPLICA_PIN_COOKIE]["httponly"])
+
+    def test_reads_do_not_set_the_pin_cookie(self):
+        """Test that a GET request does not pin the visitor."""
+        response = self.client.get(self.confirmation_url)
+        self.assertNotIn(REPLICA_PIN_COOKIE, response.cookies)
+
+    def test_unpinned_confirmation_reads_the_replica(self):
+        """Test that the confirmation page of an unpinned visitor reads the replica."""
+        with self.capture_replica_queries() as queries:
+            self.client.get(self.confirmation_url)
+        self.assertGreater(len(queries), 0)
+
+    def test_pinned_confirmation_reads_the_primary(self):
+        """Test that a pinned visitor sees the order they just placed."""
+        self.client.post(reverse("orders:create"))
+        with self.capture_replica_queries() as queries:
+            response = self.client.get(self.confirmation_url)
+        self.assertEqual(response.context["order"], self.order)
+        self.assertEqual(len(queries), 0)
@@ -0,0 +1,116 @@
+import re
+
+from accounts.models import User
+from cart.cart import Cart
+from django.conf import settings
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.cache import SessionStore
+from django.core.cache import cache
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.jinja2 import Jinja2
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from orders.services import create_order
+from products.models import Offer
+from tickets.models import Ticket
+
+
+def _engine(backend, config):
+    """Instantiate a template engine from its TEMPLATES entry."""
+    params = {"NAME": backend.__name__, "APP_DIRS": False, **config}
+    del params["BACKEND"]
+    return backend(params)
+
+
+def _normalize(html):
+    """Collapse whitespace and blank the per-render CSRF tokens."""
+    html = re.sub(r'(csrfmiddlewaretoken" value=|data-csrf-token=)"[^"]*"', r"\1", html)
+    html = re.sub(r">\s+", ">", html)
+    html = re.sub(r"\s+<", "<", html)
+    return re.sub(r"\s+", " ", html).strip()
+
+
+class TestJinja2Templates(TestCase):
+    """Tests for the Jinja2 versions of the hot pages."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a user, two offers and a confirmed order."""
+        cls.user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.offers = [
+            Offer.objects.create(name="Solo", slug="solo", seats=1, price=25),
+            Offer.objects.create(name="Duo", slug="duo", seats=2, price=45),
+        ]
+        cls.order, _ = create_order(
+            cls.user,
+            [(offer, offer.name, offer.price, 1) for offer in cls.offers],
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.django = _engine(DjangoTemplates, settings.TEMPLATES[-1])
+        self.jinja2 = _engine(Jinja2, settings.JINJA2_TEMPLATE_ENGINE)
+
+    def request(self):
+        request = RequestFactory().get("/")
+        request.user = self.user
+        request.session = SessionStore()
+        request._messages = FallbackStorage(request)
+        return request
+
+    def assertSameRender(self, template_name, context, request):
+        self.assertEqual(
+            _normalize(
+                self.jinja2.get_template(template_name).render(context, request)
+            ),
+            _normalize(
+                self.django.get_template(template_name).render(context, request)
+            ),
+        )
+
+    def test_offers_list_renders_like_the_django_template(self):
+        """Verify the offers list, its offer cards and the shared header."""
+        context = {"offers": self.offers, "hydrate_header": True}
+        self.assertSameRender("products/offers-list.html", context, self.request())
+        self.assertSameRender(
+            "products/offers-list.html", {"offers": []}, self.request()
+        )
+
+    def test_cart_summary_renders_like_the_django_template(self):
+        """Verify the cart lines, totals and the user's header."""
+        request = self.request()
+        cart = Cart(request)
+        for offer in self.offers:
+            cart.add_offer(offer)
+        self.assertSameRender("cart/cart-summary.html", {"cart": cart}, request)
+
+    def test_order_confirmation_renders_like_the_django_template(self):
+        """Verify the tickets grouped by offer, with and without QR codes."""
+        tickets = list(Ticket.objects.filter(order=self.order).select_related("offer"))
+        tickets[0].qr_code.name = tickets[0].qr_code_filename
+        tickets_by_offer = {}
+        for ticket in tickets:
+            tickets_by_offer.setdefault(ticket.offer.name, []).append(ticket)
+        context = {"order": self.order, "tickets_by_offer": tickets_by_offer}
+        self.assertSameRender("orders/order-confirmation.html", context, self.request())
+        self.assertSameRender(
+            "orders/order-confirmation.html", {"order": None}, self.request()
+        )
+
+    def test_views_use_jinja2_when_enabled(self):
+        """Verify the hot pages come from Jinja2 and the others from Django."""
+        jinja2 = settings.JINJA2_TEMPLATE_ENGINE
+        templates = [jinja2, *(t for t in settings.TEMPLATES if t is not jinja2)]
+        with override_settings(TEMPLATES=templates):
+            self.client.force_login(self.user)
+            response = self.client.get(reverse("offers"))
+            self.assertContains(response, "Solo")
+            self.assertEqual(response.templates, [])
+
+            response = self.client.get(reverse("home"))
+            self.assertTemplateUsed(response, "home.html")
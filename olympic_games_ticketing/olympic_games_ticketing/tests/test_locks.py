@@ -0,0 +1,35 @@
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from olympic_games_ticketing.locks import LockUnavailable, cache_lock
+
+
+class TestCacheLock(SimpleTestCase):
+    """Tests for the cache-backed lock."""
+
+    def setUp(self):
+        cache.delete("test-lock")
+        self.addCleanup(cache.delete, "test-lock")
+
+    def test_lock_is_exclusive_and_released(self):
+        """Verify that a held lock is refused, then available again."""
+        with (
+            cache_lock("test-lock", timeout=10),
+            self.assertRaises(LockUnavailable),
+            cache_lock("test-lock", timeout=10),
+        ):
+            pass
+        with cache_lock("test-lock", timeout=10):
+            pass
+
+    def test_lock_is_released_when_the_block_raises(self):
+        """Verify that an exception does not leave the lock behind."""
+        with self.assertRaises(ValueError), cache_lock("test-lock", timeout=10):
+            raise ValueError
+        self.assertIsNone(cache.get("test-lock"))
+
+    def test_lock_is_only_released_by_its_owner(self):
+        """Verify that an expired lock taken over by another owner is kept."""
+        with cache_lock("test-lock", timeout=10):
+            cache.set("test-lock", "another-owner")
+        self.assertEqual(cache.get("test-lock"), "another-owner")
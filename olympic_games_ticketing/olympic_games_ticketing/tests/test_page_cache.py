@@ -0,0 +1,141 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from olympic_games_ticketing.page_cache import (
+    _cache_key,
+    cached_page,
+    invalidate_pages,
+    public_page,
+)
+
+
+class CountingView:
+    """View returning a new body on each call, with its number of calls."""
+
+    def __init__(self, status=200):
+        self.calls = 0
+        self.status = status
+
+    def __call__(self, request):
+        self.calls += 1
+        return HttpResponse(f"render {self.calls}", status=self.status)
+
+
+class TestCachedPage(SimpleTestCase):
+    """Tests for the server-side page cache."""
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.request = RequestFactory().get("/page/?a=1")
+        self.lock_key = f"{_cache_key(self.request)}:lock"
+
+    def test_page_is_rendered_once_then_served_from_cache(self):
+        """Verify a second request is served without calling the view."""
+        view = CountingView()
+        cached = cached_page(view)
+        self.assertEqual(cached(self.request).content, b"render 1")
+        self.assertEqual(cached(self.request).content, b"render 1")
+        self.assertEqual(view.calls, 1)
+
+    def test_query_string_is_part_of_the_key(self):
+        """Verify each URL has its own entry."""
+        view = CountingView()
+        cached = cached_page(view)
+        cached(self.request)
+        response = cached(RequestFactory().get("/page/?a=2"))
+        self.assertEqual(response.content, b"render 2")
+
+    def test_invalidation_rerenders_the_page(self):
+        """Verify `invalidate_pages()` makes the next request render again."""
+        view = CountingView()
+        cached = cached_page(view)
+        cached(self.request)
+        invalidate_pages()
+        self.assertEqual(cached(self.request).content, b"render 2")
+        self.assertEqual(cached(self.request).content, b"render 2")
+
+    @override_settings(PAGE_CACHE_TIMEOUT=0)
+    def test_stale_copy_is_served_while_another_worker_renders(self):
+        """Verify an expired entry is served as is when the lock is taken."""
+        view = CountingView()
+        cached = cached_page(view)
+        cached(self.request)
+        cache.add(self.lock_key, "other-worker", 30)
+        self.assertEqual(cached(self.request).content, b"render 1")
+        self.assertEqual(view.calls, 1)
+
+        cache.delete(self.lock_key)
+        self.assertEqual(cached(self.request).content, b"render 2")
+
+    def test_cold_request_waits_for_the_rendering_worker(self):
+        """Verify a request without entry waits for the page being rendered."""
+        other_view = CountingView()
+        view = CountingView()
+        cached = cached_page(view)
+        cache.add(self.lock_key, "other-worker", 30)
+
+        def other_worker_finishes(seconds):
+            cache.delete(self.lock_key)
+            cached_page(other_view)(self.request)
+
+        with mock.patch(
+            "olympic_games_ticketing.page_cache.time.sleep",
+            side_effect=other_worker_finishes,
+        ) as sleep:
+            response = cached(self.request)
+        self.assertEqual(sleep.call_count, 1)
+        self.assertEqual(response.content, b"render 1")
+        self.assertEqual((other_view.calls, view.calls), (1, 0))
+
+    @override_settings(PAGE_CACHE_LOCK_TIMEOUT=0)
+    def test_cold_request_renders_itself_after_waiting(self):
+        """Verify a request does not wait beyond the lock timeout."""
+        view = CountingView()
+        cache.add(self.lock_key, "other-worker", 30)
+        self.assertEqual(cached_page(view)(self.request).content, b"render 1")
+
+    def test_only_shareable_successful_responses_are_stored(self):
+        """Verify errors and responses setting cookies are not cached."""
+        view = CountingView(status=404)
+        cached = cached_page(view)
+        cached(self.request)
+        cached(self.request)
+        self.assertEqual(view.calls, 2)
+
+        def view_with_cookie(request):
+            response = HttpResponse("private")
+            response.set_cookie("visitor", "1")
+            return response
+
+        cached_page(view_with_cookie)(self.request)
+        self.assertIsNone(cache.get(_cache_key(self.request)))
+
+    def test_other_methods_bypass_the_cache(self):
+        """Verify POST requests always reach the view."""
+        view = CountingView()
+        cached = cached_page(view)
+        request = RequestFactory().post("/page/?a=1")
+        cached(request)
+        cached(request)
+        self.assertEqual(view.calls, 2)
+
+
+class TestPublicPage(SimpleTestCase):
+    """Tests for the Cache-Control headers of shared pages."""
+
+    @override_settings(PUBLIC_PAGE_MAX_AGE=30)
+    def test_shareable_response_is_public(self):
+        """Verify the public max-age of a page that is the same for everyone."""
+        response = public_page(CountingView())(RequestFactory().get("/"))
+        self.assertEqual(response["Cache-Control"], "public, max-age=30")
+
+    def test_response_reading_the_session_is_private(self):
+        """Verify a page that read the session is not shared."""
+        request = RequestFactory().get("/")
+        request.session = mock.Mock(accessed=True)
+        response = public_page(CountingView())(request)
+        self.assertEqual(response["Cache-Control"], "private, no-cache")
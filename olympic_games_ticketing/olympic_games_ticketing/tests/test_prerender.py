@@ -0,0 +1,115 @@
+import gzip
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from products.models import Offer
+
+from olympic_games_ticketing.compression import brotli
+from olympic_games_ticketing.db_routers import ReplicaRouter
+from olympic_games_ticketing.prerender import prerender_pages
+
+
+class TestPrerender(TestCase):
+    """Tests for the prerendered home and offers list pages."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create an offer on sale."""
+        cls.offer = Offer.objects.create(name="Solo", slug="solo", price=25)
+
+    def setUp(self):
+        cache.clear()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.root = Path(directory.name)
+        settings_override = override_settings(PRERENDER_ROOT=str(self.root))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_pages_are_written_as_index_files(self):
+        """Verify each page is written under its URL with the anonymous header."""
+        paths = prerender_pages()
+        self.assertEqual(
+            paths,
+            [self.root / "index.html", self.root / "products/offers/index.html"],
+        )
+        content = paths[1].read_text()
+        self.assertIn("Solo", content)
+        self.assertIn("data-header-state-url", content)
+
+    def test_prerendered_pages_are_served_without_the_view(self):
+        """Verify the middleware serves the files, then falls back to the view."""
+        prerender_pages()
+        (self.root / "products/offers/index.html").write_text("prerendered")
+
+        response = self.client.get("/products/offers/")
+        self.assertEqual(b"".join(response.streaming_content), b"prerendered")
+        self.assertEqual(response["Content-Length"], str(len("prerendered")))
+        self.assertEqual(response.templates, [])
+
+        (self.root / "products/offers/index.html").unlink()
+        response = self.client.get("/products/offers/")
+        self.assertTemplateUsed(response, "products/offers-list.html")
+
+    def test_pages_are_written_compressed(self):
+        """Verify each page has gzip and brotli variants of the same content."""
+        path = prerender_pages()[1]
+        content = path.read_bytes()
+        self.assertEqual(gzip.decompress(Path(f"{path}.gz").read_bytes()), content)
+        self.assertEqual(brotli.decompress(Path(f"{path}.br").read_bytes()), content)
+
+    def test_compressed_pages_are_served_to_accepting_clients(self):
+        """Verify the middleware negotiates the compressed variants."""
+        path = prerender_pages()[1]
+
+        response = self.client.get("/products/offers/", HTTP_ACCEPT_ENCODING="br")
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        self.assertEqual(
+            b"".join(response.streaming_content), Path(f"{path}.br").read_bytes()
+        )
+
+        response = self.client.get("/products/offers/", HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(response["Content-Encoding"], "gzip")
+
+        response = self.client.get("/products/offers/")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_pages_are_rewritten_after_an_offer_change(self):
+        """Verify saving an offer refreshes the prerendered list once committed."""
+        prerender_pages()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.offer.name = "Duo"
+            self.offer.save()
+        content = (self.root / "products/offers/index.html").read_text()
+        self.assertIn("Duo", content)
+        self.assertNotIn("Solo", content)
+
+    def test_pages_are_rendered_from_the_primary(self):
+        """Verify the offers are not read from a replica while rendering."""
+        databases = []
+
+        def render_page(url):
+            databases.append(ReplicaRouter().db_for_read(Offer))
+            return b""
+
+        with (
+            mock.patch(
+                "olympic_games_ticketing.db_routers.replica_configured",
+                return_value=True,
+            ),
+            mock.patch(
+                "olympic_games_ticketing.prerender.render_page",
+                side_effect=render_page,
+            ),
+            # Outside the test's transaction, where reads are not pinned.
+            mock.patch(
+                "olympic_games_ticketing.db_routers.connections",
+                {"default": mock.Mock(in_atomic_block=False)},
+            ),
+        ):
+            prerender_pages()
+        self.assertEqual(databases, [None, None])
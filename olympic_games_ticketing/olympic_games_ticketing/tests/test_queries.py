@@ -0,0 +1,49 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from products.models import Offer
+
+from olympic_games_ticketing.queries import bulk_increment
+
+
+class TestBulkIncrement(TestCase):
+    """Tests for the single-statement increment of many rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up three offers with existing sales."""
+        cls.offers = [
+            Offer.objects.create(
+                name=f"Offer {i}", slug=f"offer-{i}", price=10, sales=5
+            )
+            for i in range(3)
+        ]
+
+    def test_each_row_gets_its_own_amount(self):
+        """Verify per-row increments and untouched rows, in a single UPDATE."""
+        first, second, _ = self.offers
+        with CaptureQueriesContext(connection) as queries:
+            updated = bulk_increment(
+                Offer, {second.pk: {"sales": 3}, first.pk: {"sales": 1}}
+            )
+        self.assertEqual(updated, 2)
+        updates = [q for q in queries.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 1)
+        self.assertEqual(
+            list(Offer.objects.order_by("pk").values_list("sales", flat=True)),
+            [6, 8, 5],
+        )
+
+    def test_fields_missing_for_a_row_are_unchanged(self):
+        """Verify that a row only changes the fields listed for it."""
+        first, second, _ = self.offers
+        bulk_increment(Offer, {first.pk: {"sales": 2}, second.pk: {"seats": 1}})
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual((first.sales, first.seats), (7, 1))
+        self.assertEqual((second.sales, second.seats), (5, 2))
+
+    def test_empty_deltas_run_no_query(self):
+        """Verify that nothing is queried without deltas."""
+        with self.assertNumQueries(0):
+            self.assertEqual(bulk_increment(Offer, {}), 0)
@@ -0,0 +1,153 @@
+import tempfile
+import threading
+from unittest import mock
+
+from botocore.session import Session as BotocoreSession
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.test import SimpleTestCase
+
+from olympic_games_ticketing.local_s3 import LocalS3Server
+from olympic_games_ticketing.storage_backends import (
+    HashedUploadTo,
+    PublicMediaStorage,
+    copy_many,
+    delete_many,
+    save_many,
+)
+
+create_client = BotocoreSession.create_client
+
+
+class TestPublicMediaStorage(SimpleTestCase):
+    """Tests for the S3 media storage against the local S3 stand-in."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Start the local S3 stand-in once for all tests."""
+        super().setUpClass()
+        cls.server = LocalS3Server().start()
+        cls.addClassCleanup(cls.server.stop)
+
+    def setUp(self):
+        """Create a storage pointing at an empty bucket for each test."""
+        self.server.objects.clear()
+        self.server.connection_count = 0
+        self.storage = PublicMediaStorage(**self.server.storage_options())
+
+    def test_client_config_is_tuned_for_concurrent_uploads(self):
+        """Verify that the client pool size and retry mode are configured."""
+        config = self.storage.client_config
+        self.assertEqual(config.retries, {"max_attempts": 5, "mode": "standard"})
+        self.assertGreaterEqual(config.max_pool_connections, 8)
+
+    def test_threads_share_the_client_of_their_own_connection(self):
+        """
+        Verify that each thread has its own S3 resource, which is not
+        thread-safe, all wrapping the same client.
+        """
+        connections = []
+        thread = threading.Thread(
+            target=lambda: connections.append(self.storage.connection)
+        )
+        thread.start()
+        thread.join()
+        self.assertIsNot(connections[0], self.storage.connection)
+        self.assertIs(connections[0].meta.client, self.storage.connection.meta.client)
+
+    def test_save_many_uploads_every_file_in_order(self):
+        """Verify that save_many uploads every file and returns names in order."""
+        files = [(f"tickets/{i}.png", ContentFile(b"png %d" % i)) for i in range(20)]
+        names = save_many(self.storage, files)
+        self.assertEqual(names, [name for name, _ in files])
+        self.assertEqual(
+            self.server.objects["local-bucket/media/tickets/7.png"], b"png 7"
+        )
+
+    def test_save_many_keeps_existing_files(self):
+        """Verify that save_many does not overwrite files that already exist."""
+        save_many(self.storage, [("tickets/a.png", ContentFile(b"first"))])
+        [name] = save_many(self.storage, [("tickets/a.png", ContentFile(b"second"))])
+        self.assertNotEqual(name, "tickets/a.png")
+        self.assertEqual(
+            self.server.objects["local-bucket/media/tickets/a.png"], b"first"
+        )
+
+    def test_save_many_retries_transient_failures(self):
+        """Verify that throttled uploads are retried until they succeed."""
+        self.server.fail_next(3)
+        files = [(f"tickets/{i}.png", ContentFile(b"png")) for i in range(5)]
+        save_many(self.storage, files)
+        self.assertEqual(len(self.server.objects), 5)
+
+    def test_save_many_reuses_pooled_connections(self):
+        """Verify that the uploads share one client and its pooled connections."""
+        files = [(f"tickets/{i}.png", ContentFile(b"png")) for i in range(40)]
+        with mock.patch.object(
+            BotocoreSession, "create_client", autospec=True, side_effect=create_client
+        ) as create:
+            save_many(self.storage, files)
+        self.assertEqual(create.call_count, 1)
+        self.assertLessEqual(
+            self.server.connection_count,
+            self.storage.client_config.max_pool_connections,
+        )
+
+
+class TestSaveManyFileSystemStorage(SimpleTestCase):
+    """Tests for save_many with the local file system storage."""
+
+    def test_save_many_writes_files_to_disk(self):
+        """Verify that save_many works with storages other than S3."""
+        with tempfile.TemporaryDirectory() as location:
+            storage = FileSystemStorage(location=location)
+            names = save_many(
+                storage, [(f"tickets/{i}.png", ContentFile(b"png")) for i in range(3)]
+            )
+            self.assertTrue(all(storage.exists(name) for name in names))
+
+
+class TestHashedUploadTo(SimpleTestCase):
+    """Tests for the hashed upload_to callable."""
+
+    def test_path_has_two_hashed_levels(self):
+        """Verify that files are placed under two levels of hashed folders."""
+        path = HashedUploadTo("tickets")(None, "ticket_1_2_abc.png")
+        self.assertRegex(path, r"^tickets/[0-9a-f]{2}/[0-9a-f]{2}/ticket_1_2_abc.png$")
+
+    def test_path_only_depends_on_file_name(self):
+        """Verify that the same file name always maps to the same folder."""
+        upload_to = HashedUploadTo("tickets")
+        self.assertEqual(upload_to(None, "old/folder/a.png"), upload_to(None, "a.png"))
+
+    def test_levels_and_width_are_configurable(self):
+        """Verify that the number and size of levels can be changed."""
+        path = HashedUploadTo("images", levels=3, width=1)(None, "a.png")
+        self.assertRegex(path, r"^images/[0-9a-f]/[0-9a-f]/[0-9a-f]/a.png$")
+
+    def test_files_are_spread_over_many_folders(self):
+        """Verify that many files do not end up in the same folder."""
+        upload_to = HashedUploadTo("tickets")
+        folders = {
+            upload_to(None, f"ticket_{i}.png").rsplit("/", 1)[0] for i in range(1000)
+        }
+        self.assertGreater(len(folders), 900)
+
+
+class TestCopyAndDeleteMany(SimpleTestCase):
+    """Tests for copy_many and delete_many."""
+
+    def test_copy_many_then_delete_many_moves_files(self):
+        """Verify that files can be moved by copying then deleting them."""
+        with tempfile.TemporaryDirectory() as location:
+            storage = FileSystemStorage(location=location)
+            old_names = save_many(
+                storage, [(f"{i}.png", ContentFile(b"png %d" % i)) for i in range(3)]
+            )
+            new_names = copy_many(
+                storage, [(name, f"moved/{name}") for name in old_names]
+            )
+            delete_many(storage, old_names)
+            self.assertFalse(any(storage.exists(name) for name in old_names))
+            with storage.open(new_names[1]) as file:
+                self.assertEqual(file.read(), b"png 1")
@@ -0,0 +1,49 @@
+import time
+import uuid
+
+from django.test import SimpleTestCase, override_settings
+
+from olympic_games_ticketing.uuids import default_uuid, uuid7
+
+
+class TestUuid7(SimpleTestCase):
+    """Tests for the time-ordered UUID generator."""
+
+    def test_uuid7_has_version_7_and_rfc_variant(self):
+        """Verify the version and variant bits of the generated UUID."""
+        value = uuid7()
+        self.assertEqual(value.version, 7)
+        self.assertEqual(value.variant, uuid.RFC_4122)
+
+    def test_uuid7_starts_with_current_timestamp(self):
+        """Verify that the first 48 bits hold the Unix time in milliseconds."""
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+        after = time.time_ns() // 1_000_000
+        self.assertTrue(before <= value.int >> 80 <= after)
+
+    def test_uuid7_values_sort_by_creation_time(self):
+        """Verify that UUIDs generated in different milliseconds sort in order."""
+        first = uuid7()
+        time.sleep(0.002)
+        second = uuid7()
+        self.assertLess(first, second)
+
+    def test_uuid7_values_are_unique(self):
+        """Verify that UUIDs generated in the same millisecond still differ."""
+        values = {uuid7() for _ in range(10000)}
+        self.assertEqual(len(values), 10000)
+
+
+class TestDefaultUuid(SimpleTestCase):
+    """Tests for the setting-driven UUID default."""
+
+    @override_settings(USE_TIME_ORDERED_UUIDS=False)
+    def test_default_uuid_is_random_by_default(self):
+        """Verify that random version 4 UUIDs are generated when disabled."""
+        self.assertEqual(default_uuid().version, 4)
+
+    @override_settings(USE_TIME_ORDERED_UUIDS=True)
+    def test_default_uuid_is_time_ordered_when_enabled(self):
+        """Verify that version 7 UUIDs are generated when enabled."""
+        self.assertEqual(default_uuid().version, 7)
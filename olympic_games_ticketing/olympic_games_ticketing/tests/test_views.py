@@ -1,5 +1,8 @@
+from accounts.models import User
+from django.core.cache import cache
 from django.test import TestCase
 from django.urls import reverse
+from products.models import Offer
 
 
 class TestHomePageView(TestCase):
@@ -7,6 +10,7 @@ class TestHomePageView(TestCase):
 
     def setUp(self):
         """Set up the home page URL for reuse in tests."""
+        cache.clear()
         self.url = reverse("home")
 
     def test_home_page_returns_status_200(self):
@@ -18,3 +22,62 @@ class TestHomePageView(TestCase):
         """Test that the home page view renders the 'home.html' template."""
         response = self.client.get(self.url)
         self.assertTemplateUsed(response, "home.html")
+
+    def test_home_page_is_public(self):
+        """
+        Test that the home page is shareable by caches and renders the header
+        to be completed by the browser, without reading the session.
+        """
+        response = self.client.get(self.url)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+        self.assertEqual(response.cookies, {})
+        self.assertContains(
+            response, f'data-header-state-url="{reverse("header-state")}"'
+        )
+        self.assertContains(response, '<span id="cart-quantity-header">0</span>')
+
+
+class TestHeaderStateView(TestCase):
+    """Tests for verifying the behavior of the header state endpoint."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a user and an offer on sale."""
+        cls.user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.offer = Offer.objects.create(name="Solo", slug="solo", price=25)
+        cls.url = reverse("header-state")
+
+    def setUp(self):
+        cache.clear()
+
+    def test_header_state_for_anonymous_visitor(self):
+        """Test that an anonymous visitor gets no cart and no session."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.json(), {"authenticated": False, "cart_quantity": 0})
+        self.assertEqual(response.cookies, {})
+
+    def test_header_state_for_authenticated_user(self):
+        """Test that a logged-in user gets their cart quantity, never cached."""
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("cart-add"), {"action": "post", "offer_id": self.offer.pk}
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.json(), {"authenticated": True, "cart_quantity": 1})
+        self.assertIn("no-store", response["Cache-Control"])
+
+    def test_private_pages_render_the_header(self):
+        """Test that pages specific to the user still render their header."""
+        self.client.force_login(self.user)
+        self.client.post(
+            reverse("cart-add"), {"action": "post", "offer_id": self.offer.pk}
+        )
+        response = self.client.get(reverse("cart"))
+        self.assertContains(response, '<span id="cart-quantity-header">1</span>')
+        self.assertNotContains(response, "data-header-state-url")
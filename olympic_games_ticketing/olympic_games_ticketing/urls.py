@@ -21,17 +21,19 @@ from django.conf.urls.static import static
 from django.contrib import admin
 from django.urls import include, path
 
-from olympic_games_ticketing.views import home_page
+from olympic_games_ticketing.views import header_state, home_page
 
 from . import settings
 
 urlpatterns = [
     path(os.environ.get("ADMIN_SITE_URL"), admin.site.urls),
     path("", home_page, name="home"),
+    path("header-state/", header_state, name="header-state"),
     path("accounts/", include("accounts.urls")),
     path("cart/", include("cart.urls")),
     path("products/", include("products.urls")),
     path("orders/", include("orders.urls")),
+    path("tickets/", include("tickets.urls")),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,39 @@
+import os
+import time
+import uuid
+
+from django.conf import settings
+
+
+def uuid7():
+    """
+    Return a time-ordered UUID, version 7 (RFC 9562).
+
+    The 48 most significant bits hold the Unix timestamp in milliseconds and
+    the remaining 74 free bits are random, so successive UUIDs sort roughly by
+    creation time and land next to each other in a B-tree index.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    random_bits = int.from_bytes(os.urandom(10), "big")
+    rand_a = random_bits >> 68  # 12 bits
+    rand_b = random_bits & ((1 << 62) - 1)  # 62 bits
+    value = (
+        (timestamp_ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | rand_a << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return uuid.UUID(int=value)
+
+
+def default_uuid():
+    """
+    Default value for the UUID fields of the models.
+
+    Returns a time-ordered `uuid7()` when the `USE_TIME_ORDERED_UUIDS` setting
+    is enabled, and a random `uuid.uuid4()` otherwise.
+    """
+    if settings.USE_TIME_ORDERED_UUIDS:
+        return uuid7()
+    return uuid.uuid4()
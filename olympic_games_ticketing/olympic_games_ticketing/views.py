@@ -1,10 +1,33 @@
+from cart.cart import Cart
+from django.http import JsonResponse
 from django.shortcuts import render
+from django.views.decorators.cache import never_cache
 
+from olympic_games_ticketing.page_cache import cached_page, public_page
 
+
+@public_page
+@cached_page
 def home_page(request):
     """
     Render the home page.
 
-    This view displays the main landing page of the site.
+    This view displays the main landing page of the site. It is the same for
+    every visitor, cached server-side and by shared caches.
+    """
+    return render(request, "home.html", {"hydrate_header": True})
+
+
+@never_cache
+def header_state(request):
     """
-    return render(request, "home.html")
+    Return the login state and cart quantity of the visitor as JSON.
+
+    Loaded by the shared pages to complete their header.
+    """
+    authenticated = request.user.is_authenticated
+    cart_quantity = len(Cart(request)) if authenticated else 0
+
+    return JsonResponse(
+        {"authenticated": authenticated, "cart_quantity": cart_quantity}
+    )
@@ -1,6 +1,105 @@
 from django.contrib import admin
+from django.db.models import Sum
+from olympic_games_ticketing.admin_utils import ScalableModelAdmin, parse_uuid
 
-from .models import Order, OrderItem
+from .models import Order, OrderItem, SalesRollup
 
-admin.site.register(Order)
-admin.site.register(OrderItem)
+
+@admin.register(Order)
+class OrderAdmin(ScalableModelAdmin):
+    """
+    Order admin for large tables.
+
+    Search is exact: an order key, a customer's email address or an order
+    number, each served by an index.
+    """
+
+    list_display = ["id", "order_key", "user", "created_at", "total", "is_confirmed"]
+    list_filter = ["is_confirmed"]
+    list_select_related = ["user"]
+    raw_id_fields = ["user"]
+    date_hierarchy = "created_at"
+    search_fields = ["order_key"]
+    search_help_text = "Clé de commande, adresse électronique ou numéro de commande."
+
+    def get_exact_search_results(self, queryset, search_term):
+        order_key = parse_uuid(search_term)
+        if order_key is not None:
+            return queryset.filter(order_key=order_key)
+        if "@" in search_term:
+            return queryset.filter(user__email=search_term)
+        if search_term.isdigit():
+            return queryset.filter(pk=search_term)
+        return queryset.none()
+
+
+@admin.register(OrderItem)
+class OrderItemAdmin(ScalableModelAdmin):
+    """
+    Order item admin for large tables, searched by exact order key or
+    order number.
+    """
+
+    list_display = ["id", "order", "offer", "name", "price", "quantity"]
+    list_filter = ["offer"]
+    list_select_related = ["order__user", "offer"]
+    raw_id_fields = ["order", "offer"]
+    search_fields = ["order__order_key"]
+    search_help_text = "Clé ou numéro de commande."
+
+    def get_exact_search_results(self, queryset, search_term):
+        order_key = parse_uuid(search_term)
+        if order_key is not None:
+            return queryset.filter(order__order_key=order_key)
+        if search_term.isdigit():
+            return queryset.filter(order_id=search_term)
+        return queryset.none()
+
+
+@admin.register(SalesRollup)
+class SalesRollupAdmin(admin.ModelAdmin):
+    """
+    Read-only sales dashboard built on the rollup table only.
+
+    Totals for the current filters are shown above the list. Without a
+    period filter they are computed from the daily rows, so that hourly and
+    daily rows covering the same sales are not counted twice.
+    """
+
+    change_list_template = "admin/orders/salesrollup/change_list.html"
+    list_display = [
+        "period_start",
+        "period",
+        "offer",
+        "quantity",
+        "revenue",
+        "order_count",
+    ]
+    list_filter = ["period", "offer"]
+    list_select_related = ["offer"]
+    date_hierarchy = "period_start"
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def changelist_view(self, request, extra_context=None):
+        response = super().changelist_view(request, extra_context)
+        changelist = getattr(response, "context_data", {}).get("cl")
+        if changelist is None:
+            return response
+
+        rollups = changelist.queryset
+        if "period__exact" not in request.GET:
+            rollups = rollups.filter(period=SalesRollup.Period.DAY)
+        response.context_data["sales_totals"] = rollups.aggregate(
+            quantity=Sum("quantity"),
+            revenue=Sum("revenue"),
+            order_count=Sum("order_count"),
+        )
+        return response
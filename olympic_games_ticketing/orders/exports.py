@@ -0,0 +1,142 @@
+import csv
+import datetime
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from tickets.models import Ticket
+
+from orders.models import Order, OrderItem
+
+EXPORT_CHUNK_SIZE = 2000
+
+# Each dataset: the queryset, its creation date field, the path to the offer
+# it relates to, and the exported columns (header name, values_list lookup),
+# the first being the primary key, by which the export is paged.
+EXPORT_DATASETS = {
+    "orders": {
+        "queryset": lambda: Order.objects.all(),
+        "date_field": "created_at",
+        "offer_field": None,
+        "columns": [
+            ("id", "id"),
+            ("order_key", "order_key"),
+            ("user_email", "user__email"),
+            ("created_at", "created_at"),
+            ("total", "total"),
+            ("is_confirmed", "is_confirmed"),
+        ],
+    },
+    "items": {
+        "queryset": lambda: OrderItem.objects.all(),
+        "date_field": "order__created_at",
+        "offer_field": "offer_id",
+        "columns": [
+            ("id", "id"),
+            ("order_id", "order_id"),
+            ("order_key", "order__order_key"),
+            ("created_at", "order__created_at"),
+            ("offer_id", "offer_id"),
+            ("name", "name"),
+            ("price", "price"),
+            ("quantity", "quantity"),
+            ("is_confirmed", "order__is_confirmed"),
+        ],
+    },
+    "tickets": {
+        "queryset": lambda: Ticket.objects.all(),
+        "date_field": "created_at",
+        "offer_field": "offer_id",
+        "columns": [
+            ("id", "id"),
+            ("order_id", "order_id"),
+            ("order_key", "order__order_key"),
+            ("offer_id", "offer_id"),
+            ("offer_name", "offer__name"),
+            ("final_key", "final_key"),
+            ("created_at", "created_at"),
+            ("is_confirmed", "order__is_confirmed"),
+        ],
+    },
+}
+
+
+def _start_of_day(date):
+    return timezone.make_aware(datetime.datetime.combine(date, datetime.time.min))
+
+
+def export_rows(dataset, start=None, end=None, offer_id=None, chunk_size=None):
+    """
+    Return the header and a lazy iterator over the rows of an export dataset.
+
+    - `start` and `end` are inclusive dates matched against the creation date,
+      as a datetime range so the date column's index can be used.
+    - `offer_id` keeps the rows related to that offer (for orders: the orders
+      containing it).
+
+    Rows are plain tuples from a `values_list` projection, fetched
+    `chunk_size` at a time, so memory usage does not grow with the export.
+    Each chunk is a separate query resuming after the last id of the previous
+    one (keyset pagination) rather than a server-side cursor, which the
+    "pgbouncer" `DATABASE_POOL_MODE` disables.
+    """
+    spec = EXPORT_DATASETS[dataset]
+    queryset = spec["queryset"]()
+    date_field = spec["date_field"]
+    if start is not None:
+        queryset = queryset.filter(**{f"{date_field}__gte": _start_of_day(start)})
+    if end is not None:
+        next_day = end + datetime.timedelta(days=1)
+        queryset = queryset.filter(**{f"{date_field}__lt": _start_of_day(next_day)})
+    if offer_id is not None:
+        if spec["offer_field"] is None:
+            queryset = queryset.filter(
+                id__in=OrderItem.objects.filter(offer_id=offer_id).values("order_id")
+            )
+        else:
+            queryset = queryset.filter(**{spec["offer_field"]: offer_id})
+
+    header = [name for name, _ in spec["columns"]]
+    rows = _iter_by_id(
+        queryset.order_by("id").values_list(*(lookup for _, lookup in spec["columns"])),
+        chunk_size or EXPORT_CHUNK_SIZE,
+    )
+    return header, rows
+
+
+def _iter_by_id(queryset, chunk_size):
+    last_id = None
+    while True:
+        chunk = queryset if last_id is None else queryset.filter(id__gt=last_id)
+        rows = list(chunk[:chunk_size])
+        yield from rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1][0]
+
+
+class _Echo:
+    """File-like object whose `write` returns the written value."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(header, rows):
+    """Yield the header and rows as encoded CSV lines."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(header).encode()
+    for row in rows:
+        yield writer.writerow(row).encode()
+
+
+def iter_jsonl(header, rows):
+    """Yield one encoded JSON object per row (JSON Lines)."""
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield (encoder.encode(dict(zip(header, row))) + "\n").encode()
+
+
+EXPORT_FORMATS = {
+    "csv": (iter_csv, "text/csv"),
+    "jsonl": (iter_jsonl, "application/x-ndjson"),
+}
@@ -0,0 +1,26 @@
+from django import forms
+from products.models import Offer
+
+
+class ExportFilterForm(forms.Form):
+    """
+    Filters accepted by the order, item and ticket exports.
+
+    Both dates are optional and inclusive; the offer restricts the export to
+    the rows related to it.
+    """
+
+    start = forms.DateField(required=False, label="Du")
+    end = forms.DateField(required=False, label="Au")
+    offer = forms.ModelChoiceField(
+        queryset=Offer.objects.all(), required=False, label="Offre"
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        start, end = cleaned_data.get("start"), cleaned_data.get("end")
+        if start and end and end < start:
+            raise forms.ValidationError(
+                "La date de fin doit être postérieure à la date de début."
+            )
+        return cleaned_data
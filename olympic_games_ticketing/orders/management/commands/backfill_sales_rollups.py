@@ -0,0 +1,72 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, DecimalField, ExpressionWrapper, F, Sum
+from django.db.models.functions import TruncDay, TruncHour
+from django.utils import timezone
+
+from orders.models import OrderItem, SalesRollup
+
+TRUNCATIONS = {
+    SalesRollup.Period.HOUR: TruncHour,
+    SalesRollup.Period.DAY: TruncDay,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the hourly and daily sales rollups from the confirmed orders. "
+        "Existing rollups are replaced in a single transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Number of rollup rows inserted per query.",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            SalesRollup.objects.all().delete()
+            for period, truncation in TRUNCATIONS.items():
+                created = SalesRollup.objects.bulk_create(
+                    self.aggregate(period, truncation),
+                    batch_size=options["batch_size"],
+                )
+                self.stdout.write(f"{period}: {len(created)} rollup(s).")
+        self.stdout.write(self.style.SUCCESS("Sales rollups rebuilt."))
+
+    def aggregate(self, period, truncation):
+        """Aggregate confirmed order items per offer and period in the database."""
+        rows = (
+            OrderItem.objects.filter(order__is_confirmed=True)
+            .annotate(
+                period_start=truncation(
+                    "order__created_at", tzinfo=timezone.get_current_timezone()
+                )
+            )
+            .values("offer_id", "period_start")
+            .annotate(
+                total_quantity=Sum("quantity"),
+                total_revenue=Sum(
+                    ExpressionWrapper(
+                        F("price") * F("quantity"),
+                        output_field=DecimalField(max_digits=12, decimal_places=2),
+                    )
+                ),
+                total_orders=Count("order_id", distinct=True),
+            )
+            .order_by()
+        )
+        return [
+            SalesRollup(
+                offer_id=row["offer_id"],
+                period=period,
+                period_start=row["period_start"],
+                quantity=row["total_quantity"],
+                revenue=row["total_revenue"],
+                order_count=row["total_orders"],
+            )
+            for row in rows
+        ]
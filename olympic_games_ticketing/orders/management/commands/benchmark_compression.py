@@ -0,0 +1,77 @@
+from django.core.management.base import BaseCommand
+from django.template.loader import render_to_string
+from django.utils.text import compress_string
+from olympic_games_ticketing.benchmarks import (
+    benchmark_pages,
+    rolled_back,
+    seed_orders,
+    time_call,
+)
+from olympic_games_ticketing.compression import (
+    GZIP_MAX_RANDOM_BYTES,
+    brotli,
+    compress_brotli,
+)
+
+from orders.exports import export_rows, iter_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the CPU time and the bytes saved by gzip and brotli on the "
+        "real pages and on a ticket export, rendered from synthetic data that "
+        "is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--offers", type=int, default=20)
+        parser.add_argument(
+            "--tickets", type=int, default=40, help="Tickets per order."
+        )
+        parser.add_argument(
+            "--orders", type=int, default=500, help="Orders in the export."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=20, help="Compressions per body."
+        )
+
+    def handle(self, *args, **options):
+        codings = {
+            "gzip": lambda body: compress_string(
+                body, max_random_bytes=GZIP_MAX_RANDOM_BYTES
+            ),
+        }
+        if brotli is not None:
+            codings["br"] = compress_brotli
+        else:
+            self.stdout.write("brotli is not installed: only gzip is measured.")
+
+        with rolled_back():
+            _offers, _users, orders = seed_orders(
+                users=max(1, options["orders"] // 10),
+                orders=options["orders"],
+                tickets_per_order=options["tickets"],
+                offers=options["offers"],
+            )
+            pages = benchmark_pages(orders[0].user, orders[0])
+            bodies = {
+                label: render_to_string(template_name, context, request).encode()
+                for label, (template_name, context, request) in pages.items()
+            }
+            bodies["tickets export"] = b"".join(iter_csv(*export_rows("tickets")))
+
+            for label, body in bodies.items():
+                results = []
+                for name, compress in codings.items():
+                    size = len(compress(body))
+                    ms = time_call(
+                        lambda compress=compress, body=body: compress(body),
+                        repeat=options["repeat"],
+                    )
+                    results.append(
+                        f"{name} {size / 1000:.1f} kB "
+                        f"(-{100 - 100 * size / len(body):.0f}%) in {ms:.2f} ms"
+                    )
+                self.stdout.write(
+                    f"{label:>20}: {len(body) / 1000:.1f} kB, " + ", ".join(results)
+                )
@@ -0,0 +1,143 @@
+import statistics
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.db import DatabaseError, connections
+from django.db.backends.signals import connection_created
+from products.models import Offer
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the request latency, the connections opened and held, and the "
+        "connection setup time (connect, health check or pool checkout) of the "
+        "configured DATABASE_POOL_MODE, with several concurrent workers each "
+        "running simulated requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            nargs="+",
+            default=[1, 4, 16],
+            help="Numbers of concurrent workers to measure.",
+        )
+        parser.add_argument(
+            "--requests", type=int, default=200, help="Requests per worker."
+        )
+        parser.add_argument("--database", default="default")
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        if alias not in settings.DATABASES:
+            raise CommandError(f"Unknown database: {alias}.")
+
+        vendor = connections[alias].vendor
+        if vendor == "postgresql":
+            # DATABASE_POOL_MODE only applies to PostgreSQL.
+            self.stdout.write(f"{vendor}, {settings.DATABASE_POOL_MODE} connections")
+        else:
+            self.stdout.write(vendor)
+        for workers in options["workers"]:
+            self._run(alias, workers, options["requests"])
+
+    def _run(self, alias, workers, requests):
+        opened = []
+
+        def count_connection(sender, connection, **kwargs):
+            if connection.alias == alias:
+                opened.append(connection)
+
+        results = []
+        # Workers wait here once done, while their connections are counted,
+        # then again until they may close them.
+        barrier = threading.Barrier(workers + 1)
+        threads = [
+            threading.Thread(
+                target=self._worker, args=(alias, requests, barrier, results)
+            )
+            for _ in range(workers)
+        ]
+
+        connection_created.connect(count_connection)
+        try:
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            barrier.wait()
+            elapsed = time.perf_counter() - started
+            held = self._server_connections(alias)
+            barrier.wait()
+            for thread in threads:
+                thread.join()
+        finally:
+            connection_created.disconnect(count_connection)
+
+        errors = [result for result in results if isinstance(result, Exception)]
+        if errors:
+            raise CommandError(f"A worker failed: {errors[0]!r}")
+
+        latencies = [ms for worker_latencies, _ in results for ms in worker_latencies]
+        setups = [ms for _, worker_setups in results for ms in worker_setups]
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0
+        self.stdout.write(
+            f"{workers:>3} workers: {len(latencies) / elapsed:.0f} requests/s, "
+            f"latency {statistics.mean(latencies):.2f} ms (p95 {p95:.2f} ms), "
+            f"setup {statistics.mean(setups):.3f} ms per request, "
+            f"{len(opened)} connects, "
+            f"{'n/a' if held is None else held} server connections held"
+        )
+
+    def _worker(self, alias, requests, barrier, results):
+        connection = connections[alias]
+        latencies, setups = [], []
+        try:
+            for _ in range(requests):
+                started = time.perf_counter()
+                # Closes the obsolete connections and schedules the health
+                # check, as at the start of a real request.
+                request_started.send(sender=self.__class__, environ={})
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+                    setup_done = time.perf_counter()
+                    list(
+                        Offer.objects.using(alias)
+                        .filter(is_active=True)
+                        .values_list("pk", "price")
+                    )
+                    round_trip = time.perf_counter()
+                    cursor.execute("SELECT 1")
+                    round_trip = time.perf_counter() - round_trip
+                request_finished.send(sender=self.__class__)
+                finished = time.perf_counter()
+                # The first query pays for the connection setup on top of
+                # the round trip of the last one.
+                setups.append(max(0, setup_done - started - round_trip) * 1000)
+                latencies.append((finished - started) * 1000)
+            results.append((latencies, setups))
+        except DatabaseError as error:
+            results.append(error)
+        finally:
+            barrier.wait()
+            barrier.wait()
+            connections.close_all()
+
+    def _server_connections(self, alias):
+        """
+        Return the number of client connections of the benchmark workers held
+        by the PostgreSQL server, or None on other databases.
+        """
+        connection = connections[alias]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT count(*) FROM pg_stat_activity "
+                "WHERE datname = current_database() "
+                "AND backend_type = 'client backend' AND pid <> pg_backend_pid()"
+            )
+            return cursor.fetchone()[0]
@@ -0,0 +1,87 @@
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from olympic_games_ticketing.benchmarks import rolled_back, seed_orders
+from tickets.models import Ticket
+
+from orders.exports import EXPORT_DATASETS, export_rows, iter_csv
+
+
+class _CountingSink:
+    """Discard written data, keeping only its size."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the peak memory of a ticket CSV export built from model "
+        "instances loaded at once with the streamed values_list export, on "
+        "synthetic data that is rolled back afterwards. Use --orders 1000000 "
+        "for an export of millions of rows."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=100000)
+        parser.add_argument("--tickets-per-order", type=int, default=2)
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.stdout.write("Seeding data...")
+            seed_orders(
+                users=max(1, options["orders"] // 10),
+                orders=options["orders"],
+                tickets_per_order=options["tickets_per_order"],
+            )
+            header = [name for name, _ in EXPORT_DATASETS["tickets"]["columns"]]
+
+            def loaded():
+                tickets = list(Ticket.objects.select_related("order", "offer"))
+                rows = (
+                    (
+                        ticket.id,
+                        ticket.order_id,
+                        ticket.order.order_key,
+                        ticket.offer_id,
+                        ticket.offer.name,
+                        ticket.final_key,
+                        ticket.created_at,
+                        ticket.order.is_confirmed,
+                    )
+                    for ticket in tickets
+                )
+                return iter_csv(header, rows)
+
+            def streamed():
+                return iter_csv(
+                    *export_rows("tickets", chunk_size=options["chunk_size"])
+                )
+
+            for label, build in (("loaded", loaded), ("streamed", streamed)):
+                rows, size, seconds, peak = self.measure(build)
+                self.stdout.write(
+                    f"{label:>8}: {rows - 1} rows, {size / 1e6:.1f} MB written "
+                    f"in {seconds:.2f}s, peak memory {peak / 1e6:.1f} MB"
+                )
+
+    def measure(self, build):
+        """Consume an export and return its rows, size, duration and peak memory."""
+        sink = _CountingSink()
+        rows = 0
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            for chunk in build():
+                sink.write(chunk)
+                rows += 1
+            seconds = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return rows, sink.size, seconds, peak
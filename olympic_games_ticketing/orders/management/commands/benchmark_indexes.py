@@ -0,0 +1,139 @@
+from django.core.management.base import BaseCommand
+from django.db import connection, models
+from olympic_games_ticketing.benchmarks import rolled_back, seed_orders, time_call
+from products.models import Offer
+from tickets.models import Ticket
+
+from orders.models import Order
+
+# Single-column indexes Django created implicitly on the foreign keys before
+# the composite indexes replaced them.
+LEGACY_INDEXES = [
+    (Order, models.Index(fields=["user"], name="benchmark_order_user_idx")),
+    (Ticket, models.Index(fields=["order"], name="benchmark_ticket_order_idx")),
+]
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a large order history in a rolled-back transaction and compare "
+        "EXPLAIN plans and timings of the hot queries with the legacy foreign "
+        "key indexes (before) and with the composite/partial indexes (after)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=5000)
+        parser.add_argument("--orders", type=int, default=100000)
+        parser.add_argument("--tickets-per-order", type=int, default=2)
+        parser.add_argument("--offers", type=int, default=2000)
+        parser.add_argument(
+            "--repeat", type=int, default=50, help="Runs per timed query."
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.stdout.write("Seeding…")
+            _offers, users, orders = seed_orders(
+                users=options["users"],
+                orders=options["orders"],
+                tickets_per_order=options["tickets_per_order"],
+                offers=options["offers"],
+            )
+            user = users[len(users) // 2]
+            order = orders[len(orders) // 2]
+            offer = order.tickets.first().offer
+            queries = {
+                "latest order of a user": lambda: list(
+                    Order.objects.filter(user=user).order_by("-created_at")[:1]
+                ),
+                "tickets of an order": lambda: list(
+                    Ticket.objects.filter(order=order).select_related("offer")
+                ),
+                "tickets of an order for an offer": lambda: list(
+                    Ticket.objects.filter(order=order, offer=offer)
+                ),
+                "ticket by final key": lambda: list(
+                    Ticket.objects.filter_by_final_key(f"benchmark-{order.pk}-0")
+                ),
+                "offers list": lambda: list(
+                    Offer.objects.filter(is_active=True).order_by("seats")
+                ),
+            }
+
+            current_indexes = [
+                (model, index)
+                for model in (Order, Ticket, Offer)
+                for index in model._meta.indexes
+            ]
+
+            self.swap_indexes(current_indexes, LEGACY_INDEXES)
+            before = self.run_queries(queries, options["repeat"])
+
+            self.swap_indexes(LEGACY_INDEXES, current_indexes)
+            after = self.run_queries(queries, options["repeat"])
+
+        self.stdout.write("")
+        for label in queries:
+            before_ms, before_plan = before[label]
+            after_ms, after_plan = after[label]
+            self.stdout.write(self.style.MIGRATE_HEADING(label))
+            self.stdout.write(f"  before: {before_ms:.3f} ms")
+            self.stdout.write(self.indent(before_plan))
+            self.stdout.write(f"  after:  {after_ms:.3f} ms")
+            self.stdout.write(self.indent(after_plan))
+
+    def swap_indexes(self, removed, added):
+        """
+        Drop then create indexes, and refresh the planner statistics.
+
+        The statements are run directly rather than through a schema editor
+        context, which SQLite refuses to open inside a transaction.
+        """
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model, index in removed:
+                cursor.execute(
+                    editor.sql_delete_index
+                    % {
+                        "name": editor.quote_name(index.name),
+                        "table": editor.quote_name(model._meta.db_table),
+                    }
+                )
+            for model, index in added:
+                cursor.execute(str(index.create_sql(model, editor)))
+            cursor.execute("ANALYZE")
+
+    def run_queries(self, queries, repeat):
+        """
+        Return the median duration and the EXPLAIN plan of each query.
+
+        Only the SQL statements are timed, so ORM overhead does not hide the
+        effect of the indexes.
+        """
+        results = {}
+        for label, query in queries.items():
+            with connection.execute_wrapper(self.capture_sql):
+                self.captured = []
+                query()
+            plan = "\n".join(self.explain(sql, params) for sql, params in self.captured)
+            results[label] = (time_call(self.execute_captured, repeat), plan)
+        return results
+
+    def execute_captured(self):
+        with connection.cursor() as cursor:
+            for sql, params in self.captured:
+                cursor.execute(sql, params)
+                cursor.fetchall()
+
+    def capture_sql(self, execute, sql, params, many, context):
+        self.captured.append((sql, params))
+        return execute(sql, params, many, context)
+
+    def explain(self, sql, params):
+        prefix = "EXPLAIN QUERY PLAN" if connection.vendor == "sqlite" else "EXPLAIN"
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql}", params)
+            return "\n".join(" ".join(map(str, row)) for row in cursor.fetchall())
+
+    def indent(self, text):
+        return "\n".join(f"    {line}" for line in text.splitlines())
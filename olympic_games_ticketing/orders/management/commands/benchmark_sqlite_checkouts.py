@@ -0,0 +1,124 @@
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connections, transaction
+from olympic_games_ticketing.benchmarks import seed_orders
+from products.models import Offer
+
+from orders.models import Order
+from orders.services import create_order
+
+
+class Command(BaseCommand):
+    help = (
+        "Run concurrent checkouts against fresh SQLite databases with the "
+        "default and the tuned settings, and compare their throughput, latency "
+        "and the checkouts that failed with 'database is locked'."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=8)
+        parser.add_argument(
+            "--checkouts", type=int, default=25, help="Checkouts per worker."
+        )
+        parser.add_argument("--offers", type=int, default=5)
+
+    def handle(self, *args, **options):
+        if connections[DEFAULT_DB_ALIAS].vendor != "sqlite":
+            raise CommandError("The default database is not SQLite.")
+
+        profiles = {"default": {}, "tuned": settings.SQLITE_TUNED_OPTIONS}
+        for name, sqlite_options in profiles.items():
+            with (
+                tempfile.TemporaryDirectory() as directory,
+                self._database(Path(directory) / "benchmark.sqlite3", sqlite_options),
+            ):
+                call_command("migrate", verbosity=0)
+                offers, users, _ = seed_orders(
+                    users=options["workers"], orders=0, offers=options["offers"]
+                )
+                self._run(name, [offer.pk for offer in offers], users, options)
+
+    @contextmanager
+    def _database(self, name, sqlite_options):
+        """
+        Point the default database to the SQLite file `name` opened with
+        `sqlite_options`, in this thread and the threads started in the block.
+        """
+        previous_settings = connections.settings[DEFAULT_DB_ALIAS]
+        previous_connection = connections[DEFAULT_DB_ALIAS]
+        connections.settings[DEFAULT_DB_ALIAS] = {
+            **previous_settings,
+            "NAME": name,
+            "OPTIONS": sqlite_options,
+        }
+        connections[DEFAULT_DB_ALIAS] = connections.create_connection(DEFAULT_DB_ALIAS)
+        try:
+            yield
+        finally:
+            connections[DEFAULT_DB_ALIAS].close()
+            connections[DEFAULT_DB_ALIAS] = previous_connection
+            connections.settings[DEFAULT_DB_ALIAS] = previous_settings
+            # Forget the content types cached by the migrations of the file.
+            ContentType.objects.clear_cache()
+
+    def _run(self, name, offer_ids, users, options):
+        results = []
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(user, offer_ids, options["checkouts"], results),
+            )
+            for user in users
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        latencies = [ms for worker_latencies, _ in results for ms in worker_latencies]
+        failed = sum(worker_failed for _, worker_failed in results)
+        p95 = statistics.quantiles(latencies, n=20)[-1] if len(latencies) > 1 else 0
+        placed = Order.objects.using(DEFAULT_DB_ALIAS).count()
+        self.stdout.write(
+            f"{name:>8}: {placed} checkouts in {elapsed:.2f} s "
+            f"({placed / elapsed:.0f}/s), {failed} failed, "
+            f"latency {statistics.mean(latencies or [0]):.1f} ms "
+            f"(p95 {p95:.1f} ms)"
+        )
+
+    def _worker(self, user, offer_ids, checkouts, results):
+        latencies, failed = [], 0
+        try:
+            for _ in range(checkouts):
+                started = time.perf_counter()
+                try:
+                    # As in a checkout, the offers are read, then the order
+                    # is written in the same transaction.
+                    with transaction.atomic():
+                        offers = Offer.objects.filter(pk__in=offer_ids)
+                        create_order(
+                            user,
+                            [(offer, offer.name, offer.price, 1) for offer in offers],
+                        )
+                    # The confirmation page the customer is redirected to.
+                    Order.objects.using(DEFAULT_DB_ALIAS).filter(user=user).order_by(
+                        "-created_at"
+                    ).first()
+                except OperationalError:
+                    failed += 1
+                else:
+                    latencies.append((time.perf_counter() - started) * 1000)
+        finally:
+            results.append((latencies, failed))
+            connections.close_all()
@@ -0,0 +1,106 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.jinja2 import Jinja2
+from olympic_games_ticketing.benchmarks import (
+    benchmark_pages,
+    rolled_back,
+    seed_orders,
+    time_call,
+)
+
+
+def _engine(loaders):
+    """
+    Return a Django template engine configured as in the settings but for
+    `loaders`.
+    """
+    config = next(
+        config
+        for config in settings.TEMPLATES
+        if config["BACKEND"] == "django.template.backends.django.DjangoTemplates"
+    )
+    return DjangoTemplates(
+        {
+            "NAME": "benchmark",
+            "DIRS": config["DIRS"],
+            "APP_DIRS": False,
+            "OPTIONS": {**config["OPTIONS"], "loaders": loaders},
+        }
+    )
+
+
+def _jinja2_engine():
+    """Return the Jinja2 template engine, whether it is enabled or not."""
+    config = settings.JINJA2_TEMPLATE_ENGINE
+    return Jinja2(
+        {
+            "NAME": "benchmark-jinja2",
+            "DIRS": config["DIRS"],
+            "APP_DIRS": config["APP_DIRS"],
+            "OPTIONS": config["OPTIONS"],
+        }
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the median render time of the pages extending base.html "
+        "(header, footer, offer cards, cart, order confirmation with many QR "
+        "images) with the plain and the cached template loaders, and with "
+        "Jinja2 for the pages that have a Jinja2 version, on synthetic data "
+        "that is rolled back afterwards. Also prints the renders per second."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--offers", type=int, default=20)
+        parser.add_argument(
+            "--tickets", type=int, default=40, help="Tickets on the confirmation."
+        )
+        parser.add_argument(
+            "--repeat", type=int, default=50, help="Renders per timed page."
+        )
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            _offers, users, orders = seed_orders(
+                users=1,
+                orders=1,
+                tickets_per_order=options["tickets"],
+                offers=options["offers"],
+            )
+            pages = benchmark_pages(users[0], orders[0])
+
+            engines = {
+                "plain": _engine(settings.TEMPLATE_LOADERS),
+                "cached": _engine(
+                    [
+                        (
+                            "django.template.loaders.cached.Loader",
+                            settings.TEMPLATE_LOADERS,
+                        )
+                    ]
+                ),
+                "jinja2": _jinja2_engine(),
+            }
+            for label, (template_name, context, request) in pages.items():
+                results = []
+                for name, engine in engines.items():
+                    try:
+                        engine.get_template(template_name)
+                    except TemplateDoesNotExist:
+                        continue
+
+                    def render(
+                        engine=engine,
+                        template_name=template_name,
+                        context=context,
+                        request=request,
+                    ):
+                        engine.get_template(template_name).render(context, request)
+
+                    render()
+                    ms = time_call(render, repeat=options["repeat"])
+                    results.append(f"{name} {ms:.2f} ms ({1000 / ms:.0f}/s)")
+                self.stdout.write(f"{label:>20}: " + ", ".join(results))
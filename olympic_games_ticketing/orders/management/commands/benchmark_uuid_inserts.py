@@ -0,0 +1,68 @@
+import uuid
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from olympic_games_ticketing.benchmarks import rolled_back, seed_orders, time_call
+from olympic_games_ticketing.uuids import uuid7
+
+from orders.models import Order
+
+GENERATORS = {"uuid4 (random)": uuid.uuid4, "uuid7 (time-ordered)": uuid7}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the insert throughput of orders keyed by random and by "
+        "time-ordered UUIDs into a large, indexed orders table."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--existing",
+            type=int,
+            default=200000,
+            help="Number of orders seeded before measuring.",
+        )
+        parser.add_argument(
+            "--inserts", type=int, default=50000, help="Number of orders inserted."
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        results = {}
+        for label, generator in GENERATORS.items():
+            with rolled_back():
+                _, users, _ = seed_orders(
+                    users=100, orders=0, tickets_per_order=0, offers=1
+                )
+                # Seed with the same generator, so the index already has the
+                # key distribution of a table that always used it.
+                self.insert_orders(users, generator, options["existing"], options)
+                duration = time_call(
+                    lambda users=users, generator=generator: self.insert_orders(
+                        users, generator, options["inserts"], options
+                    ),
+                    repeat=1,
+                )
+            results[label] = duration
+            rate = options["inserts"] / duration * 1000
+            self.stdout.write(f"{label}: {duration:.0f} ms ({rate:,.0f} inserts/s)")
+
+        random_ms, ordered_ms = results.values()
+        self.stdout.write(
+            self.style.SUCCESS(f"uuid4 / uuid7 duration: x{random_ms / ordered_ms:.2f}")
+        )
+
+    def insert_orders(self, users, generator, count, options):
+        batch_size = options["batch_size"]
+        for start in range(0, count, batch_size):
+            Order.objects.bulk_create(
+                [
+                    Order(
+                        user=users[i % len(users)],
+                        total=Decimal(25),
+                        order_key=generator(),
+                    )
+                    for i in range(start, min(start + batch_size, count))
+                ]
+            )
@@ -0,0 +1,58 @@
+import datetime
+
+from django.core.management.base import BaseCommand
+
+from orders.exports import EXPORT_DATASETS, EXPORT_FORMATS, export_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream orders, order items or tickets as CSV or JSON Lines to a file "
+        "or to standard output, reading the database in chunks."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("dataset", choices=list(EXPORT_DATASETS))
+        parser.add_argument(
+            "--format", choices=list(EXPORT_FORMATS), default="csv", dest="file_format"
+        )
+        parser.add_argument(
+            "--start",
+            type=datetime.date.fromisoformat,
+            help="First creation date to export (YYYY-MM-DD, inclusive).",
+        )
+        parser.add_argument(
+            "--end",
+            type=datetime.date.fromisoformat,
+            help="Last creation date to export (YYYY-MM-DD, inclusive).",
+        )
+        parser.add_argument(
+            "--offer", type=int, help="Only export rows related to this offer id."
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of rows fetched from the database at a time.",
+        )
+        parser.add_argument(
+            "--output", help="File to write to (default: standard output)."
+        )
+
+    def handle(self, *args, **options):
+        iter_export, _ = EXPORT_FORMATS[options["file_format"]]
+        header, rows = export_rows(
+            options["dataset"],
+            start=options["start"],
+            end=options["end"],
+            offer_id=options["offer"],
+            chunk_size=options["chunk_size"],
+        )
+        chunks = iter_export(header, rows)
+
+        if options["output"]:
+            with open(options["output"], "wb") as file:
+                file.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
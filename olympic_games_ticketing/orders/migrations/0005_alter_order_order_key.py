@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:12
+
+import olympic_games_ticketing.uuids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_alter_order_user_order_order_user_created_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='order',
+            name='order_key',
+            field=models.UUIDField(default=olympic_games_ticketing.uuids.default_uuid, editable=False, unique=True),
+        ),
+    ]
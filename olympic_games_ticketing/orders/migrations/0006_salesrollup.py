@@ -0,0 +1,34 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:16
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0005_alter_order_order_key'),
+        ('products', '0012_offer_offer_active_seats_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SalesRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('period', models.CharField(choices=[('hour', 'Heure'), ('day', 'Jour')], max_length=4, verbose_name='Période')),
+                ('period_start', models.DateTimeField(verbose_name='Début de la période')),
+                ('quantity', models.IntegerField(default=0, verbose_name='Quantité vendue')),
+                ('revenue', models.DecimalField(decimal_places=2, default=Decimal('0.00'), max_digits=12, verbose_name="Chiffre d'affaires")),
+                ('order_count', models.IntegerField(default=0, verbose_name='Nombre de commandes')),
+                ('offer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sales_rollups', to='products.offer', verbose_name='Offre')),
+            ],
+            options={
+                'verbose_name': 'Statistique de ventes',
+                'verbose_name_plural': 'Statistiques de ventes',
+                'ordering': ['-period_start', 'offer'],
+                'constraints': [models.UniqueConstraint(fields=('offer', 'period', 'period_start'), name='sales_rollup_offer_period_start_uniq')],
+            },
+        ),
+    ]
@@ -1,8 +1,14 @@
-import uuid
+import operator
+from collections import defaultdict
+from decimal import Decimal
+from functools import reduce
 
 from django.conf import settings
-from django.db import models
-from django.db.models import F
+from django.db import models, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from olympic_games_ticketing.queries import bulk_increment
+from olympic_games_ticketing.uuids import default_uuid
 from products.models import Offer
 
 
@@ -19,6 +25,8 @@ class Order(models.Model):
         on_delete=models.CASCADE,
         related_name="orders",
         verbose_name="Utilisateur ayant effectué la commande",
+        # Covered by the (user, -created_at) index below.
+        db_index=False,
     )
     created_at = models.DateTimeField(
         auto_now_add=True,
@@ -36,7 +44,8 @@ class Order(models.Model):
         verbose_name="Montant total de la commande",
     )
     order_key = models.UUIDField(
-        default=uuid.uuid4,
+        default=default_uuid,
+        unique=True,
         editable=False,
     )
     is_confirmed = models.BooleanField(
@@ -50,11 +59,17 @@ class Order(models.Model):
 
         - ordering: sorts Order instances by `updated_at` descending,
         so the most recently modified orders appear first.
+        - indexes: serves a user's orders newest first (order confirmation),
+        and date ranges over every order (admin date hierarchy, exports).
         - verbose_name: singular label displayed in the Django admin.
         - verbose_name_plural: plural label displayed in the Django admin.
         """
 
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["user", "-created_at"], name="order_user_created_idx"),
+            models.Index(fields=["created_at"], name="order_created_idx"),
+        ]
         verbose_name = "Commande"
         verbose_name_plural = "Commandes"
 
@@ -68,6 +83,37 @@ class Order(models.Model):
         status = "Confirmée" if self.is_confirmed else "Annulée"
         return f"Commande #{self.id} - {self.user} - {status} - {self.total} €"
 
+    def save(self, *args, **kwargs):
+        """
+        Override save to keep the sales rollups in step when an existing
+        order is cancelled (`is_confirmed` set to False) or confirmed again.
+        """
+        update_fields = kwargs.get("update_fields")
+        if self.pk is None or (
+            update_fields is not None and "is_confirmed" not in update_fields
+        ):
+            super().save(*args, **kwargs)
+            return
+
+        with transaction.atomic():
+            was_confirmed = (
+                Order.objects.select_for_update()
+                .filter(pk=self.pk)
+                .values_list("is_confirmed", flat=True)
+                .first()
+            )
+            super().save(*args, **kwargs)
+            if was_confirmed is not None and was_confirmed != self.is_confirmed:
+                SalesRollup.record(
+                    (
+                        (offer_id, self.created_at, quantity, price * quantity)
+                        for offer_id, price, quantity in self.items.values_list(
+                            "offer_id", "price", "quantity"
+                        )
+                    ),
+                    sign=1 if self.is_confirmed else -1,
+                )
+
 
 class OrderItem(models.Model):
     """
@@ -122,12 +168,13 @@ class OrderItem(models.Model):
 
         Format: <quantity> x <offer_name> (Commande #<order_id>).
         """
-        return f"{self.quantity} x {self.name} (Commande #{self.order.id})"
+        return f"{self.quantity} x {self.name} (Commande #{self.order_id})"
 
     def save(self, *args, **kwargs):
         """
         Override save to increment the `sales` field on Offer
-        whenever a new OrderItem is created.
+        whenever a new OrderItem is created, and to add it to the
+        sales rollups when its order is confirmed.
         """
         is_new = self.pk is None
         super().save(*args, **kwargs)
@@ -135,3 +182,151 @@ class OrderItem(models.Model):
             Offer.objects.filter(pk=self.offer.pk).update(
                 sales=F("sales") + self.quantity
             )
+            if self.order.is_confirmed:
+                SalesRollup.record(
+                    [
+                        (
+                            self.offer_id,
+                            self.order.created_at,
+                            self.quantity,
+                            self.price * self.quantity,
+                        )
+                    ]
+                )
+
+
+class SalesRollup(models.Model):
+    """
+    Per-offer sales totals over an hour or a day.
+
+    Rows are kept up to date incrementally as confirmed orders are created
+    and cancelled, so reporting reads a handful of rows per offer and period
+    instead of scanning every order item. `backfill_sales_rollups` rebuilds
+    them from the order history.
+    """
+
+    class Period(models.TextChoices):
+        HOUR = "hour", "Heure"
+        DAY = "day", "Jour"
+
+    offer = models.ForeignKey(
+        Offer,
+        on_delete=models.CASCADE,
+        related_name="sales_rollups",
+        verbose_name="Offre",
+    )
+    period = models.CharField(
+        max_length=4,
+        choices=Period.choices,
+        verbose_name="Période",
+    )
+    period_start = models.DateTimeField(
+        verbose_name="Début de la période",
+    )
+    quantity = models.IntegerField(
+        default=0,
+        verbose_name="Quantité vendue",
+    )
+    revenue = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=Decimal("0.00"),
+        verbose_name="Chiffre d'affaires",
+    )
+    order_count = models.IntegerField(
+        default=0,
+        verbose_name="Nombre de commandes",
+    )
+
+    class Meta:
+        """
+        Meta options for SalesRollup model:
+
+        - ordering: most recent periods first.
+        - constraints: a single row per offer, period and period start,
+        which the incremental updates rely on.
+        - verbose_name: singular label displayed in the Django admin.
+        - verbose_name_plural: plural label displayed in the Django admin.
+        """
+
+        ordering = ["-period_start", "offer"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["offer", "period", "period_start"],
+                name="sales_rollup_offer_period_start_uniq",
+            ),
+        ]
+        verbose_name = "Statistique de ventes"
+        verbose_name_plural = "Statistiques de ventes"
+
+    def __str__(self):
+        """
+        Return a readable representation of the rollup
+        for display purposes (e.g., in the admin interface).
+
+        Format: <offer> - <period> du <period_start>.
+        """
+        return f"{self.offer} - {self.get_period_display()} du {self.period_start}"
+
+    @classmethod
+    def period_start_for(cls, moment, period):
+        """Return the start of the hour or day `moment` falls in, in local time."""
+        start = timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+        if period == cls.Period.DAY:
+            start = start.replace(hour=0)
+        return start
+
+    @classmethod
+    def record(cls, sales, sign=1):
+        """
+        Add sales to the hourly and daily rollups, or remove them when
+        `sign` is -1 (order cancellation).
+
+        `sales` is an iterable of `(offer_id, ordered_at, quantity, revenue)`
+        tuples, one per order item: each item counts as one order for its
+        offer. Missing rows are created empty, then the deltas, merged per
+        row, are added with a single `bulk_increment()` UPDATE, so the number
+        of queries does not depend on the number of items and concurrent
+        orders never overwrite each other's totals.
+        """
+        deltas = defaultdict(lambda: [0, Decimal("0.00"), 0])
+        for offer_id, ordered_at, quantity, revenue in sales:
+            for period in cls.Period.values:
+                delta = deltas[
+                    offer_id, period, cls.period_start_for(ordered_at, period)
+                ]
+                delta[0] += sign * quantity
+                delta[1] += sign * revenue
+                delta[2] += sign
+
+        if not deltas:
+            return
+
+        cls.objects.bulk_create(
+            [
+                cls(offer_id=offer_id, period=period, period_start=period_start)
+                for offer_id, period, period_start in deltas
+            ],
+            ignore_conflicts=True,
+        )
+        rows = cls.objects.filter(
+            reduce(
+                operator.or_,
+                (
+                    Q(offer_id=offer_id, period=period, period_start=period_start)
+                    for offer_id, period, period_start in deltas
+                ),
+            )
+        ).values_list("pk", "offer_id", "period", "period_start")
+        bulk_increment(
+            cls,
+            {
+                pk: dict(
+                    zip(
+                        ("quantity", "revenue", "order_count"),
+                        deltas[offer_id, period, period_start],
+                    )
+                )
+                for pk, offer_id, period, period_start in rows
+            },
+        )
@@ -0,0 +1,144 @@
+import logging
+import time
+from collections import Counter
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from olympic_games_ticketing.queries import bulk_increment
+from products.models import Offer
+from tickets.models import Ticket
+
+from orders.models import Order, OrderItem, SalesRollup
+
+logger = logging.getLogger(__name__)
+
+
+class PricesChanged(Exception):
+    """Raised when an offer of an order changed price or left sale."""
+
+
+def create_order(user, lines):
+    """
+    Create a confirmed order with its items and tickets.
+
+    `lines` is an iterable of `(offer, name, price, quantity)` tuples, one
+    per cart line, where `offer` is an `Offer` or a catalog entry (only its
+    `id` and `seats` are read). Everything is written with a fixed number of queries
+    whatever the number of lines:
+
+    - the order, then all its items and all their tickets with `bulk_create`
+      (one ticket per seat of each offer);
+    - the `Offer.sales` increments in a single `UPDATE ... CASE` through
+      `bulk_increment()`, which locks the offers in primary key order;
+    - the sales rollups through `SalesRollup.record()`.
+
+    Must be called inside a transaction. Returns the order and its tickets;
+    their QR codes are not generated.
+    """
+    lines = list(lines)
+    order = Order.objects.create(
+        user=user, total=sum(price * quantity for _, _, price, quantity in lines)
+    )
+    items = OrderItem.objects.bulk_create(
+        [
+            OrderItem(
+                order=order,
+                offer_id=offer.id,
+                name=name,
+                price=price,
+                quantity=quantity,
+            )
+            for offer, name, price, quantity in lines
+        ]
+    )
+
+    sales = Counter()
+    for item in items:
+        sales[item.offer_id] += item.quantity
+    bulk_increment(Offer, {pk: {"sales": quantity} for pk, quantity in sales.items()})
+    SalesRollup.record(
+        (item.offer_id, order.created_at, item.quantity, item.price * item.quantity)
+        for item in items
+    )
+
+    tickets = [
+        Ticket(order=order, offer_id=offer.id)
+        for offer, _, _, _ in lines
+        for _ in range(offer.seats)
+    ]
+    for ticket in tickets:
+        ticket.assign_final_key()
+    Ticket.objects.bulk_create(tickets)
+    return order, tickets
+
+
+def place_order(user, lines):
+    """
+    Create an order in a short, database-only transaction, then generate the
+    QR codes of its tickets once the transaction is committed.
+
+    - On PostgreSQL, `lock_timeout` bounds how long the transaction waits
+      for the offer and rollup row locks (`CHECKOUT_LOCK_TIMEOUT_MS`); on
+      timeout an `OperationalError` is raised and nothing is written.
+    - The time the row locks are held, from the start of the transaction
+      to its commit, is logged, as a warning above
+      `CHECKOUT_SLOW_TRANSACTION_MS`.
+    - The offers are locked and read again first, and `PricesChanged` is
+      raised, with nothing written, unless each is still on sale at the
+      price of its line: the lines are priced from a cached catalog, which
+      may be stale in other workers.
+    - The QR codes are rendered and uploaded by an `on_commit` callback: a
+      rolled back checkout uploads nothing, and a failed upload is logged
+      without undoing the order. Tickets left without a QR code are
+      completed by the `generate_missing_qr_codes` command.
+
+    Returns the order.
+    """
+    lines = list(lines)
+    started = time.perf_counter()
+    with transaction.atomic():
+        _set_lock_timeout()
+        _check_prices(lines)
+        order, tickets = create_order(user, lines)
+        transaction.on_commit(partial(_log_lock_hold_time, order, started))
+        transaction.on_commit(partial(Ticket.generate_qr_codes, tickets), robust=True)
+    return order
+
+
+def _check_prices(lines):
+    # Locked in primary key order, like `bulk_increment()` does next.
+    prices = dict(
+        Offer.objects.select_for_update()
+        .filter(pk__in={offer.id for offer, _, _, _ in lines}, is_active=True)
+        .order_by("pk")
+        .values_list("pk", "price")
+    )
+    if any(prices.get(offer.id) != price for offer, _, price, _ in lines):
+        raise PricesChanged
+
+
+def _set_lock_timeout():
+    connection = transaction.get_connection()
+    if connection.vendor == "postgresql":
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config('lock_timeout', %s, true)",
+                [f"{settings.CHECKOUT_LOCK_TIMEOUT_MS}ms"],
+            )
+
+
+def _log_lock_hold_time(order, started):
+    duration = (time.perf_counter() - started) * 1000
+    level = (
+        logging.WARNING
+        if duration > settings.CHECKOUT_SLOW_TRANSACTION_MS
+        else logging.INFO
+    )
+    logger.log(
+        level,
+        "Checkout transaction of order %s held its locks for %.1f ms.",
+        order.pk,
+        duration,
+        extra={"order_id": order.pk, "lock_hold_ms": duration},
+    )
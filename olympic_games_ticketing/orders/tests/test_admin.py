@@ -0,0 +1,166 @@
+from datetime import UTC, datetime
+
+from accounts.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from products.models import Offer
+
+from orders.models import Order, OrderItem, SalesRollup
+
+
+class TestSalesRollupAdmin(TestCase):
+    """Tests for the sales dashboard in the admin."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a superuser and hourly and daily rollups for one offer."""
+        cls.admin = User.objects.create_superuser(
+            email="admin@example.com",
+            first_name="Admin",
+            last_name="Istrator",
+            password="paris2024",
+        )
+        offer = Offer.objects.create(name="Solo", price=25)
+        day = datetime(2024, 7, 26, tzinfo=UTC)
+        SalesRollup.objects.bulk_create(
+            [
+                SalesRollup(
+                    offer=offer,
+                    period=SalesRollup.Period.DAY,
+                    period_start=day,
+                    quantity=3,
+                    revenue=75,
+                    order_count=2,
+                ),
+                SalesRollup(
+                    offer=offer,
+                    period=SalesRollup.Period.HOUR,
+                    period_start=day.replace(hour=10),
+                    quantity=1,
+                    revenue=25,
+                    order_count=1,
+                ),
+                SalesRollup(
+                    offer=offer,
+                    period=SalesRollup.Period.HOUR,
+                    period_start=day.replace(hour=18),
+                    quantity=2,
+                    revenue=50,
+                    order_count=1,
+                ),
+            ]
+        )
+        cls.url = reverse("admin:orders_salesrollup_changelist")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_totals_default_to_daily_rollups(self):
+        """Verify that totals without a period filter do not double count."""
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        totals = response.context["sales_totals"]
+        self.assertEqual(totals["quantity"], 3)
+        self.assertEqual(totals["order_count"], 2)
+
+    def test_totals_follow_the_period_filter(self):
+        """Verify that totals are computed over the filtered rollups."""
+        response = self.client.get(self.url, {"period__exact": "hour"})
+        totals = response.context["sales_totals"]
+        self.assertEqual(totals["quantity"], 3)
+        self.assertEqual(totals["revenue"], 75)
+        self.assertContains(response, "Chiffre d&#x27;affaires")
+
+    def test_dashboard_reads_only_the_rollup_table(self):
+        """Verify that the dashboard never queries orders or order items."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url)
+        tables = " ".join(query["sql"] for query in queries.captured_queries)
+        self.assertNotIn('"orders_order"', tables)
+        self.assertNotIn('"orders_orderitem"', tables)
+
+    def test_rollups_are_read_only(self):
+        """Verify that rollups cannot be added from the admin."""
+        response = self.client.get(reverse("admin:orders_salesrollup_add"))
+        self.assertEqual(response.status_code, 403)
+
+
+class TestOrderAdmin(TestCase):
+    """Tests for the Order and OrderItem admins."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a superuser and orders from two customers."""
+        cls.admin = User.objects.create_superuser(
+            email="admin@example.com",
+            first_name="Admin",
+            last_name="Istrator",
+            password="paris2024",
+        )
+        cls.offer = Offer.objects.create(name="Solo", price=25)
+        cls.orders = []
+        for name in ("john", "jane"):
+            customer = User.objects.create_user(
+                email=f"{name}@example.com",
+                first_name="John",
+                last_name="Doe",
+                password="paris2024",
+            )
+            order = Order.objects.create(user=customer, total=25)
+            OrderItem.objects.create(
+                order=order, offer=cls.offer, name="Solo", price=25, quantity=1
+            )
+            cls.orders.append(order)
+        cls.url = reverse("admin:orders_order_changelist")
+        cls.item_url = reverse("admin:orders_orderitem_changelist")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def changelist_ids(self, url, search):
+        response = self.client.get(url, {"q": search})
+        self.assertEqual(response.status_code, 200)
+        return [obj.pk for obj in response.context["cl"].result_list]
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        """Verify that rows are listed without a query per order or item."""
+        for url in (self.url, self.item_url):
+            self.client.get(url)
+            with CaptureQueriesContext(connection) as few:
+                self.client.get(url)
+            for _ in range(5):
+                order = Order.objects.create(user=self.admin, total=25)
+                OrderItem.objects.create(
+                    order=order, offer=self.offer, name="Solo", price=25, quantity=1
+                )
+            with CaptureQueriesContext(connection) as many:
+                self.client.get(url)
+            self.assertEqual(len(many.captured_queries), len(few.captured_queries))
+
+    def test_changelist_skips_the_full_result_count(self):
+        """Verify that the unfiltered count is not run a second time."""
+        response = self.client.get(self.url, {"q": "john@example.com"})
+        self.assertIsNone(response.context["cl"].full_result_count)
+
+    def test_search_is_exact(self):
+        """Verify the order key, email and order number searches."""
+        john, jane = self.orders
+        self.assertEqual(self.changelist_ids(self.url, str(jane.order_key)), [jane.pk])
+        self.assertEqual(self.changelist_ids(self.url, "john@example.com"), [john.pk])
+        self.assertEqual(self.changelist_ids(self.url, str(john.pk)), [john.pk])
+        self.assertEqual(self.changelist_ids(self.url, "john"), [])
+        self.assertEqual(
+            self.changelist_ids(self.item_url, str(john.order_key)),
+            [john.items.get().pk],
+        )
+
+    def test_foreign_keys_use_raw_id_widgets(self):
+        """Verify that change forms do not list every user or order."""
+        response = self.client.get(
+            reverse(
+                "admin:orders_orderitem_change", args=[self.orders[0].items.get().pk]
+            )
+        )
+        self.assertContains(response, "vForeignKeyRawIdAdminField", count=2)
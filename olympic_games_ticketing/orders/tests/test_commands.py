@@ -0,0 +1,194 @@
+import io
+from decimal import Decimal
+
+from accounts.models import User
+from django.core.management import call_command
+from django.test import TestCase, TransactionTestCase
+from products.models import Offer
+
+from orders.models import Order, OrderItem, SalesRollup
+
+
+class TestBenchmarkIndexesCommand(TestCase):
+    """Tests for the benchmark_indexes management command."""
+
+    def test_command_reports_every_query_and_leaves_no_data(self):
+        """Verify that the benchmark reports each query then rolls back its data."""
+        stdout = io.StringIO()
+        call_command(
+            "benchmark_indexes",
+            users=5,
+            orders=20,
+            offers=5,
+            repeat=1,
+            stdout=stdout,
+        )
+        output = stdout.getvalue()
+        for label in ("latest order of a user", "tickets of an order", "offers list"):
+            self.assertIn(label, output)
+        self.assertEqual(output.count("before:"), output.count("after:"))
+        self.assertFalse(Order.objects.exists())
+
+
+class TestBenchmarkUuidInsertsCommand(TestCase):
+    """Tests for the benchmark_uuid_inserts management command."""
+
+    def test_command_reports_both_generators_and_leaves_no_data(self):
+        """Verify that both UUID versions are measured then rolled back."""
+        stdout = io.StringIO()
+        call_command("benchmark_uuid_inserts", existing=20, inserts=10, stdout=stdout)
+        self.assertIn("uuid4 (random)", stdout.getvalue())
+        self.assertIn("uuid7 (time-ordered)", stdout.getvalue())
+        self.assertFalse(Order.objects.exists())
+
+
+class TestBackfillSalesRollupsCommand(TestCase):
+    """Tests for the backfill_sales_rollups management command."""
+
+    def test_command_rebuilds_rollups_from_confirmed_orders(self):
+        """Verify that rollups are rebuilt from confirmed orders only."""
+        user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        offer = Offer.objects.create(name="Solo", price=25)
+        for quantity, is_confirmed in ((2, True), (1, True), (4, False)):
+            order = Order.objects.create(user=user, total=0, is_confirmed=is_confirmed)
+            OrderItem.objects.create(
+                order=order, offer=offer, name="Solo", price=25, quantity=quantity
+            )
+        expected = list(
+            SalesRollup.objects.order_by("period").values_list(
+                "period", "period_start", "quantity", "revenue", "order_count"
+            )
+        )
+        SalesRollup.objects.update(quantity=0)
+
+        call_command("backfill_sales_rollups", stdout=io.StringIO())
+
+        rebuilt = list(
+            SalesRollup.objects.order_by("period").values_list(
+                "period", "period_start", "quantity", "revenue", "order_count"
+            )
+        )
+        self.assertEqual(rebuilt, expected)
+        self.assertEqual(rebuilt[0][2:], (3, Decimal("75.00"), 2))
+
+
+class TestExportOrdersCommand(TestCase):
+    """Tests for the export_orders management command."""
+
+    def test_command_streams_filtered_rows(self):
+        """Verify that the command writes the filtered rows in JSON Lines."""
+        user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        order = Order.objects.create(user=user, total=25)
+        stdout = io.StringIO()
+        call_command("export_orders", "orders", "--format", "jsonl", stdout=stdout)
+        self.assertIn(str(order.order_key), stdout.getvalue())
+
+        stdout = io.StringIO()
+        call_command(
+            "export_orders",
+            "orders",
+            "--start",
+            "2000-01-01",
+            "--end",
+            "2000-01-01",
+            stdout=stdout,
+        )
+        self.assertEqual(
+            stdout.getvalue().splitlines(),
+            ["id,order_key,user_email,created_at,total,is_confirmed"],
+        )
+
+
+class TestBenchmarkExportsCommand(TestCase):
+    """Tests for the benchmark_exports management command."""
+
+    def test_command_reports_both_exports_and_leaves_no_data(self):
+        """Verify that the benchmark reports both exports then rolls back."""
+        stdout = io.StringIO()
+        call_command("benchmark_exports", orders=20, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn("loaded: 40 rows", output)
+        self.assertIn("streamed: 40 rows", output)
+        self.assertFalse(Order.objects.exists())
+
+
+class TestBenchmarkTemplatesCommand(TestCase):
+    """Tests for the benchmark_templates management command."""
+
+    def test_command_reports_every_page_and_leaves_no_data(self):
+        """
+        Verify that each page is timed with both loaders, the hot pages with
+        Jinja2 too, then rolled back.
+        """
+        stdout = io.StringIO()
+        call_command(
+            "benchmark_templates", offers=3, tickets=4, repeat=1, stdout=stdout
+        )
+        output = stdout.getvalue()
+        for label in ("home", "offers list", "cart summary", "order confirmation"):
+            self.assertIn(f"{label}: plain", output)
+        self.assertEqual(output.count("cached"), 5)
+        self.assertEqual(output.count("jinja2"), 3)
+        self.assertFalse(Order.objects.exists())
+
+
+class TestBenchmarkCompressionCommand(TestCase):
+    """Tests for the benchmark_compression management command."""
+
+    def test_command_reports_every_body_and_leaves_no_data(self):
+        """Verify that the pages and the export are measured then rolled back."""
+        stdout = io.StringIO()
+        call_command(
+            "benchmark_compression",
+            offers=3,
+            tickets=2,
+            orders=5,
+            repeat=1,
+            stdout=stdout,
+        )
+        output = stdout.getvalue()
+        for label in ("offers list", "order confirmation", "tickets export"):
+            self.assertIn(f"{label}: ", output)
+        self.assertEqual(output.count("gzip"), 6)
+        self.assertFalse(Order.objects.exists())
+
+
+class TestBenchmarkConnectionsCommand(TransactionTestCase):
+    """Tests for the benchmark_connections management command."""
+
+    def test_command_reports_every_worker_count(self):
+        """Verify that the benchmark reports a line per number of workers."""
+        stdout = io.StringIO()
+        call_command("benchmark_connections", workers=[1, 2], requests=3, stdout=stdout)
+        output = stdout.getvalue()
+        self.assertIn("  1 workers:", output)
+        self.assertIn("  2 workers:", output)
+
+
+class TestBenchmarkSqliteCheckoutsCommand(TransactionTestCase):
+    """Tests for the benchmark_sqlite_checkouts management command."""
+
+    def test_command_reports_both_profiles_and_leaves_no_data(self):
+        """Verify that both profiles are measured on their own database."""
+        stdout = io.StringIO()
+        call_command(
+            "benchmark_sqlite_checkouts",
+            workers=2,
+            checkouts=2,
+            offers=2,
+            stdout=stdout,
+        )
+        output = stdout.getvalue()
+        self.assertIn(" default: ", output)
+        self.assertIn("   tuned: 4 checkouts", output)
+        self.assertFalse(User.objects.exists())
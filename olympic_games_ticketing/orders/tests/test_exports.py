@@ -0,0 +1,95 @@
+import datetime
+import json
+
+from accounts.models import User
+from django.test import TestCase
+from django.utils import timezone
+from products.models import Offer
+from tickets.models import Ticket
+
+from orders.exports import export_rows, iter_csv, iter_jsonl
+from orders.models import Order, OrderItem
+
+
+class TestExports(TestCase):
+    """Tests for the streamed order, item and ticket exports."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up two orders on different days for two offers."""
+        user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.solo = Offer.objects.create(name="Solo", slug="solo", price=25)
+        cls.duo = Offer.objects.create(name="Duo", slug="duo", price=45)
+        cls.orders = []
+        for day, offer in ((1, cls.solo), (2, cls.duo)):
+            order = Order.objects.create(user=user, total=offer.price)
+            Order.objects.filter(pk=order.pk).update(
+                created_at=timezone.make_aware(datetime.datetime(2024, 7, day, 12))
+            )
+            OrderItem.objects.create(
+                order=order, offer=offer, name=offer.name, price=offer.price, quantity=1
+            )
+            Ticket.objects.create(order=order, offer=offer)
+            cls.orders.append(order)
+
+    def ids(self, dataset, **filters):
+        header, rows = export_rows(dataset, **filters)
+        return [row[header.index("id")] for row in rows]
+
+    def test_rows_are_tuples_in_id_order(self):
+        """Verify that rows are values_list tuples matching the header."""
+        header, rows = export_rows("orders")
+        rows = list(rows)
+        self.assertEqual(header[:2], ["id", "order_key"])
+        self.assertEqual(
+            [row[:2] for row in rows],
+            [(order.id, order.order_key) for order in self.orders],
+        )
+
+    def test_rows_are_fetched_by_chunks_of_ids(self):
+        """Verify that each chunk is a query resuming after the previous one."""
+        header, rows = export_rows("tickets", chunk_size=1)
+        with self.assertNumQueries(3):
+            rows = list(rows)
+        self.assertEqual(
+            [row[header.index("id")] for row in rows],
+            list(Ticket.objects.order_by("id").values_list("id", flat=True)),
+        )
+
+    def test_date_filters_are_inclusive(self):
+        """Verify that start and end dates both include their whole day."""
+        day_one = datetime.date(2024, 7, 1)
+        self.assertEqual(
+            self.ids("orders", start=day_one, end=day_one), [self.orders[0].id]
+        )
+        self.assertEqual(
+            self.ids("items", start=datetime.date(2024, 7, 2)),
+            [self.orders[1].items.get().id],
+        )
+
+    def test_offer_filter(self):
+        """Verify that the offer filter applies to every dataset."""
+        self.assertEqual(self.ids("orders", offer_id=self.duo.id), [self.orders[1].id])
+        self.assertEqual(
+            self.ids("tickets", offer_id=self.solo.id),
+            [self.orders[0].tickets.get().id],
+        )
+
+    def test_iter_csv_yields_header_then_one_line_per_row(self):
+        """Verify the CSV encoding of an export."""
+        lines = list(iter_csv(["id", "name"], iter([(1, "Solo, 1 place")])))
+        self.assertEqual(lines, [b"id,name\r\n", b'1,"Solo, 1 place"\r\n'])
+
+    def test_iter_jsonl_yields_one_object_per_row(self):
+        """Verify the JSON Lines encoding of an export."""
+        header, rows = export_rows("items", offer_id=self.solo.id)
+        lines = list(iter_jsonl(header, rows))
+        self.assertEqual(len(lines), 1)
+        item = json.loads(lines[0])
+        self.assertEqual(item["price"], "25.00")
+        self.assertEqual(item["order_key"], str(self.orders[0].order_key))
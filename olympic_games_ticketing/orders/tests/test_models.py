@@ -1,11 +1,13 @@
-import uuid
+from datetime import UTC, datetime
+from decimal import Decimal
 
 from accounts.models import User
 from django.db import models
 from django.test import TestCase
+from olympic_games_ticketing.uuids import default_uuid
 from products.models import Offer
 
-from orders.models import Order, OrderItem
+from orders.models import Order, OrderItem, SalesRollup
 
 
 class TestOrderModel(TestCase):
@@ -111,10 +113,15 @@ class TestOrderModel(TestCase):
         """Test that a order key is generated for the order."""
         self.assertIsNotNone(self.order.order_key)
 
-    def test_order_key_field_default_attribute_is_uuid4(self):
-        """Test that order key default attribute is 'uuid.uuid4'."""
+    def test_order_key_field_is_unique(self):
+        """Test that the order key field is unique, and so indexed."""
+        order_key_field = Order._meta.get_field("order_key")
+        self.assertTrue(order_key_field.unique)
+
+    def test_order_key_field_default_attribute_is_default_uuid(self):
+        """Test that order key default attribute is 'default_uuid'."""
         order_key_field = self.order._meta.get_field("order_key")
-        self.assertIs(order_key_field.default, uuid.uuid4)
+        self.assertIs(order_key_field.default, default_uuid)
 
     def test_order_key_field_editable_attribute_is_false(self):
         """Test that order key is not editable."""
@@ -137,6 +144,12 @@ class TestOrderModel(TestCase):
         """Test that the Order model ordering option is correct."""
         self.assertEqual(Order._meta.ordering, ["-updated_at"])
 
+    def test_order_model_indexes_user_orders_by_creation_date(self):
+        """Test that orders are indexed by user, newest first, and by date."""
+        user_index, date_index = Order._meta.indexes
+        self.assertEqual(user_index.fields, ["user", "-created_at"])
+        self.assertEqual(date_index.fields, ["created_at"])
+
     def test_order_model_verbose_name(self):
         """Test that the Order model verbose_name is 'Commande'."""
         self.assertEqual(Order._meta.verbose_name, "Commande")
@@ -284,3 +297,116 @@ class TestOrderItemModel(TestCase):
         """
         self.offer.refresh_from_db()
         self.assertEqual(self.offer.sales, self.item.quantity)
+
+
+class TestSalesRollupModel(TestCase):
+    """Tests for the incremental maintenance of the SalesRollup model."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a user and two offers for all tests."""
+        cls.user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.solo = Offer.objects.create(name="Solo", slug="solo", price=25)
+        cls.duo = Offer.objects.create(name="Duo", slug="duo", price=45)
+
+    def place_order(self, *lines):
+        """Create a confirmed order with one item per (offer, quantity) line."""
+        order = Order.objects.create(user=self.user, total=0)
+        for offer, quantity in lines:
+            OrderItem.objects.create(
+                order=order,
+                offer=offer,
+                name=offer.name,
+                price=offer.price,
+                quantity=quantity,
+            )
+        return order
+
+    def rollup(self, offer, period):
+        return SalesRollup.objects.get(offer=offer, period=period)
+
+    def test_order_items_are_added_to_hourly_and_daily_rollups(self):
+        """Verify that each new item updates its offer's hourly and daily rows."""
+        self.place_order((self.solo, 2), (self.duo, 1))
+        self.place_order((self.solo, 1))
+
+        for period in SalesRollup.Period.values:
+            solo = self.rollup(self.solo, period)
+            self.assertEqual(solo.quantity, 3)
+            self.assertEqual(solo.revenue, Decimal("75.00"))
+            self.assertEqual(solo.order_count, 2)
+            duo = self.rollup(self.duo, period)
+            self.assertEqual(duo.quantity, 1)
+            self.assertEqual(duo.revenue, Decimal("45.00"))
+            self.assertEqual(duo.order_count, 1)
+
+    def test_period_start_truncates_to_hour_and_day(self):
+        """Verify that period starts are truncated to the hour and to the day."""
+        moment = datetime(2024, 7, 26, 19, 42, 7, tzinfo=UTC)
+        self.assertEqual(
+            SalesRollup.period_start_for(moment, SalesRollup.Period.HOUR),
+            datetime(2024, 7, 26, 19, tzinfo=UTC),
+        )
+        self.assertEqual(
+            SalesRollup.period_start_for(moment, SalesRollup.Period.DAY),
+            datetime(2024, 7, 26, tzinfo=UTC),
+        )
+
+    def test_cancelling_an_order_removes_its_sales(self):
+        """Verify that cancelling an order subtracts its items from the rollups."""
+        self.place_order((self.solo, 1))
+        order = self.place_order((self.solo, 2))
+
+        order.is_confirmed = False
+        order.save()
+
+        rollup = self.rollup(self.solo, SalesRollup.Period.DAY)
+        self.assertEqual(rollup.quantity, 1)
+        self.assertEqual(rollup.revenue, Decimal("25.00"))
+        self.assertEqual(rollup.order_count, 1)
+
+    def test_saving_a_cancelled_order_again_does_not_subtract_twice(self):
+        """Verify that only the confirmation status change updates the rollups."""
+        order = self.place_order((self.solo, 2))
+        order.is_confirmed = False
+        order.save()
+        order.save()
+        order.save(update_fields=["total"])
+
+        self.assertEqual(self.rollup(self.solo, SalesRollup.Period.DAY).quantity, 0)
+
+    def test_confirming_a_cancelled_order_again_restores_its_sales(self):
+        """Verify that re-confirming an order adds its items back."""
+        order = self.place_order((self.solo, 2))
+        order.is_confirmed = False
+        order.save()
+        order.is_confirmed = True
+        order.save()
+
+        rollup = self.rollup(self.solo, SalesRollup.Period.HOUR)
+        self.assertEqual(rollup.quantity, 2)
+        self.assertEqual(rollup.order_count, 1)
+
+    def test_items_of_a_cancelled_order_are_not_recorded(self):
+        """Verify that items added to an unconfirmed order are left out."""
+        order = Order.objects.create(user=self.user, total=0, is_confirmed=False)
+        OrderItem.objects.create(
+            order=order, offer=self.solo, name="Solo", price=25, quantity=1
+        )
+        self.assertFalse(SalesRollup.objects.exists())
+
+    def test_rollups_are_unique_per_offer_period_and_start(self):
+        """Verify the unique constraint the incremental updates rely on."""
+        constraint = SalesRollup._meta.constraints[0]
+        self.assertEqual(constraint.fields, ("offer", "period", "period_start"))
+
+    def test_str_method_returns_expected_format(self):
+        """Test that __str__ names the offer, the period and its start."""
+        self.place_order((self.solo, 1))
+        rollup = self.rollup(self.solo, SalesRollup.Period.DAY)
+        self.assertEqual(str(rollup), f"{self.solo} - Jour du {rollup.period_start}")
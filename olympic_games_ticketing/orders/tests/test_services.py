@@ -0,0 +1,135 @@
+from unittest import mock
+
+from accounts.models import User
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from products.models import Offer
+from tickets.models import Ticket
+
+from orders.models import OrderItem, SalesRollup
+from orders.services import PricesChanged, create_order, place_order
+
+
+class TestCreateOrder(TestCase):
+    """Tests for the order-building service."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a user and three offers."""
+        cls.user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.offers = [
+            Offer.objects.create(name=name, slug=name, seats=seats, price=price)
+            for name, seats, price in (
+                ("solo", 1, 25),
+                ("duo", 2, 45),
+                ("family", 4, 80),
+            )
+        ]
+
+    def lines(self, offers):
+        return [(offer, offer.name, offer.price, 1) for offer in offers]
+
+    def test_order_items_and_tickets_are_created(self):
+        """Verify the order total, its items and one ticket per seat."""
+        order, tickets = create_order(self.user, self.lines(self.offers[:2]))
+        self.assertEqual(order.total, 70)
+        self.assertEqual(
+            list(order.items.values_list("name", "quantity")),
+            [("solo", 1), ("duo", 1)],
+        )
+        self.assertEqual(len(tickets), 3)
+        self.assertEqual(order.tickets.count(), 3)
+        for ticket in tickets:
+            self.assertIsNotNone(ticket.pk)
+            self.assertTrue(ticket.final_key.endswith(str(ticket.unique_suffix)))
+
+    def test_sales_and_rollups_are_incremented(self):
+        """Verify that each offer's sales and rollups count the new items."""
+        create_order(self.user, self.lines(self.offers))
+        create_order(self.user, [(self.offers[0], "solo", 25, 2)])
+        sales = dict(Offer.objects.values_list("slug", "sales"))
+        self.assertEqual(sales, {"solo": 3, "duo": 1, "family": 1})
+        rollup = SalesRollup.objects.get(
+            offer=self.offers[0], period=SalesRollup.Period.DAY
+        )
+        self.assertEqual((rollup.quantity, rollup.order_count), (3, 2))
+
+    def test_query_count_does_not_depend_on_cart_lines(self):
+        """Verify that checkout SQL is constant in the number of cart lines."""
+        create_order(self.user, self.lines(self.offers[:1]))
+        with CaptureQueriesContext(connection) as one_line:
+            create_order(self.user, self.lines(self.offers[:1]))
+        with CaptureQueriesContext(connection) as three_lines:
+            create_order(self.user, self.lines(self.offers))
+        self.assertEqual(
+            len(three_lines.captured_queries), len(one_line.captured_queries)
+        )
+        self.assertEqual(OrderItem.objects.count(), 5)
+
+
+class TestPlaceOrder(TestCase):
+    """Tests for the checkout transaction and its after-commit stage."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a user and an offer."""
+        cls.user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.offer = Offer.objects.create(name="Duo", slug="duo", seats=2, price=45)
+
+    def test_qr_codes_are_generated_on_commit(self):
+        """Verify that no QR code is uploaded before the transaction commits."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            order = place_order(self.user, [(self.offer, "Duo", 45, 1)])
+            self.assertFalse(order.tickets.exclude(qr_code="").exists())
+        self.assertEqual(len(callbacks), 2)
+        self.assertFalse(order.tickets.filter(qr_code="").exists())
+
+    def test_lines_priced_from_a_stale_catalog_are_refused(self):
+        """Verify that nothing is written when an offer changed or left sale."""
+        Offer.objects.filter(pk=self.offer.pk).update(price=50)
+        with self.assertRaises(PricesChanged):
+            place_order(self.user, [(self.offer, "Duo", 45, 1)])
+        Offer.objects.filter(pk=self.offer.pk).update(price=45, is_active=False)
+        with self.assertRaises(PricesChanged):
+            place_order(self.user, [(self.offer, "Duo", 45, 1)])
+        self.assertFalse(Ticket.objects.exists())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.sales, 0)
+
+    def test_rolled_back_checkout_uploads_nothing(self):
+        """Verify that the after-commit stage is dropped on rollback."""
+        with mock.patch.object(Ticket, "generate_qr_codes") as generate:
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                place_order(self.user, [(self.offer, "Duo", 45, 1)])
+                raise RuntimeError
+            with self.captureOnCommitCallbacks(execute=True):
+                pass
+        generate.assert_not_called()
+
+    def test_lock_hold_time_is_logged(self):
+        """Verify that the lock hold time is logged, as a warning when slow."""
+        with (
+            self.assertLogs("orders.services", "INFO") as logs,
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            order = place_order(self.user, [(self.offer, "Duo", 45, 1)])
+        self.assertIn(f"order {order.pk} held its locks for", logs.output[0])
+        self.assertTrue(logs.output[0].startswith("INFO"))
+
+        with (
+            self.settings(CHECKOUT_SLOW_TRANSACTION_MS=-1),
+            self.assertLogs("orders.services", "WARNING"),
+            self.captureOnCommitCallbacks(execute=True),
+        ):
+            place_order(self.user, [(self.offer, "Duo", 45, 1)])
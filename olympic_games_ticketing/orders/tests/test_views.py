@@ -1,10 +1,18 @@
+from unittest import mock
+
 from accounts.models import User
+from django.contrib.messages.storage.fallback import FallbackStorage
+from django.contrib.sessions.backends.db import SessionStore
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
-from django.test import TestCase
+from django.db import OperationalError
+from django.test import RequestFactory, TestCase
 from django.urls import reverse
 from products.models import Offer
+from tickets.models import Ticket
 
 from orders.models import Order
+from orders.views import order_create_view
 
 
 class TestOrderCreateView(TestCase):
@@ -38,8 +46,10 @@ class TestOrderCreateView(TestCase):
 
     def setUp(self):
         """
-        Log in the test client before each test to simulate an authenticated session.
+        Log in the test client before each test to simulate an authenticated session,
+        starting from an empty price cache.
         """
+        cache.clear()
         self.client.login(email="johndoe@gmail.com", password="paris2024")
 
     def test_order_create_returns_http302_when_cart_is_empty(self):
@@ -104,13 +114,131 @@ class TestOrderCreateView(TestCase):
         Test that the order confirmation page contains the QR code image.
         """
         self.client.post(self.cart_add_url, {"offer_id": 1, "action": "post"}, xhr=True)
-        self.client.post(self.order_create_url)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.order_create_url)
         response = self.client.get(self.order_confirmation_url)
-        self.assertContains(
-            response,
-            "/media/tickets/ticket_1_1",
+        self.assertRegex(
+            response.content.decode(),
+            r"/media/tickets/[0-9a-f]{2}/[0-9a-f]{2}/ticket_1_1_",
         )
 
+    def test_order_create_uses_current_prices(self):
+        """
+        Test that the order is priced at checkout time, not at the price the
+        offer had when it was added to the cart.
+        """
+        self.client.post(self.cart_add_url, {"offer_id": 1, "action": "post"}, xhr=True)
+        offer = Offer.objects.get(pk=1)
+        offer.price = 30
+        offer.save()
+        self.client.post(self.order_create_url)
+        order = Order.objects.get()
+        self.assertEqual(order.total, 30)
+        self.assertEqual(order.items.get().price, 30)
+
+    def test_order_create_refuses_prices_of_a_stale_catalog(self):
+        """
+        Test that a cart priced from a catalog cached before another worker
+        changed the price is not ordered, and is priced again.
+        """
+        self.client.post(self.cart_add_url, {"offer_id": 1, "action": "post"}, xhr=True)
+        # Written without signals, like by another worker with its own cache.
+        Offer.objects.filter(pk=1).update(price=30)
+        response = self.client.post(self.order_create_url)
+        self.assertRedirects(response, self.cart_summary_url)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(self.client.session["session_key"], {"1": 1})
+
+        self.client.post(self.order_create_url)
+        self.assertEqual(Order.objects.get().total, 30)
+
+    def test_order_create_removes_offers_no_longer_on_sale(self):
+        """
+        Test that offers withdrawn from sale are removed from the cart and
+        that no order is created.
+        """
+        self.client.post(self.cart_add_url, {"offer_id": 1, "action": "post"}, xhr=True)
+        offer = Offer.objects.get(pk=1)
+        offer.is_active = False
+        offer.save()
+        response = self.client.post(self.order_create_url)
+        self.assertRedirects(response, self.cart_summary_url)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(self.client.session["session_key"], {})
+
+    def test_concurrent_checkout_is_rejected_before_any_query(self):
+        """
+        Test that a checkout submitted while another one of the same user is
+        running is refused without touching the database, keeping the cart.
+        """
+        self.client.post(self.cart_add_url, {"offer_id": 1, "action": "post"}, xhr=True)
+        user = User.objects.get()
+        cache.add(f"orders:checkout:{user.pk}", "other-request", 60)
+        with mock.patch("orders.views.place_order") as place_order:
+            response = self.client.post(self.order_create_url)
+        self.assertRedirects(response, self.cart_summary_url)
+        place_order.assert_not_called()
+        self.assertEqual(self.client.session["session_key"], {"1": 1})
+
+        cache.delete(f"orders:checkout:{user.pk}")
+        self.client.post(self.order_create_url)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_checkout_reads_the_cart_saved_by_a_finished_checkout(self):
+        """
+        Test that a request which loaded the cart before another checkout
+        emptied it does not order the same cart a second time.
+        """
+        self.client.post(self.cart_add_url, {"offer_id": 1, "action": "post"}, xhr=True)
+        stale_session = SessionStore(self.client.session.session_key)
+        self.assertEqual(stale_session["session_key"], {"1": 1})
+        self.client.post(self.order_create_url)
+
+        request = RequestFactory().post(self.order_create_url)
+        request.user = User.objects.get()
+        request.session = stale_session
+        request._messages = FallbackStorage(request)
+        response = order_create_view(request)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response.url, self.cart_summary_url)
+        self.assertEqual(Order.objects.count(), 1)
+
+    def test_qr_codes_are_uploaded_after_commit(self):
+        """
+        Test that QR codes are only uploaded once the checkout transaction is
+        committed, and that the confirmation page works before that.
+        """
+        self.client.post(self.cart_add_url, {"offer_id": 1, "action": "post"}, xhr=True)
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client.post(self.order_create_url)
+        ticket = Ticket.objects.get()
+        self.assertFalse(ticket.qr_code)
+        self.assertEqual(len(callbacks), 2)
+
+        response = self.client.get(self.order_confirmation_url)
+        self.assertContains(response, "QR code en cours de génération")
+
+        for callback in callbacks:
+            callback()
+        ticket.refresh_from_db()
+        self.assertTrue(ticket.qr_code)
+
+    def test_order_create_redirects_to_cart_on_lock_timeout(self):
+        """
+        Test that a checkout that times out waiting for a lock writes nothing
+        and keeps the cart.
+        """
+        self.client.post(self.cart_add_url, {"offer_id": 1, "action": "post"}, xhr=True)
+        with mock.patch(
+            "orders.services.create_order",
+            side_effect=OperationalError("canceling statement due to lock timeout"),
+        ):
+            response = self.client.post(self.order_create_url)
+        self.assertRedirects(response, self.cart_summary_url)
+        self.assertFalse(Order.objects.exists())
+        self.assertEqual(self.client.session["session_key"].keys(), {"1"})
+
 
 class TestOrderConfirmationView(TestCase):
     """Tests for verifying the behavior of the order confirmation view."""
@@ -183,3 +311,72 @@ class TestOrderConfirmationView(TestCase):
         self.client.post(self.order_create_url)
         response = self.client.get(self.order_confirmation_url)
         self.assertIn("Solo", response.context["tickets_by_offer"])
+
+
+class TestOrderExportView(TestCase):
+    """Tests for verifying the behavior of the staff export view."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a staff member, a customer with an order and the export URL."""
+        cls.staff = User.objects.create_user(
+            email="staff@example.com",
+            first_name="Staff",
+            last_name="Member",
+            password="paris2024",
+            is_staff=True,
+        )
+        cls.customer = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.order = Order.objects.create(user=cls.customer, total=25)
+        cls.url = reverse("orders:export", args=["orders"])
+
+    def test_export_is_streamed_as_csv_attachment(self):
+        """Test that staff members get a streamed CSV file by default."""
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(
+            response["Content-Disposition"], 'attachment; filename="export-orders.csv"'
+        )
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(lines), 2)
+        self.assertIn(str(self.order.order_key), lines[1])
+
+    def test_export_supports_jsonl(self):
+        """Test that format=jsonl streams one JSON object per line."""
+        self.client.force_login(self.staff)
+        response = self.client.get(self.url, {"format": "jsonl"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertIn(b'"user_email": "johndoe@gmail.com"', b"".join(response))
+
+    def test_export_requires_staff_member(self):
+        """Test that customers are redirected to the admin login page."""
+        self.client.force_login(self.customer)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_unknown_dataset_or_format_returns_404(self):
+        """Test that unknown datasets and formats are not found."""
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse("orders:export", args=["users"]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.get(self.url, {"format": "xlsx"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_invalid_filters_return_400(self):
+        """Test that invalid dates and unknown offers are rejected."""
+        self.client.force_login(self.staff)
+        for params in (
+            {"start": "hier"},
+            {"start": "2024-07-02", "end": "2024-07-01"},
+            {"offer": "999"},
+        ):
+            response = self.client.get(self.url, params)
+            self.assertEqual(response.status_code, 400)
@@ -7,4 +7,5 @@ app_name = "orders"
 urlpatterns = [
     path("create/", views.order_create_view, name="create"),
     path("confirmation/", views.order_confirmation_view, name="confirmation"),
+    path("export/<str:dataset>/", views.order_export_view, name="export"),
 ]
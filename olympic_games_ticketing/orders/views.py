@@ -1,12 +1,22 @@
+from importlib import import_module
+
 from cart.cart import Cart
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib.auth.decorators import login_required
-from django.db import transaction
+from django.db import OperationalError
+from django.http import Http404, HttpResponseBadRequest, StreamingHttpResponse
 from django.shortcuts import redirect, render
 from django.views.decorators.http import require_POST
+from olympic_games_ticketing.locks import LockUnavailable, cache_lock
+from products.catalog import delete_cached_offers
+from products.pricing import resolve_prices
 from tickets.models import Ticket
 
-from .models import Order, OrderItem
+from .exports import EXPORT_DATASETS, EXPORT_FORMATS, export_rows
+from .forms import ExportFilterForm
+from .services import PricesChanged, place_order
 
 
 @require_POST
@@ -16,16 +26,48 @@ def order_create_view(request):
     Create a new Order and generate QR-code tickets from the session cart.
 
     - Requires an authenticated user and only handles POST requests.
-    - Redirects to the cart page with an error message if the cart is empty.
-    - Within an atomic transaction:
-        - Creates the Order for the current user with the cart's total price.
-        - For each item in the cart:
-            - Creates the corresponding OrderItem and increments the offer's sales count.
-            - Generates one or more Tickets depending on the offer's seat count.
-            - Calls `ticket.generate_qr_code()` to render and save each QR code.
-        - Clears the cart and redirects to the order confirmation page.
+    - Holds a per-user cache lock for the whole checkout: a concurrent submit
+      by the same user (another tab, a double click) is redirected to the
+      cart with an error message before any query or QR rendering. Once the
+      lock is held, the session is read again from its store, so a cart
+      emptied by a checkout that just finished is not ordered twice.
+    - Redirects to the cart page with an error message if the cart is empty,
+      or after removing the offers that are no longer on sale.
+    - Prices and the order total are recomputed from the current prices
+      (`products.pricing`), not from the prices stored in the session.
+    - Calls `place_order()`, which creates the Order, its OrderItems and one
+      Ticket per seat and increments the offers' sales counts in a short
+      transaction, with a fixed number of queries whatever the size of the
+      cart, then renders and uploads every QR code once it is committed.
+    - Redirects to the cart page with an error message if the transaction
+      timed out waiting for a lock, or if an offer changed price or left
+      sale since the cart was priced from the cached catalog.
+    - Clears and saves the cart, then redirects to the order confirmation page.
     """
+    try:
+        with cache_lock(
+            f"orders:checkout:{request.user.pk}",
+            timeout=settings.CHECKOUT_USER_LOCK_TIMEOUT,
+        ):
+            _reload_session(request)
+            return _create_order(request)
+    except LockUnavailable:
+        messages.error(
+            request,
+            "Une commande est déjà en cours de traitement. Veuillez patienter.",
+        )
+        return redirect("cart")
+
+
+def _reload_session(request):
+    """Replace the session loaded with the request by its stored state."""
+    session_key = request.session.session_key
+    if session_key is not None:
+        engine = import_module(settings.SESSION_ENGINE)
+        request.session = engine.SessionStore(session_key)
+
 
+def _create_order(request):
     cart = Cart(request)
     if len(cart) == 0:
         messages.error(
@@ -34,23 +76,45 @@ def order_create_view(request):
         )
         return redirect("cart")
 
-    with transaction.atomic():
-        order = Order.objects.create(user=request.user, total=cart.get_total_price())
-        for item in cart:
-            order_item = OrderItem.objects.create(
-                order=order,
-                offer=item["offer"],
-                name=item["name"],
-                price=item["price"],
-                quantity=item["quantity"],
-            )
-            for _ in range(order_item.offer.seats):
-                ticket = Ticket.objects.create(order=order, offer=order_item.offer)
-                ticket.generate_qr_code()
+    quantities = cart.get_quantities()
+    unavailable = quantities.keys() - resolve_prices(quantities).keys()
+    if unavailable:
+        for offer_id in unavailable:
+            cart.remove_offer(offer_id)
+        messages.error(
+            request,
+            "Certaines offres de votre panier ne sont plus en vente et ont été "
+            "retirées. Veuillez vérifier votre panier avant de commander.",
+        )
+        return redirect("cart")
 
-        cart.clear()
+    try:
+        place_order(
+            request.user,
+            (
+                (item["offer"], item["name"], item["price"], item["quantity"])
+                for item in cart
+            ),
+        )
+    except PricesChanged:
+        # The cart was priced from a stale copy of the catalog.
+        delete_cached_offers()
+        messages.error(
+            request,
+            "Le prix ou la disponibilité de certaines offres de votre panier a "
+            "changé. Veuillez vérifier votre panier avant de commander.",
+        )
+        return redirect("cart")
+    except OperationalError:
+        messages.error(
+            request,
+            "Votre commande n'a pas pu être enregistrée. Veuillez réessayer.",
+        )
+        return redirect("cart")
 
-        return redirect("orders:confirmation")
+    cart.clear()
+    request.session.save()
+    return redirect("orders:confirmation")
 
 
 @login_required
@@ -88,3 +152,40 @@ def order_confirmation_view(request):
             "tickets_by_offer": tickets_by_offer,
         },
     )
+
+
+@staff_member_required
+def order_export_view(request, dataset):
+    """
+    Stream a full export of orders, order items or tickets to staff members.
+
+    - `dataset` is "orders", "items" or "tickets"; the `format` query
+      parameter selects CSV ("csv", default) or JSON Lines ("jsonl").
+    - Optional `start` and `end` dates (YYYY-MM-DD, inclusive) and `offer`
+      (offer id) query parameters filter the rows; invalid filters get a 400.
+    - Rows are read from the database in chunks while the response is
+      streamed, so memory usage stays flat whatever the size of the export.
+    """
+    file_format = request.GET.get("format", "csv")
+    if dataset not in EXPORT_DATASETS or file_format not in EXPORT_FORMATS:
+        raise Http404("Export inconnu.")
+    iter_export, content_type = EXPORT_FORMATS[file_format]
+
+    form = ExportFilterForm(request.GET)
+    if not form.is_valid():
+        return HttpResponseBadRequest(form.errors.as_text())
+    offer = form.cleaned_data["offer"]
+
+    header, rows = export_rows(
+        dataset,
+        start=form.cleaned_data["start"],
+        end=form.cleaned_data["end"],
+        offer_id=offer.pk if offer else None,
+    )
+    response = StreamingHttpResponse(
+        iter_export(header, rows), content_type=content_type
+    )
+    response["Content-Disposition"] = (
+        f'attachment; filename="export-{dataset}.{file_format}"'
+    )
+    return response
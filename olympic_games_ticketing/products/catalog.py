@@ -0,0 +1,108 @@
+from dataclasses import dataclass
+
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, transaction
+from django.db.models import Count, Max
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from olympic_games_ticketing.page_cache import invalidate_pages
+from olympic_games_ticketing.prerender import refresh_prerendered_pages
+
+from products.models import Offer
+from products.money import from_cents, to_cents
+
+CATALOG_CACHE_KEY = "products:catalog"
+OFFERS_STATE_CACHE_KEY = "products:offers-state"
+# Without Redis, each worker has its own cache, only invalidated by its own
+# writes: the other workers show an offer change after at most this many
+# seconds. The checkout checks the prices against the database anyway (see
+# `orders.services.place_order`).
+CATALOG_TIMEOUT = 60
+
+
+@dataclass(frozen=True)
+class CatalogOffer:
+    """Display and pricing data of an offer on sale, as cached in the catalog."""
+
+    id: int
+    name: str
+    slug: str
+    seats: int
+    price_cents: int
+    thumbnail_url: str
+
+    @property
+    def price(self):
+        return from_cents(self.price_cents)
+
+
+def get_catalog():
+    """
+    Return every offer on sale as a `CatalogOffer`, keyed by offer id.
+
+    The catalog is shared by all requests through the cache: it is rebuilt
+    from a single query on the primary database when missing, and
+    invalidated whenever an offer is saved or deleted.
+    """
+    catalog = cache.get(CATALOG_CACHE_KEY)
+    if catalog is None:
+        catalog = {
+            offer.id: CatalogOffer(
+                id=offer.id,
+                name=offer.name,
+                slug=offer.slug,
+                seats=offer.seats,
+                price_cents=to_cents(offer.price),
+                thumbnail_url=offer.get_thumbnail_url(),
+            )
+            for offer in Offer.objects.using(DEFAULT_DB_ALIAS)
+            .filter(is_active=True)
+            .only("id", "name", "slug", "seats", "price", "thumbnail")
+        }
+        cache.set(CATALOG_CACHE_KEY, catalog, CATALOG_TIMEOUT)
+    return catalog
+
+
+def get_offers_state():
+    """
+    Return the latest `updated_at` of all offers and the number of offers.
+
+    Together they change whenever an offer is created, edited, withdrawn from
+    sale or deleted, so they identify the version of the offer pages. Cached
+    and invalidated with the catalog, and read from the primary database.
+    """
+    state = cache.get(OFFERS_STATE_CACHE_KEY)
+    if state is None:
+        aggregate = Offer.objects.using(DEFAULT_DB_ALIAS).aggregate(
+            last_modified=Max("updated_at"), count=Count("id")
+        )
+        state = (aggregate["last_modified"], aggregate["count"])
+        cache.set(OFFERS_STATE_CACHE_KEY, state, CATALOG_TIMEOUT)
+    return state
+
+
+def delete_cached_offers():
+    """Delete the cached catalog and offers state, and mark the pages stale."""
+    cache.delete_many([CATALOG_CACHE_KEY, OFFERS_STATE_CACHE_KEY])
+    invalidate_pages()
+
+
+def invalidate_offers():
+    """
+    Invalidate the cached catalog, offers state and pages, and rewrite the
+    prerendered pages after commit.
+
+    Sent on every save and delete of an offer; the bulk writes of the offers
+    (`update()`, `bulk_update()`), which send no signal, must call it.
+    """
+    # Again after commit, in case a concurrent request cached the old offers
+    # before this transaction was visible.
+    delete_cached_offers()
+    transaction.on_commit(delete_cached_offers)
+    transaction.on_commit(refresh_prerendered_pages, robust=True)
+
+
+@receiver(post_save, sender=Offer, dispatch_uid="invalidate_catalog_on_save")
+@receiver(post_delete, sender=Offer, dispatch_uid="invalidate_catalog_on_delete")
+def invalidate_catalog(**kwargs):
+    invalidate_offers()
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from olympic_games_ticketing.prerender import prerender_pages
+
+
+class Command(BaseCommand):
+    help = "Prerender the home and offers list pages as static HTML files."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            help="Directory to write the pages to (default: PRERENDER_ROOT).",
+        )
+
+    def handle(self, *args, **options):
+        root = options["output"] or settings.PRERENDER_ROOT
+        if not root:
+            raise CommandError("Set PRERENDER_ROOT or pass --output.")
+
+        paths = prerender_pages(root)
+        for path in paths:
+            self.stdout.write(str(path))
+
+        self.stdout.write(self.style.SUCCESS(f"{len(paths)} page(s) prerendered."))
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from products.models import Offer
+
+
+class Command(BaseCommand):
+    help = "Regenerate the WebP/AVIF renditions of offer thumbnails."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "slugs",
+            nargs="*",
+            help="Slugs of the offers to process (default: every offer).",
+        )
+
+    def handle(self, *args, **options):
+        offers = Offer.objects.exclude(thumbnail="").exclude(thumbnail__isnull=True)
+        if options["slugs"]:
+            offers = offers.filter(slug__in=options["slugs"])
+
+        count = 0
+        for offer in offers.order_by("pk").iterator():
+            offer.refresh_thumbnail_renditions()
+            formats = ", ".join(offer.thumbnail_renditions) or "no renditions"
+            self.stdout.write(f"{offer.slug}: {formats}")
+            count += 1
+
+        self.stdout.write(self.style.SUCCESS(f"{count} offer(s) processed."))
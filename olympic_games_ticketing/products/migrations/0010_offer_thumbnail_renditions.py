@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0009_alter_offer_sales'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='thumbnail_renditions',
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="Déclinaisons de l'image"),
+        ),
+    ]
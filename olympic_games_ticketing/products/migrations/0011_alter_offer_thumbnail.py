@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:04
+
+import olympic_games_ticketing.storage_backends
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0010_offer_thumbnail_renditions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='offer',
+            name='thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to=olympic_games_ticketing.storage_backends.HashedUploadTo('images'), verbose_name='Image'),
+        ),
+    ]
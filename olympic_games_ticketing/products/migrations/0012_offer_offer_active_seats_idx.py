@@ -0,0 +1,17 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('products', '0011_alter_offer_thumbnail'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['seats'], name='offer_active_seats_idx'),
+        ),
+    ]
@@ -2,6 +2,10 @@ from django.core.validators import MinValueValidator
 from django.db import models
 from django.templatetags.static import static
 from django.urls import reverse
+from django.utils import timezone
+from olympic_games_ticketing.storage_backends import HashedUploadTo
+
+from products.renditions import RENDITION_FORMATS, generate_renditions
 
 
 class Offer(models.Model):
@@ -13,6 +17,8 @@ class Offer(models.Model):
     - price: cost of the offer as a DecimalField.
     - description: detailed textual description.
     - thumbnail: image illustrating the offer.
+    - thumbnail_renditions: URLs of the resized WebP/AVIF variants of the
+      thumbnail, by format and width.
 
     It also includes a slug, the number of seats associated with the offer,
     creation/update timestamps, an active flag, and a sales counter.
@@ -29,11 +35,17 @@ class Offer(models.Model):
         help_text="La valeur se remplit automatiquement en renseignant le nom de l'offre.",
     )
     thumbnail = models.ImageField(
-        upload_to="images/",
+        upload_to=HashedUploadTo("images"),
         verbose_name="Image",
         blank=True,
         null=True,
     )
+    thumbnail_renditions = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name="Déclinaisons de l'image",
+    )
     description = models.TextField(help_text="Ajoutez une description de l'offre.")
     seats = models.PositiveSmallIntegerField(
         default=1,
@@ -64,6 +76,47 @@ class Offer(models.Model):
     )
     sales = models.PositiveIntegerField(default=0, verbose_name="Nombre de ventes")
 
+    class Meta:
+        """
+        Meta options for Offer model:
+
+        - indexes: partial index on the offers on sale, sorted by seat count
+          (offers list).
+        """
+
+        indexes = [
+            models.Index(
+                fields=["seats"],
+                condition=models.Q(is_active=True),
+                name="offer_active_seats_idx",
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Override save to regenerate the thumbnail renditions whenever a new
+        thumbnail is uploaded, and to drop them when the thumbnail is removed.
+        """
+        thumbnail_uploaded = bool(self.thumbnail) and not self.thumbnail._committed
+        if not self.thumbnail:
+            self.thumbnail_renditions = {}
+        super().save(*args, **kwargs)
+        if thumbnail_uploaded:
+            self.refresh_thumbnail_renditions()
+
+    def refresh_thumbnail_renditions(self):
+        """Generate the thumbnail renditions and store their URLs."""
+        # Imported here: the catalog is built from this model.
+        from products.catalog import invalidate_offers
+
+        self.thumbnail_renditions = generate_renditions(self.thumbnail)
+        self.updated_at = timezone.now()
+        Offer.objects.filter(pk=self.pk).update(
+            thumbnail_renditions=self.thumbnail_renditions,
+            updated_at=self.updated_at,
+        )
+        invalidate_offers()
+
     def __str__(self):
         """
         Return the offer's name for display purposes, e.g., in the admin interface.
@@ -83,3 +136,16 @@ class Offer(models.Model):
             return self.thumbnail.url
         else:
             return static("images/fallback.webp")
+
+    def get_thumbnail_sources(self):
+        """
+        Return the `<source>` entries of the thumbnail renditions, as dicts
+        with the MIME `type` and the `srcset` of each available format.
+        """
+        sources = []
+        for extension, options in RENDITION_FORMATS.items():
+            urls = self.thumbnail_renditions.get(extension)
+            if urls:
+                srcset = ", ".join(f"{url} {width}w" for width, url in urls.items())
+                sources.append({"type": options["mime_type"], "srcset": srcset})
+        return sources
@@ -0,0 +1,11 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+
+def to_cents(amount):
+    """Convert a euro amount (Decimal, str or int) to integer cents."""
+    return int((Decimal(amount) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents):
+    """Convert integer cents to a Decimal euro amount with two decimal places."""
+    return Decimal(cents).scaleb(-2)
@@ -0,0 +1,38 @@
+from products.catalog import get_catalog
+
+
+def get_price_table():
+    """
+    Return the current price, in cents, of every offer on sale, keyed by id.
+
+    Prices come from the cached catalog, so resolving them costs a single
+    cache lookup and no query while the catalog is cached.
+    """
+    return {offer_id: offer.price_cents for offer_id, offer in get_catalog().items()}
+
+
+def resolve_prices(offer_ids):
+    """
+    Return the current price in cents of the given offers, keyed by id.
+
+    Offers that are no longer on sale are left out.
+    """
+    table = get_price_table()
+    return {
+        int(offer_id): table[int(offer_id)]
+        for offer_id in offer_ids
+        if int(offer_id) in table
+    }
+
+
+def total_cents(quantities):
+    """
+    Return the total price in cents of `{offer_id: quantity}` at current
+    prices, ignoring offers that are no longer on sale.
+    """
+    prices = resolve_prices(quantities)
+    return sum(
+        prices[int(offer_id)] * quantity
+        for offer_id, quantity in quantities.items()
+        if int(offer_id) in prices
+    )
@@ -0,0 +1,71 @@
+import io
+import os
+
+from django.core.files.base import ContentFile
+from olympic_games_ticketing.storage_backends import save_many
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+# Offer cards are 250px wide: 1x, 2x and 3x pixel densities.
+RENDITION_WIDTHS = (250, 500, 750)
+
+# Ordered by preference: browsers pick the first <source> type they support.
+RENDITION_FORMATS = {
+    "avif": {"format": "AVIF", "mime_type": "image/avif", "quality": 55},
+    "webp": {"format": "WEBP", "mime_type": "image/webp", "quality": 80},
+}
+
+
+def _encode(image, width, options):
+    """Return the bytes of `image` resized to `width` in the given format."""
+    height = round(image.height * width / image.width)
+    resized = image.resize((width, height), Image.Resampling.LANCZOS)
+    buffer = io.BytesIO()
+    resized.save(buffer, format=options["format"], quality=options["quality"])
+    return ContentFile(buffer.getvalue())
+
+
+def generate_renditions(thumbnail):
+    """
+    Generate the fixed-width WebP and AVIF variants of an offer thumbnail.
+
+    Variants are stored next to the original image and never upscaled:
+    widths larger than the original are skipped, and an image narrower than
+    every width gets a single variant at its own width.
+
+    Returns a dict mapping each format to `{width: url}`, or an empty dict
+    when there is no thumbnail or it is not a readable image.
+    """
+    if not thumbnail:
+        return {}
+
+    try:
+        with thumbnail.open("rb") as file:
+            image = ImageOps.exif_transpose(Image.open(file))
+            image.load()
+    except (FileNotFoundError, UnidentifiedImageError):
+        return {}
+    if image.mode not in ("RGB", "RGBA"):
+        image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+    widths = [width for width in RENDITION_WIDTHS if width <= image.width]
+    widths = widths or [image.width]
+
+    root = os.path.splitext(thumbnail.name)[0]
+    variants = [
+        (extension, width) for extension in RENDITION_FORMATS for width in widths
+    ]
+    names = save_many(
+        thumbnail.storage,
+        (
+            (
+                f"{root}-{width}w.{extension}",
+                _encode(image, width, RENDITION_FORMATS[extension]),
+            )
+            for extension, width in variants
+        ),
+    )
+
+    renditions = {}
+    for (extension, width), name in zip(variants, names):
+        renditions.setdefault(extension, {})[str(width)] = thumbnail.storage.url(name)
+    return renditions
@@ -0,0 +1,58 @@
+from django.core.cache import cache
+from django.test import TestCase
+
+from products.catalog import CatalogOffer, get_catalog, get_offers_state
+from products.models import Offer
+
+
+class TestCatalog(TestCase):
+    """Tests for the cached catalog of offers on sale."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up an offer on sale and one withdrawn from sale."""
+        cls.solo = Offer.objects.create(name="Solo", slug="solo", price="25.50")
+        cls.withdrawn = Offer.objects.create(
+            name="Famille", slug="famille", price=80, is_active=False
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_catalog_lists_offers_on_sale(self):
+        """Verify the catalog entries and their price in cents."""
+        self.assertEqual(
+            get_catalog(),
+            {
+                self.solo.pk: CatalogOffer(
+                    id=self.solo.pk,
+                    name="Solo",
+                    slug="solo",
+                    seats=1,
+                    price_cents=2550,
+                    thumbnail_url=self.solo.get_thumbnail_url(),
+                )
+            },
+        )
+        self.assertEqual(str(get_catalog()[self.solo.pk].price), "25.50")
+
+    def test_catalog_is_cached_and_invalidated_on_save(self):
+        """Verify the single query, then the invalidation on save."""
+        with self.assertNumQueries(1):
+            get_catalog()
+        with self.assertNumQueries(0):
+            get_catalog()
+        self.withdrawn.is_active = True
+        self.withdrawn.save()
+        self.assertIn(self.withdrawn.pk, get_catalog())
+
+    def test_offers_state_is_cached_and_invalidated_on_delete(self):
+        """Verify the offers state covers withdrawn offers and tracks deletions."""
+        with self.assertNumQueries(1):
+            last_modified, count = get_offers_state()
+        self.assertEqual(last_modified, self.withdrawn.updated_at)
+        self.assertEqual(count, 2)
+        with self.assertNumQueries(0):
+            get_offers_state()
+        self.withdrawn.delete()
+        self.assertEqual(get_offers_state(), (self.solo.updated_at, 1))
@@ -0,0 +1,28 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import CommandError, call_command
+from django.test import TestCase, override_settings
+
+from products.models import Offer
+
+
+class TestPrerenderCatalogCommand(TestCase):
+    """Tests for the prerender_catalog management command."""
+
+    def test_command_writes_the_pages(self):
+        """Verify the pages are written to the given directory."""
+        Offer.objects.create(name="Solo", slug="solo", price=25)
+        with tempfile.TemporaryDirectory() as root:
+            out = StringIO()
+            call_command("prerender_catalog", output=root, stdout=out)
+            self.assertTrue(Path(root, "index.html").exists())
+            self.assertIn("Solo", Path(root, "products/offers/index.html").read_text())
+        self.assertIn("2 page(s) prerendered.", out.getvalue())
+
+    @override_settings(PRERENDER_ROOT=None)
+    def test_command_requires_a_directory(self):
+        """Verify the command fails without an output directory."""
+        with self.assertRaises(CommandError):
+            call_command("prerender_catalog")
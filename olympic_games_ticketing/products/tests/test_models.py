@@ -1,10 +1,19 @@
+import io
+import tempfile
+
+from django.core.cache import cache
 from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
 from django.db import IntegrityError
+from django.db.models import Q
 from django.templatetags.static import static
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from olympic_games_ticketing.prerender import prerender_pages
+from PIL import Image
 
 from products.models import Offer
+from products.renditions import RENDITION_WIDTHS
 
 
 class TestOfferModel(TestCase):
@@ -263,3 +272,115 @@ class TestOfferModel(TestCase):
     def test_get_thumbnail_url_method_returns_fallback_image(self):
         """Ensures that if no image is defined, the fallback image must be displayed."""
         self.assertEqual(self.offer.get_thumbnail_url(), static("images/fallback.webp"))
+
+    def test_offer_model_has_partial_index_on_active_offers(self):
+        """Test that only active offers are indexed, by seat count."""
+        [index] = Offer._meta.indexes
+        self.assertEqual(index.fields, ["seats"])
+        self.assertEqual(index.condition, Q(is_active=True))
+
+
+def make_image(width, height, name="photo.png"):
+    """Return an uploaded PNG image of the given size."""
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), "steelblue").save(buffer, format="PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class TestOfferThumbnailRenditions(TestCase):
+    """Tests for verifying the generation of the offer thumbnail renditions."""
+
+    def test_renditions_are_generated_when_thumbnail_is_uploaded(self):
+        """Verify that saving a new thumbnail generates every format and width."""
+        offer = Offer.objects.create(
+            name="Duo", slug="duo", price=50, thumbnail=make_image(800, 600)
+        )
+        offer.refresh_from_db()
+        self.assertEqual(list(offer.thumbnail_renditions), ["avif", "webp"])
+        self.assertEqual(
+            list(offer.thumbnail_renditions["webp"]),
+            [str(width) for width in RENDITION_WIDTHS],
+        )
+
+    def test_renditions_have_expected_format_and_width(self):
+        """Verify that a stored rendition is a WebP image of the requested width."""
+        offer = Offer.objects.create(
+            name="Duo", slug="duo", price=50, thumbnail=make_image(800, 600)
+        )
+        root = offer.thumbnail.name.rsplit(".", 1)[0]
+        with offer.thumbnail.storage.open(f"{root}-500w.webp") as file:
+            image = Image.open(file)
+            self.assertEqual((image.format, image.size), ("WEBP", (500, 375)))
+
+    def test_renditions_are_not_upscaled(self):
+        """Verify that a small thumbnail gets a single rendition at its own width."""
+        offer = Offer.objects.create(
+            name="Duo", slug="duo", price=50, thumbnail=make_image(100, 100)
+        )
+        self.assertEqual(list(offer.thumbnail_renditions["avif"]), ["100"])
+
+    def test_renditions_are_empty_for_unreadable_image(self):
+        """Verify that an invalid image file does not produce renditions."""
+        fake_image = SimpleUploadedFile(
+            "test.jpg", b"file_content", content_type="image/jpeg"
+        )
+        offer = Offer.objects.create(
+            name="Duo", slug="duo", price=50, thumbnail=fake_image
+        )
+        self.assertEqual(offer.thumbnail_renditions, {})
+
+    def test_renditions_are_cleared_when_thumbnail_is_removed(self):
+        """Verify that removing the thumbnail drops its renditions."""
+        offer = Offer.objects.create(
+            name="Duo", slug="duo", price=50, thumbnail=make_image(300, 300)
+        )
+        offer.thumbnail = None
+        offer.save()
+        offer.refresh_from_db()
+        self.assertEqual(offer.thumbnail_renditions, {})
+
+    def test_get_thumbnail_sources_returns_srcset_by_type(self):
+        """Verify that get_thumbnail_sources builds one srcset per format."""
+        offer = Offer(
+            thumbnail_renditions={
+                "avif": {"250": "/a-250w.avif", "500": "/a-500w.avif"},
+                "webp": {"250": "/a-250w.webp"},
+            }
+        )
+        self.assertEqual(
+            offer.get_thumbnail_sources(),
+            [
+                {
+                    "type": "image/avif",
+                    "srcset": "/a-250w.avif 250w, /a-500w.avif 500w",
+                },
+                {"type": "image/webp", "srcset": "/a-250w.webp 250w"},
+            ],
+        )
+
+    def test_regenerate_command_refreshes_renditions(self):
+        """Verify that the command regenerates the renditions of every offer."""
+        offer = Offer.objects.create(
+            name="Duo", slug="duo", price=50, thumbnail=make_image(300, 300)
+        )
+        Offer.objects.filter(pk=offer.pk).update(thumbnail_renditions={})
+        call_command("regenerate_thumbnail_renditions", stdout=io.StringIO())
+        offer.refresh_from_db()
+        self.assertIn("webp", offer.thumbnail_renditions)
+
+    def test_regenerated_renditions_are_prerendered(self):
+        """Verify that the prerendered offers list lists the regenerated renditions."""
+        cache.clear()
+        offer = Offer.objects.create(
+            name="Duo", slug="duo", price=50, thumbnail=make_image(300, 300)
+        )
+        Offer.objects.filter(pk=offer.pk).update(thumbnail_renditions={})
+        with (
+            tempfile.TemporaryDirectory() as root,
+            override_settings(PRERENDER_ROOT=root),
+        ):
+            page = prerender_pages()[1]
+            self.assertNotIn("image/webp", page.read_text())
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command("regenerate_thumbnail_renditions", stdout=io.StringIO())
+            self.assertIn("image/webp", page.read_text())
@@ -0,0 +1,57 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from products.models import Offer
+from products.money import from_cents, to_cents
+from products.pricing import get_price_table, resolve_prices, total_cents
+
+
+class TestPricing(TestCase):
+    """Tests for the cached price table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up two offers on sale and one withdrawn from sale."""
+        cls.solo = Offer.objects.create(name="Solo", slug="solo", price="25.50")
+        cls.duo = Offer.objects.create(name="Duo", slug="duo", price=45)
+        cls.withdrawn = Offer.objects.create(
+            name="Famille", slug="famille", price=80, is_active=False
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_cents_conversions(self):
+        """Verify the conversions between euros and integer cents."""
+        self.assertEqual(to_cents(Decimal("25.50")), 2550)
+        self.assertEqual(to_cents("0.01"), 1)
+        self.assertEqual(from_cents(2550), Decimal("25.50"))
+        self.assertEqual(str(from_cents(4500)), "45.00")
+
+    def test_price_table_is_cached(self):
+        """Verify that the table is built with one query, then cached."""
+        with self.assertNumQueries(1):
+            table = get_price_table()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_price_table(), table)
+        self.assertEqual(table, {self.solo.pk: 2550, self.duo.pk: 4500})
+
+    def test_saving_an_offer_invalidates_the_table(self):
+        """Verify that price changes and withdrawals are seen at once."""
+        get_price_table()
+        self.duo.price = Decimal("49.90")
+        self.duo.save()
+        self.solo.delete()
+        self.assertEqual(get_price_table(), {self.duo.pk: 4990})
+
+    def test_resolve_prices_leaves_out_offers_not_on_sale(self):
+        """Verify that withdrawn and unknown offers have no price."""
+        prices = resolve_prices([str(self.solo.pk), self.withdrawn.pk, 999])
+        self.assertEqual(prices, {self.solo.pk: 2550})
+
+    def test_total_cents(self):
+        """Verify the total in cents of quantities at current prices."""
+        quantities = {self.solo.pk: 2, str(self.duo.pk): 1, self.withdrawn.pk: 1}
+        self.assertEqual(total_cents(quantities), 2 * 2550 + 4500)
@@ -1,5 +1,8 @@
 from accounts.models import User
+from django.core.cache import cache
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from products.models import Offer
@@ -23,6 +26,9 @@ class TestOffersListPageView(TestCase):
         )
         cls.url = reverse("offers")
 
+    def setUp(self):
+        cache.clear()
+
     def test_offers_list_page_view_returns_status_200(self):
         """
         Test that GET request to offers list page view returns HTTP 200 status code.
@@ -59,6 +65,17 @@ class TestOffersListPageView(TestCase):
         response = self.client.get(self.url)
         self.assertContains(response, "Solo")
 
+    def test_offers_list_get_contains_thumbnail_srcset(self):
+        """Test that the offer cards expose the thumbnail renditions as a srcset."""
+        Offer.objects.filter(pk=self.offer.pk).update(
+            thumbnail_renditions={"webp": {"250": "/media/images/solo-250w.webp"}}
+        )
+        response = self.client.get(self.url)
+        self.assertContains(
+            response,
+            '<source type="image/webp" srcset="/media/images/solo-250w.webp 250w"',
+        )
+
 
 class TestOfferDetailPageView(TestCase):
     """Tests for verifying the behavior of the offer detail page view."""
@@ -127,3 +144,153 @@ class TestOfferDetailPageView(TestCase):
         """Test that the offer detail page contains the offer's description."""
         response = self.client.get(self.url)
         self.assertContains(response, "A single seat offer.")
+
+
+class TestOfferPagesConditionalGet(TestCase):
+    """Tests for the ETag and Last-Modified handling of the offer pages."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create a user and an offer, and set up both offer page urls."""
+        cls.user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.offer = Offer.objects.create(
+            name="Solo", slug="solo", seats=1, price=25, is_active=True
+        )
+        cls.list_url = reverse("offers")
+        cls.detail_url = reverse("offer", kwargs={"slug": "solo"})
+
+    def setUp(self):
+        cache.clear()
+
+    def test_offer_pages_send_validators(self):
+        """Verify the ETag and Last-Modified headers."""
+        self.client.force_login(self.user)
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertTrue(response.has_header("ETag"))
+                self.assertTrue(response.has_header("Last-Modified"))
+
+    def test_detail_page_is_private(self):
+        """Verify the detail page is revalidated and kept per visitor."""
+        self.client.force_login(self.user)
+        response = self.client.get(self.detail_url)
+        self.assertIn("Cookie", response["Vary"])
+        self.assertIn("private", response["Cache-Control"])
+        self.assertIn("no-cache", response["Cache-Control"])
+
+    def test_list_page_is_public(self):
+        """
+        Verify the list page is shareable, even for a visitor with a session,
+        and does not read or set any cookie.
+        """
+        self.client.force_login(self.user)
+        response = self.client.get(self.list_url)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=60", response["Cache-Control"])
+        self.assertNotIn("Cookie", response.get("Vary", ""))
+        self.assertEqual(response.cookies, {})
+
+    def test_matching_etag_returns_304_without_rendering(self):
+        """Verify a repeat visit is answered with a 304 and no template."""
+        self.client.force_login(self.user)
+        for url in (self.list_url, self.detail_url):
+            with self.subTest(url=url):
+                etag = self.client.get(url)["ETag"]
+                response = self.client.get(url, headers={"if-none-match": etag})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+                self.assertEqual(response.templates, [])
+
+    def test_matching_last_modified_returns_304(self):
+        """Verify If-Modified-Since alone is honoured."""
+        last_modified = self.client.get(self.list_url)["Last-Modified"]
+        response = self.client.get(
+            self.list_url, headers={"if-modified-since": last_modified}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_page_is_revalidated_from_cache(self):
+        """
+        Verify a 304 on the list page only loads the session once the offers
+        state is cached.
+        """
+        etag = self.client.get(self.list_url)["ETag"]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.list_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(
+            [query["sql"] for query in queries if "products_offer" in query["sql"]], []
+        )
+
+    def test_rendered_detail_page_loads_the_offer_once(self):
+        """
+        Verify the validators and the view of the detail page share a single
+        query of the offer, besides the session and the user.
+        """
+        self.client.force_login(self.user)
+        # The first visit saves the cart in the session.
+        self.client.get(self.detail_url)
+        with self.assertNumQueries(3):
+            response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, 200)
+
+    def test_revalidated_detail_page_loads_the_offer_once(self):
+        """Verify a 304 on the detail page only queries the offer once."""
+        self.client.force_login(self.user)
+        etag = self.client.get(self.detail_url)["ETag"]
+        with self.assertNumQueries(3):
+            response = self.client.get(self.detail_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 304)
+
+    def test_offer_change_invalidates_etag(self):
+        """Verify editing or withdrawing an offer changes both pages' ETag."""
+        self.client.force_login(self.user)
+        etags = {
+            url: self.client.get(url)["ETag"]
+            for url in (self.list_url, self.detail_url)
+        }
+        self.offer.is_active = False
+        self.offer.save()
+        for url, etag in etags.items():
+            with self.subTest(url=url):
+                response = self.client.get(url, headers={"if-none-match": etag})
+                self.assertEqual(response.status_code, 200)
+
+    def test_etag_depends_on_visitor_on_detail_page_only(self):
+        """
+        Verify the header state (account, cart count) is part of the detail
+        page ETag, while the list page ETag is shared.
+        """
+        anonymous_etag = self.client.get(self.list_url)["ETag"]
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(self.list_url)["ETag"], anonymous_etag)
+
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.client.post(
+            reverse("cart-add"), {"action": "post", "offer_id": self.offer.pk}
+        )
+        response = self.client.get(self.detail_url, headers={"if-none-match": etag})
+        self.assertEqual(response.status_code, 200)
+
+    def test_unknown_offer_is_not_found(self):
+        """Verify an unknown slug still gets a 404 whatever the validators."""
+        self.client.force_login(self.user)
+        response = self.client.get(
+            reverse("offer", kwargs={"slug": "unknown"}), headers={"if-none-match": "*"}
+        )
+        self.assertEqual(response.status_code, 404)
+
+    def test_offer_change_rerenders_cached_list(self):
+        """Verify saving an offer refreshes the server-side cached list."""
+        self.client.get(self.list_url)
+        self.offer.name = "Duo"
+        self.offer.save()
+        response = self.client.get(self.list_url)
+        self.assertContains(response, "Duo")
+        self.assertTemplateUsed(response, "products/offers-list.html")
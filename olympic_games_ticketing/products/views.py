@@ -1,31 +1,115 @@
+import hashlib
+from functools import wraps
+
 from django.contrib.auth.decorators import login_required
-from django.shortcuts import get_object_or_404, render
+from django.http import Http404
+from django.shortcuts import render
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_cookie
+from olympic_games_ticketing.page_cache import cached_page, public_page
 
+from products.catalog import get_offers_state
 from products.models import Offer
 
 
+def _page_etag(request, *versions):
+    """
+    Build the ETag of an offer page from the versions of the offers it shows
+    and of the header it renders for the visitor (account and cart count).
+
+    The cart is read from the session as is, without creating one.
+    """
+    user_id = request.user.pk if request.user.is_authenticated else "anonymous"
+    parts = [*versions, user_id, request.session.get("session_key") or {}]
+    return hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def _offers_list_last_modified(request):
+    last_modified, _ = get_offers_state()
+    return last_modified
+
+
+def _offers_list_etag(request):
+    # The list is rendered the same for every visitor (see `public_page`).
+    last_modified, count = get_offers_state()
+    return hashlib.md5(
+        repr([last_modified, count]).encode(), usedforsecurity=False
+    ).hexdigest()
+
+
+def _get_offer(request, slug):
+    """
+    Return the offer of a detail page, or None, loaded once per request: the
+    validators and the view share it.
+    """
+    if not hasattr(request, "_offer"):
+        request._offer = Offer.objects.filter(slug=slug).first()
+    return request._offer
+
+
+def _offer_detail_last_modified(request, slug):
+    offer = _get_offer(request, slug)
+    return offer.updated_at if offer else None
+
+
+def _offer_detail_etag(request, slug):
+    offer = _get_offer(request, slug)
+    if offer is None:
+        return None
+    return _page_etag(request, slug, offer.updated_at)
+
+
+def revalidate(view):
+    """
+    Mark the responses of a view as private and to be revalidated on each
+    visit, so browsers reuse them only after a 304 from the conditional view.
+    """
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+    return wrapper
+
+
+@public_page
+@condition(etag_func=_offers_list_etag, last_modified_func=_offers_list_last_modified)
+@cached_page
 def offers_list_page(request):
     """
     Renders the offers list page.
 
-    This view displays all the available offers ordered by seat count.
+    This view displays all the available offers ordered by seat count. It is
+    the same for every visitor, cached server-side and by shared caches.
+    Requests whose ETag or modification date match the current offers get a
+    304 response without rendering.
     """
 
     offers = Offer.objects.filter(is_active=True).order_by("seats")
-    context = {"offers": offers}
+    context = {"offers": offers, "hydrate_header": True}
 
     return render(request, "products/offers-list.html", context)
 
 
 @login_required
+@revalidate
+@vary_on_cookie
+@condition(etag_func=_offer_detail_etag, last_modified_func=_offer_detail_last_modified)
 def offer_detail_page(request, slug):
     """
     Renders the offer detail page for authenticated users.
 
     This view displays the details of a single offer identified by its slug.
+    Requests whose ETag or modification date match the offer get a 304
+    response without rendering.
     """
 
-    offer = get_object_or_404(Offer, slug=slug)
+    offer = _get_offer(request, slug)
+    if offer is None:
+        raise Http404("Offre introuvable.")
     context = {"offer": offer}
 
     return render(request, "products/offer-detail.html", context)
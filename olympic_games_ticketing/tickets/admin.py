@@ -1,5 +1,28 @@
 from django.contrib import admin
+from olympic_games_ticketing.admin_utils import ScalableModelAdmin, parse_uuid
 
 from .models import Ticket
 
-admin.site.register(Ticket)
+
+@admin.register(Ticket)
+class TicketAdmin(ScalableModelAdmin):
+    """
+    Ticket admin for large tables.
+
+    Search is exact: a ticket's final key (through its digest index) or the
+    key of its order.
+    """
+
+    list_display = ["id", "order", "offer", "created_at"]
+    list_filter = ["offer"]
+    list_select_related = ["order__user", "offer"]
+    raw_id_fields = ["order", "offer"]
+    date_hierarchy = "created_at"
+    search_fields = ["final_key"]
+    search_help_text = "Clé finale du billet ou clé de commande."
+
+    def get_exact_search_results(self, queryset, search_term):
+        order_key = parse_uuid(search_term)
+        if order_key is not None:
+            return queryset.filter(order__order_key=order_key)
+        return queryset.filter_by_final_key(search_term)
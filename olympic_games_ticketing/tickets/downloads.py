@@ -0,0 +1,184 @@
+import io
+import zipfile
+import zlib
+
+from tickets.qrcodes import render_qr_code, render_qr_code_png
+
+# A4 portrait, in PDF points.
+PDF_PAGE_WIDTH = 595
+PDF_PAGE_HEIGHT = 842
+PDF_QR_CODE_SIZE = 400
+
+
+class _StreamBuffer(io.RawIOBase):
+    """
+    Write-only, unseekable buffer collecting the bytes written by `zipfile`.
+
+    Being unseekable makes `zipfile` write data descriptors after each entry
+    instead of seeking back to patch the local headers, so every entry can be
+    flushed to the client as soon as it is written.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        """Return and forget everything written since the previous drain."""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_tickets_zip(tickets):
+    """
+    Yield a ZIP archive containing one QR-code PNG per ticket.
+
+    Each QR code is rendered from the ticket's `final_key` when its entry is
+    written, so only one image is held in memory at a time. PNG data is already
+    compressed, so entries are stored without further compression.
+    """
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for ticket in tickets:
+            entry = zipfile.ZipInfo(
+                ticket.qr_code_filename, date_time=ticket.created_at.timetuple()[:6]
+            )
+            archive.writestr(entry, render_qr_code_png(ticket.final_key))
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+class _PdfWriter:
+    """
+    Minimal incremental PDF writer laying out one QR code per A4 page.
+
+    Objects 1 (catalog) and 2 (page tree) are reserved up front and written
+    last, once every page is known, so pages can be emitted as they are built.
+    """
+
+    CATALOG_ID = 1
+    PAGES_ID = 2
+    FONT_ID = 3
+
+    def __init__(self):
+        self._offsets = {}
+        self._position = 0
+        self._next_id = self.FONT_ID + 1
+        self._page_ids = []
+
+    def _emit(self, data):
+        self._position += len(data)
+        return data
+
+    def _object(self, object_id, body, stream=None):
+        self._offsets[object_id] = self._position
+        data = f"{object_id} 0 obj\n".encode() + body
+        if stream is not None:
+            data += b"\nstream\n" + stream + b"\nendstream"
+        return self._emit(data + b"\nendobj\n")
+
+    def _allocate(self):
+        object_id = self._next_id
+        self._next_id += 1
+        return object_id
+
+    def start(self):
+        """Return the file header and the shared font resource."""
+        header = self._emit(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+        font = self._object(
+            self.FONT_ID, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"
+        )
+        return header + font
+
+    def add_page(self, final_key):
+        """Return the objects of a page showing the QR code of `final_key`."""
+        image = render_qr_code(final_key)
+        image_id, content_id, page_id = (self._allocate() for _ in range(3))
+        self._page_ids.append(page_id)
+
+        # Mode "1" pixels map directly onto a 1-bit DeviceGray image.
+        pixels = zlib.compress(image.tobytes())
+        image_object = self._object(
+            image_id,
+            (
+                f"<< /Type /XObject /Subtype /Image /Width {image.width} "
+                f"/Height {image.height} /ColorSpace /DeviceGray "
+                f"/BitsPerComponent 1 /Filter /FlateDecode /Length {len(pixels)} >>"
+            ).encode(),
+            pixels,
+        )
+
+        x = (PDF_PAGE_WIDTH - PDF_QR_CODE_SIZE) // 2
+        y = (PDF_PAGE_HEIGHT - PDF_QR_CODE_SIZE) // 2
+        content = (
+            f"q {PDF_QR_CODE_SIZE} 0 0 {PDF_QR_CODE_SIZE} {x} {y} cm /Im0 Do Q\n"
+            f"BT /F1 8 Tf {x} {y - 20} Td ({final_key}) Tj ET"
+        ).encode()
+        content_object = self._object(
+            content_id, f"<< /Length {len(content)} >>".encode(), content
+        )
+
+        page_object = self._object(
+            page_id,
+            (
+                f"<< /Type /Page /Parent {self.PAGES_ID} 0 R "
+                f"/MediaBox [0 0 {PDF_PAGE_WIDTH} {PDF_PAGE_HEIGHT}] "
+                f"/Resources << /XObject << /Im0 {image_id} 0 R >> "
+                f"/Font << /F1 {self.FONT_ID} 0 R >> >> "
+                f"/Contents {content_id} 0 R >>"
+            ).encode(),
+        )
+        return image_object + content_object + page_object
+
+    def finish(self):
+        """Return the page tree, the catalog, the cross-reference table and trailer."""
+        kids = " ".join(f"{page_id} 0 R" for page_id in self._page_ids)
+        data = self._object(
+            self.PAGES_ID,
+            f"<< /Type /Pages /Kids [{kids}] /Count {len(self._page_ids)} >>".encode(),
+        )
+        data += self._object(
+            self.CATALOG_ID, f"<< /Type /Catalog /Pages {self.PAGES_ID} 0 R >>".encode()
+        )
+
+        xref_position = self._position
+        size = self._next_id
+        xref = [f"xref\n0 {size}\n", "0000000000 65535 f \n"]
+        xref += [f"{self._offsets[i]:010d} 00000 n \n" for i in range(1, size)]
+        trailer = (
+            f"trailer\n<< /Size {size} /Root {self.CATALOG_ID} 0 R >>\n"
+            f"startxref\n{xref_position}\n%%EOF\n"
+        )
+        return data + self._emit("".join(xref).encode() + trailer.encode())
+
+
+def iter_tickets_pdf(tickets):
+    """
+    Yield a PDF document with one page per ticket.
+
+    Pages are rendered from each ticket's `final_key` and flushed one at a
+    time, so memory usage does not grow with the number of tickets.
+    """
+    writer = _PdfWriter()
+    yield writer.start()
+    for ticket in tickets:
+        yield writer.add_page(ticket.final_key)
+    yield writer.finish()
+
+
+TICKET_ARCHIVE_FORMATS = {
+    "pdf": (iter_tickets_pdf, "application/pdf"),
+    "zip": (iter_tickets_zip, "application/zip"),
+}
@@ -0,0 +1,88 @@
+import time
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.management.base import BaseCommand
+from olympic_games_ticketing.local_s3 import LocalS3Server
+from olympic_games_ticketing.storage_backends import PublicMediaStorage, save_many
+
+from tickets.qrcodes import render_qr_code_png
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare sequential and concurrent uploads of ticket QR codes against "
+        "the local in-process S3 stand-in."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--tickets", type=int, default=100, help="Number of images to upload."
+        )
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.02,
+            help="Simulated S3 round-trip time per request, in seconds.",
+        )
+
+    def handle(self, *args, **options):
+        count = options["tickets"]
+        pngs = [render_qr_code_png(f"benchmark-{i}") for i in range(count)]
+
+        with LocalS3Server(latency=options["latency"]) as server:
+            sequential, sequential_connections = self._time(
+                server,
+                lambda storage, prefix: [
+                    storage.save(f"{prefix}/{i}.png", ContentFile(png))
+                    for i, png in enumerate(pngs)
+                ],
+            )
+            # A fresh storage: its client is created and its connection pool
+            # filled during the run, as for the first checkout of a worker.
+            storage = PublicMediaStorage(**server.storage_options())
+            cold, cold_connections = self._time(
+                server, self._save_many(pngs), storage, "cold"
+            )
+            # The same storage again: its client and pooled connections are
+            # reused, as for every later checkout.
+            warm, warm_connections = self._time(
+                server, self._save_many(pngs), storage, "warm"
+            )
+
+        self.stdout.write(
+            f"{count} images, {options['latency'] * 1000:.0f} ms simulated latency, "
+            f"{settings.MEDIA_UPLOAD_MAX_WORKERS} workers"
+        )
+        self.stdout.write(
+            f"sequential save():  {sequential:.2f}s "
+            f"({sequential_connections} connections opened)"
+        )
+        for label, duration, connections in (
+            ("cold", cold, cold_connections),
+            ("warm", warm, warm_connections),
+        ):
+            self.stdout.write(
+                f"save_many(), {label}: {duration:.2f}s "
+                f"({connections} connections opened), "
+                f"speedup x{sequential / duration:.1f}"
+            )
+
+    def _save_many(self, pngs):
+        return lambda storage, prefix: save_many(
+            storage,
+            ((f"{prefix}/{i}.png", ContentFile(png)) for i, png in enumerate(pngs)),
+        )
+
+    def _time(self, server, upload, storage=None, prefix="sequential"):
+        """
+        Run `upload(storage, prefix)` and return its duration and the number
+        of connections it opened to the server. Without `storage`, a fresh
+        one is used.
+        """
+        if storage is None:
+            storage = PublicMediaStorage(**server.storage_options())
+        connections = server.connection_count
+        start = time.perf_counter()
+        upload(storage, prefix)
+        return time.perf_counter() - start, server.connection_count - connections
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+
+from tickets.models import Ticket
+
+
+class Command(BaseCommand):
+    help = (
+        "Render and upload the QR codes of tickets that have none, e.g. "
+        "because the upload after checkout failed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Number of QR codes uploaded concurrently per batch.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        tickets = (
+            Ticket.objects.filter(qr_code="")
+            .only("order_id", "offer_id", "unique_suffix", "final_key", "qr_code")
+            .order_by("pk")
+            .iterator(chunk_size=batch_size)
+        )
+
+        generated = 0
+        batch = []
+        for ticket in tickets:
+            batch.append(ticket)
+            if len(batch) == batch_size:
+                Ticket.generate_qr_codes(batch)
+                generated += len(batch)
+                batch = []
+        if batch:
+            Ticket.generate_qr_codes(batch)
+            generated += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(f"{generated} QR code(s) generated."))
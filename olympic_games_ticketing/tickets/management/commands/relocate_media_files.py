@@ -0,0 +1,102 @@
+import posixpath
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from olympic_games_ticketing.storage_backends import copy_many, delete_many
+from products.catalog import invalidate_offers
+from products.models import Offer
+
+MEDIA_FIELDS = ("tickets.Ticket.qr_code", "products.Offer.thumbnail")
+
+
+class Command(BaseCommand):
+    help = (
+        "Move existing media files to the hashed directory layout of their "
+        "upload_to, copying and deleting them concurrently, batch by batch. "
+        "Thumbnail renditions keep working from their old location and can be "
+        "moved next to their original with regenerate_thumbnail_renditions."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "fields",
+            nargs="*",
+            default=MEDIA_FIELDS,
+            help="Fields to process, as app_label.Model.field "
+            f"(default: {', '.join(MEDIA_FIELDS)}).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of files copied, saved and deleted per batch.",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many files would be moved.",
+        )
+
+    def handle(self, *args, **options):
+        for path in options["fields"]:
+            try:
+                app_label, model_name, field_name = path.split(".")
+                model = apps.get_model(app_label, model_name)
+                field = model._meta.get_field(field_name)
+            except (ValueError, LookupError) as error:
+                raise CommandError(f"Unknown media field '{path}'.") from error
+
+            moved = self.relocate(
+                model, field, options["batch_size"], options["dry_run"]
+            )
+            verb = "would be moved" if options["dry_run"] else "moved"
+            self.stdout.write(self.style.SUCCESS(f"{path}: {moved} file(s) {verb}."))
+
+    def relocate(self, model, field, batch_size, dry_run):
+        """Relocate the files of one field and return how many were moved."""
+        storage = field.storage
+        instances = (
+            model.objects.exclude(**{field.name: ""})
+            .exclude(**{f"{field.name}__isnull": True})
+            .order_by("pk")
+            .iterator(chunk_size=batch_size)
+        )
+
+        moved = 0
+        batch = []
+        for instance in instances:
+            old_name = getattr(instance, field.attname).name
+            new_name = field.generate_filename(instance, posixpath.basename(old_name))
+            if posixpath.dirname(new_name) != posixpath.dirname(old_name):
+                batch.append((instance, old_name, new_name))
+            if len(batch) == batch_size:
+                moved += self.move_batch(model, field, storage, batch, dry_run)
+                batch = []
+        if batch:
+            moved += self.move_batch(model, field, storage, batch, dry_run)
+        return moved
+
+    def move_batch(self, model, field, storage, batch, dry_run):
+        """
+        Copy a batch of files to their new names, point the rows at the copies,
+        then delete the originals, so an interruption never loses a file.
+        """
+        if dry_run:
+            return len(batch)
+
+        names = copy_many(
+            storage,
+            [(old_name, new_name) for _, old_name, new_name in batch],
+            max_length=field.max_length,
+        )
+        instances = []
+        for (instance, _, _), name in zip(batch, names):
+            setattr(instance, field.attname, name)
+            instances.append(instance)
+        model.objects.bulk_update(instances, [field.attname])
+        if model is Offer:
+            # bulk_update() sends no post_save: the catalog and the pages
+            # would keep the old thumbnail URLs.
+            invalidate_offers()
+        delete_many(storage, [old_name for _, old_name, _ in batch])
+        return len(batch)
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:04
+
+import olympic_games_ticketing.storage_backends
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0003_alter_ticket_created_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticket',
+            name='qr_code',
+            field=models.ImageField(help_text='Image PNG générée à partir de la clé finale.', upload_to=olympic_games_ticketing.storage_backends.HashedUploadTo('tickets'), verbose_name='QR Code'),
+        ),
+    ]
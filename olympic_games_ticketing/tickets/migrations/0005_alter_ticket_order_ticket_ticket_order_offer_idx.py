@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0004_alter_order_user_order_order_user_created_idx'),
+        ('products', '0012_offer_offer_active_seats_idx'),
+        ('tickets', '0004_alter_ticket_qr_code'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticket',
+            name='order',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='tickets', to='orders.order', verbose_name='Commande liée au billet'),
+        ),
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['order', 'offer'], name='ticket_order_offer_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:20
+
+import hashlib
+
+from django.db import migrations, models
+
+
+def backfill_final_key_digest(apps, schema_editor):
+    """Store the 16-byte BLAKE2b digest of every existing ticket's final key."""
+    Ticket = apps.get_model("tickets", "Ticket")
+    batch = []
+    for ticket in Ticket.objects.only("final_key").iterator(chunk_size=2000):
+        ticket.final_key_digest = hashlib.blake2b(
+            ticket.final_key.encode(), digest_size=16
+        ).digest()
+        batch.append(ticket)
+        if len(batch) == 2000:
+            Ticket.objects.bulk_update(batch, ["final_key_digest"])
+            batch = []
+    Ticket.objects.bulk_update(batch, ["final_key_digest"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0005_alter_ticket_order_ticket_ticket_order_offer_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='ticket',
+            name='final_key_digest',
+            field=models.BinaryField(editable=False, max_length=16, null=True),
+        ),
+        migrations.RunPython(backfill_final_key_digest, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='ticket',
+            name='final_key_digest',
+            field=models.BinaryField(editable=False, max_length=16, unique=True),
+        ),
+        migrations.AlterField(
+            model_name='ticket',
+            name='final_key',
+            field=models.CharField(editable=False, max_length=200),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:12
+
+import olympic_games_ticketing.uuids
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tickets', '0006_ticket_final_key_digest'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='ticket',
+            name='unique_suffix',
+            field=models.UUIDField(default=olympic_games_ticketing.uuids.default_uuid, editable=False),
+        ),
+    ]
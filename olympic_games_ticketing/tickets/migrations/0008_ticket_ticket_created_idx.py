@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 06:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('orders', '0007_order_order_created_idx'),
+        ('products', '0012_offer_offer_active_seats_idx'),
+        ('tickets', '0007_alter_ticket_unique_suffix'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='ticket',
+            index=models.Index(fields=['created_at'], name='ticket_created_idx'),
+        ),
+    ]
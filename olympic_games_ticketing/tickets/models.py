@@ -1,12 +1,38 @@
-import io
-import uuid
+import hashlib
 
-import qrcode
 from django.core.files.base import ContentFile
 from django.db import models
+from olympic_games_ticketing.storage_backends import HashedUploadTo, save_many
+from olympic_games_ticketing.uuids import default_uuid
 from orders.models import Order
 from products.models import Offer
 
+from tickets.qrcodes import render_qr_code_png
+
+FINAL_KEY_DIGEST_SIZE = 16
+
+
+def digest_final_key(final_key):
+    """Return the fixed-size BLAKE2b digest under which a final key is indexed."""
+    return hashlib.blake2b(
+        final_key.encode(), digest_size=FINAL_KEY_DIGEST_SIZE
+    ).digest()
+
+
+class TicketQuerySet(models.QuerySet):
+    """Custom queryset for Ticket, looking tickets up by their final key."""
+
+    def filter_by_final_key(self, final_key):
+        """
+        Filter tickets by final key through the indexed digest column.
+
+        The key itself is compared too, which costs nothing once the row is
+        found and rules out digest collisions.
+        """
+        return self.filter(
+            final_key_digest=digest_final_key(final_key), final_key=final_key
+        )
+
 
 class Ticket(models.Model):
     """
@@ -16,10 +42,13 @@ class Ticket(models.Model):
 
     - order: order to which the ticket is linked.
     - offer: offer to which the ticket is linked.
-    - unique_suffix: a randomly generated UUID ensuring
+    - unique_suffix: a generated UUID ensuring
       that each ticket within the same order remains unique.
     - final_key: unique key encoded in the QR code.
-    - qr_code: PNG image file generated from final_key.
+    - final_key_digest: 16-byte BLAKE2b digest of final_key, carrying the
+      unique index used for lookups instead of the ~110-character key.
+    - qr_code: PNG image file generated from final_key, stored under a hashed
+      `tickets/xx/yy/` directory.
     - created_at: ticket creation timestamp.
     """
 
@@ -28,6 +57,8 @@ class Ticket(models.Model):
         on_delete=models.CASCADE,
         related_name="tickets",
         verbose_name="Commande liée au billet",
+        # Covered by the (order, offer) index below.
+        db_index=False,
     )
     offer = models.ForeignKey(
         Offer,
@@ -36,16 +67,20 @@ class Ticket(models.Model):
         verbose_name="Offre liée au billet",
     )
     unique_suffix = models.UUIDField(
-        default=uuid.uuid4,
+        default=default_uuid,
         editable=False,
     )
     final_key = models.CharField(
         max_length=200,
+        editable=False,
+    )
+    final_key_digest = models.BinaryField(
+        max_length=FINAL_KEY_DIGEST_SIZE,
         unique=True,
         editable=False,
     )
     qr_code = models.ImageField(
-        upload_to="tickets/",
+        upload_to=HashedUploadTo("tickets"),
         verbose_name="QR Code",
         help_text="Image PNG générée à partir de la clé finale.",
     )
@@ -54,42 +89,82 @@ class Ticket(models.Model):
         editable=False,
     )
 
+    objects = TicketQuerySet.as_manager()
+
     class Meta:
         """
         Meta options for Ticket model:
 
         - Ordering: displays the most recent tickets first.
+        - indexes: serves the tickets of an order, optionally for one offer,
+        and date ranges over every ticket (admin date hierarchy, exports).
         - verbose_name: singular label displayed in the Django admin.
         - verbose_name_plural: plural label displayed in the Django admin.
         """
 
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["order", "offer"], name="ticket_order_offer_idx"),
+            models.Index(fields=["created_at"], name="ticket_created_idx"),
+        ]
         verbose_name = "Billet"
         verbose_name_plural = "Billets"
 
-    def save(self, *args, **kwargs):
+    def assign_final_key(self):
         """
-        Override save to generate the final key if it does not exist.
+        Generate the final key if it does not exist, and its digest.
         """
         if not self.final_key:
             registration_key = self.order.user.registration_key
             order_key = self.order.order_key
             self.final_key = f"{registration_key}-{order_key}-{self.unique_suffix}"
+        self.final_key_digest = digest_final_key(self.final_key)
+
+    def save(self, *args, **kwargs):
+        """
+        Override save to generate the final key and its digest.
+        """
+        self.assign_final_key()
         super().save(*args, **kwargs)
 
+    @property
+    def qr_code_filename(self):
+        """
+        Return the QR code filename, combining the order ID, offer ID,
+        and the ticket's unique suffix.
+        """
+        return f"ticket_{self.order_id}_{self.offer_id}_{self.unique_suffix}.png"
+
     def generate_qr_code(self):
         """
         Generate and attach the QR code image for the ticket.
 
-        The image is stored in the qr_code field under a unique filename
-        combining the order ID, offer ID, and the ticket's unique suffix.
+        The image is stored in the qr_code field under `qr_code_filename`.
+        """
+        png = render_qr_code_png(self.final_key)
+        self.qr_code.save(self.qr_code_filename, ContentFile(png), save=True)
+
+    @classmethod
+    def generate_qr_codes(cls, tickets):
         """
-        qr_img = qrcode.make(self.final_key)
-        buffer = io.BytesIO()
-        qr_img.save(buffer, format="PNG")
-        buffer.seek(0)
-        filename = f"ticket_{self.order.id}_{self.offer.id}_{self.unique_suffix}.png"
-        self.qr_code.save(filename, ContentFile(buffer.read()), save=True)
+        Generate and attach the QR code images of many tickets at once.
+
+        Images are rendered while earlier ones are uploaded, the uploads run
+        concurrently through `save_many()`, and the stored names are written
+        back with a single bulk update.
+        """
+        field = cls._meta.get_field("qr_code")
+        files = (
+            (
+                field.generate_filename(ticket, ticket.qr_code_filename),
+                ContentFile(render_qr_code_png(ticket.final_key)),
+            )
+            for ticket in tickets
+        )
+        names = save_many(field.storage, files, max_length=field.max_length)
+        for ticket, name in zip(tickets, names):
+            ticket.qr_code = name
+        cls.objects.bulk_update(tickets, ["qr_code"])
 
     def __str__(self):
         """
@@ -97,5 +172,5 @@ class Ticket(models.Model):
         for display purposes (e.g., in the admin interface).
         """
         return (
-            f"Ticket #{self.id} - Offre : {self.offer.name} (Commande #{self.order.id})"
+            f"Ticket #{self.id} - Offre : {self.offer.name} (Commande #{self.order_id})"
         )
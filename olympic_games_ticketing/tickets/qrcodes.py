@@ -0,0 +1,19 @@
+import io
+
+import qrcode
+
+
+def render_qr_code(final_key):
+    """
+    Render the QR code encoding a ticket's final key.
+
+    Returns a black and white (mode "1") Pillow image.
+    """
+    return qrcode.make(final_key).get_image()
+
+
+def render_qr_code_png(final_key):
+    """Return the PNG bytes of the QR code encoding a ticket's final key."""
+    buffer = io.BytesIO()
+    render_qr_code(final_key).save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -0,0 +1,54 @@
+from accounts.models import User
+from django.test import TestCase
+from django.urls import reverse
+from orders.models import Order
+from products.models import Offer
+
+from tickets.models import Ticket
+
+
+class TestTicketAdmin(TestCase):
+    """Tests for the Ticket admin."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a superuser and two tickets from different orders."""
+        cls.admin = User.objects.create_superuser(
+            email="admin@example.com",
+            first_name="Admin",
+            last_name="Istrator",
+            password="paris2024",
+        )
+        offer = Offer.objects.create(name="Solo", price=25)
+        cls.tickets = [
+            Ticket.objects.create(
+                order=Order.objects.create(user=cls.admin, total=25), offer=offer
+            )
+            for _ in range(2)
+        ]
+        cls.url = reverse("admin:tickets_ticket_changelist")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def search(self, term):
+        response = self.client.get(self.url, {"q": term})
+        self.assertEqual(response.status_code, 200)
+        return [ticket.pk for ticket in response.context["cl"].result_list]
+
+    def test_search_by_final_key(self):
+        """Verify that a final key finds its ticket only."""
+        ticket = self.tickets[1]
+        self.assertEqual(self.search(ticket.final_key), [ticket.pk])
+        self.assertEqual(self.search(ticket.final_key[:-1]), [])
+
+    def test_search_by_order_key(self):
+        """Verify that an order key finds the tickets of that order."""
+        ticket = self.tickets[0]
+        self.assertEqual(self.search(str(ticket.order.order_key)), [ticket.pk])
+
+    def test_changelist_lists_tickets_newest_first(self):
+        """Verify the changelist ordering on the primary key."""
+        self.assertEqual(
+            self.search(""), [ticket.pk for ticket in reversed(self.tickets)]
+        )
@@ -0,0 +1,113 @@
+import io
+import tempfile
+
+from accounts.models import User
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from olympic_games_ticketing.prerender import prerender_pages
+from orders.models import Order
+from products.models import Offer
+
+from tickets.models import Ticket
+
+
+class TestRelocateMediaFilesCommand(TestCase):
+    """Tests for the relocate_media_files management command."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a user, an order and an offer for tests."""
+        cls.user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.order = Order.objects.create(user=cls.user, total=25)
+        cls.offer = Offer.objects.create(name="Solo", slug="solo", price=25)
+
+    def setUp(self):
+        """Create a ticket whose QR code is stored in the legacy flat folder."""
+        self.ticket = Ticket.objects.create(order=self.order, offer=self.offer)
+        storage = self.ticket.qr_code.storage
+        self.old_name = storage.save(
+            f"tickets/{self.ticket.qr_code_filename}", ContentFile(b"png")
+        )
+        Ticket.objects.filter(pk=self.ticket.pk).update(qr_code=self.old_name)
+
+    def test_command_moves_file_to_hashed_folder(self):
+        """Verify that the file is moved and the ticket points to its new name."""
+        call_command(
+            "relocate_media_files", "tickets.Ticket.qr_code", stdout=io.StringIO()
+        )
+        self.ticket.refresh_from_db()
+        storage = self.ticket.qr_code.storage
+        self.assertRegex(self.ticket.qr_code.name, r"^tickets/[0-9a-f]{2}/[0-9a-f]{2}/")
+        self.assertTrue(storage.exists(self.ticket.qr_code.name))
+        self.assertFalse(storage.exists(self.old_name))
+
+    def test_command_skips_files_already_relocated(self):
+        """Verify that running the command twice does not move files again."""
+        call_command("relocate_media_files", stdout=io.StringIO())
+        stdout = io.StringIO()
+        call_command("relocate_media_files", stdout=stdout)
+        self.assertIn("tickets.Ticket.qr_code: 0 file(s) moved.", stdout.getvalue())
+
+    def test_relocated_thumbnails_are_prerendered(self):
+        """Verify that the prerendered offers list links to the moved thumbnail."""
+        cache.clear()
+        storage = self.offer.thumbnail.storage
+        old_name = storage.save("images/solo.png", ContentFile(b"png"))
+        Offer.objects.filter(pk=self.offer.pk).update(thumbnail=old_name)
+        with (
+            tempfile.TemporaryDirectory() as root,
+            override_settings(PRERENDER_ROOT=root),
+        ):
+            page = prerender_pages()[1]
+            self.assertIn(storage.url(old_name), page.read_text())
+            with self.captureOnCommitCallbacks(execute=True):
+                call_command(
+                    "relocate_media_files",
+                    "products.Offer.thumbnail",
+                    stdout=io.StringIO(),
+                )
+            self.offer.refresh_from_db()
+            content = page.read_text()
+        self.assertNotIn(storage.url(old_name), content)
+        self.assertIn(self.offer.thumbnail.url, content)
+
+    def test_dry_run_does_not_move_files(self):
+        """Verify that --dry-run only reports the files to move."""
+        stdout = io.StringIO()
+        call_command("relocate_media_files", "--dry-run", stdout=stdout)
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.qr_code.name, self.old_name)
+        self.assertIn("1 file(s) would be moved.", stdout.getvalue())
+
+
+class TestGenerateMissingQrCodesCommand(TestCase):
+    """Tests for the generate_missing_qr_codes management command."""
+
+    def test_command_only_generates_missing_qr_codes(self):
+        """Verify that tickets without a QR code get one, in batches."""
+        user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        order = Order.objects.create(user=user, total=25)
+        offer = Offer.objects.create(name="Solo", price=25)
+        tickets = [Ticket.objects.create(order=order, offer=offer) for _ in range(3)]
+        tickets[0].generate_qr_code()
+        existing = tickets[0].qr_code.name
+
+        stdout = io.StringIO()
+        call_command("generate_missing_qr_codes", batch_size=1, stdout=stdout)
+
+        self.assertIn("2 QR code(s) generated.", stdout.getvalue())
+        self.assertFalse(Ticket.objects.filter(qr_code="").exists())
+        tickets[0].refresh_from_db()
+        self.assertEqual(tickets[0].qr_code.name, existing)
@@ -1,9 +1,10 @@
-import uuid
+import hashlib
 
 from accounts.models import User
 from django.core.files.base import ContentFile
-from django.db import models
+from django.db import IntegrityError, models
 from django.test import TestCase
+from olympic_games_ticketing.uuids import default_uuid
 from orders.models import Order, OrderItem
 from products.models import Offer
 
@@ -81,10 +82,10 @@ class TestTicketModel(TestCase):
         offer_field_verbose_name = self.ticket._meta.get_field("offer").verbose_name
         self.assertEqual(offer_field_verbose_name, "Offre liée au billet")
 
-    def test_unique_suffix_field_default_attribute_is_uuid4(self):
-        """Test that unique suffix default attribute is 'uuid.uuid4'."""
+    def test_unique_suffix_field_default_attribute_is_default_uuid(self):
+        """Test that unique suffix default attribute is 'default_uuid'."""
         unique_suffix_field = self.ticket._meta.get_field("unique_suffix")
-        self.assertIs(unique_suffix_field.default, uuid.uuid4)
+        self.assertIs(unique_suffix_field.default, default_uuid)
 
     def test_unique_suffix_field_editable_attribute_is_false(self):
         """Test that unique suffix is not editable."""
@@ -96,16 +97,54 @@ class TestTicketModel(TestCase):
         final_key_max_length = self.ticket._meta.get_field("final_key").max_length
         self.assertEqual(final_key_max_length, 200)
 
-    def test_final_key_is_unique(self):
-        """Test that the final key field has unique=True in the model."""
+    def test_final_key_is_not_indexed(self):
+        """Test that the final key field leaves uniqueness to its digest."""
         final_key_field = self.ticket._meta.get_field("final_key")
-        self.assertTrue(final_key_field.unique)
+        self.assertFalse(final_key_field.unique)
+        self.assertFalse(final_key_field.db_index)
+
+    def test_final_key_digest_is_unique(self):
+        """Test that the final key digest field has unique=True in the model."""
+        final_key_digest_field = self.ticket._meta.get_field("final_key_digest")
+        self.assertTrue(final_key_digest_field.unique)
+
+    def test_final_key_digest_is_16_byte_blake2b(self):
+        """Test that the stored digest is the 16-byte BLAKE2b of the final key."""
+        self.ticket.refresh_from_db()
+        self.assertEqual(
+            bytes(self.ticket.final_key_digest),
+            hashlib.blake2b(self.ticket.final_key.encode(), digest_size=16).digest(),
+        )
+
+    def test_duplicate_final_key_raises_IntegrityError(self):
+        """Test that the database rejects duplicate final keys through the digest."""
+        with self.assertRaises(IntegrityError):
+            Ticket.objects.create(
+                order=self.order, offer=self.offer, final_key=self.ticket.final_key
+            )
+
+    def test_filter_by_final_key_returns_matching_ticket(self):
+        """Test that tickets can be looked up by their final key."""
+        self.assertEqual(
+            list(Ticket.objects.filter_by_final_key(self.ticket.final_key)),
+            [self.ticket],
+        )
+        self.assertFalse(Ticket.objects.filter_by_final_key("unknown").exists())
 
     def test_final_key_field_editable_attribute_is_false(self):
         """Test that final key is not editable."""
         final_key_field = self.ticket._meta.get_field("final_key")
         self.assertFalse(final_key_field.editable)
 
+    def test_qr_code_field_uploads_to_hashed_subfolder(self):
+        """Verify that qr codes are spread over hashed 'tickets/xx/yy/' folders."""
+        self.ticket.qr_code.save(
+            "fake_image.png", ContentFile(b"fake image data"), save=True
+        )
+        self.assertRegex(
+            self.ticket.qr_code.name, r"^tickets/[0-9a-f]{2}/[0-9a-f]{2}/fake_image"
+        )
+
     def test_qr_code_field_uploads_to_tickets_folder(self):
         """Verify that uploaded qr codes are stored in the 'tickets/' folder."""
         self.ticket.qr_code.save(
@@ -140,6 +179,12 @@ class TestTicketModel(TestCase):
         """Test that the Ticket model ordering option is correct."""
         self.assertEqual(Ticket._meta.ordering, ["-created_at"])
 
+    def test_ticket_model_indexes_order_and_offer(self):
+        """Test that tickets are indexed by order, then offer, and by date."""
+        order_index, date_index = Ticket._meta.indexes
+        self.assertEqual(order_index.fields, ["order", "offer"])
+        self.assertEqual(date_index.fields, ["created_at"])
+
     def test_ticket_model_verbose_name(self):
         """Test that the Ticket model verbose_name is 'Billet'."""
         self.assertEqual(Ticket._meta.verbose_name, "Billet")
@@ -164,12 +209,24 @@ class TestTicketModel(TestCase):
         using the expected filename pattern.
         """
         self.ticket.generate_qr_code()
-        filename = self.ticket.qr_code.name
-        self.assertTrue(
-            filename.startswith(f"tickets/ticket_{self.order.id}_{self.offer.id}_")
-        )
+        filename = self.ticket.qr_code.name.rsplit("/", 1)[-1]
+        self.assertTrue(filename.startswith(f"ticket_{self.order.id}_{self.offer.id}_"))
         self.assertTrue(filename.endswith(".png"))
 
+    def test_generate_qr_codes_method_saves_every_image(self):
+        """
+        Verify that generate_qr_codes() stores a QR image for every ticket
+        and persists the stored names.
+        """
+        tickets = [
+            Ticket.objects.create(order=self.order, offer=self.offer) for _ in range(3)
+        ]
+        Ticket.generate_qr_codes(tickets)
+        for ticket in tickets:
+            ticket.refresh_from_db()
+            self.assertTrue(ticket.qr_code.name.endswith(ticket.qr_code_filename))
+            self.assertTrue(ticket.qr_code.storage.exists(ticket.qr_code.name))
+
     def test_str_method_returns_expected_format(self):
         """Test that the __str__ method of Ticket model returns expected_value."""
         expected_value = f"Ticket #{self.ticket.id} - Offre : {self.offer.name} (Commande #{self.order.id})"
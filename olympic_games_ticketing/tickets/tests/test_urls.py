@@ -0,0 +1,28 @@
+import uuid
+
+from django.test import SimpleTestCase
+from django.urls import resolve
+
+from tickets.views import download_order_tickets
+
+
+class TestTicketsAppUrls(SimpleTestCase):
+    """Test cases for verifying that tickets app URLs are configured correctly."""
+
+    def setUp(self):
+        """Resolve the URLs for tests."""
+        self.match_download = resolve(f"/tickets/download/{uuid.uuid4()}/")
+
+    def test_download_url_resolves_to_correct_view(self):
+        """
+        Ensure that '/tickets/download/<order_key>/' URL resolves to the
+        download_order_tickets view.
+        """
+        self.assertEqual(self.match_download.func, download_order_tickets)
+
+    def test_download_url_resolves_to_correct_name(self):
+        """
+        Ensure that '/tickets/download/<order_key>/' URL has the correct URL name
+        'tickets:download'.
+        """
+        self.assertEqual(self.match_download.view_name, "tickets:download")
@@ -0,0 +1,105 @@
+import io
+import zipfile
+
+from accounts.models import User
+from django.test import TestCase
+from django.urls import reverse
+from orders.models import Order
+from products.models import Offer
+
+from tickets.models import Ticket
+
+
+class TestDownloadOrderTicketsView(TestCase):
+    """Tests for verifying the behavior of the order tickets download view."""
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up a user, an order with three tickets and the download URL."""
+        cls.user = User.objects.create_user(
+            email="johndoe@gmail.com",
+            first_name="John",
+            last_name="Doe",
+            password="paris2024",
+        )
+        cls.offer = Offer.objects.create(name="Famille", slug="famille", price=75)
+        cls.order = Order.objects.create(user=cls.user, total=75)
+        cls.tickets = [
+            Ticket.objects.create(order=cls.order, offer=cls.offer) for _ in range(3)
+        ]
+        cls.url = reverse("tickets:download", args=[cls.order.order_key])
+
+    def setUp(self):
+        """
+        Log in the test client before each test to simulate an authenticated session.
+        """
+        self.client.login(email="johndoe@gmail.com", password="paris2024")
+
+    def test_download_requires_login(self):
+        """Verify that an unauthenticated user is redirected (302)."""
+        self.client.logout()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+
+    def test_download_returns_404_for_another_users_order(self):
+        """Verify that a user cannot download the tickets of someone else's order."""
+        User.objects.create_user(
+            email="janedoe@gmail.com",
+            first_name="Jane",
+            last_name="Doe",
+            password="paris2024",
+        )
+        self.client.login(email="janedoe@gmail.com", password="paris2024")
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_returns_404_for_unknown_format(self):
+        """Verify that an unsupported format returns a 404."""
+        response = self.client.get(self.url, {"format": "docx"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_download_is_streamed(self):
+        """Verify that the download is returned as a streaming response."""
+        response = self.client.get(self.url)
+        self.assertTrue(response.streaming)
+
+    def test_download_defaults_to_pdf_with_one_page_per_ticket(self):
+        """Verify that the default download is a PDF with one page per ticket."""
+        response = self.client.get(self.url)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        content = b"".join(response.streaming_content)
+        self.assertTrue(content.startswith(b"%PDF-"))
+        self.assertTrue(content.rstrip().endswith(b"%%EOF"))
+        self.assertIn(b"/Count 3", content)
+
+    def test_pdf_download_cross_reference_offsets_point_to_objects(self):
+        """Verify that the PDF cross-reference table points to each object."""
+        response = self.client.get(self.url)
+        content = b"".join(response.streaming_content)
+        xref = content[content.rindex(b"\nxref\n") + 1 :].split(b"\n")
+        size = int(xref[1].split()[1])
+        for object_id in range(1, size):
+            offset = int(xref[2 + object_id].split()[0])
+            self.assertTrue(content[offset:].startswith(f"{object_id} 0 obj".encode()))
+
+    def test_zip_download_contains_one_png_per_ticket(self):
+        """Verify that the ZIP download contains the PNG of every ticket."""
+        response = self.client.get(self.url, {"format": "zip"})
+        self.assertEqual(response["Content-Type"], "application/zip")
+        content = b"".join(response.streaming_content)
+        with zipfile.ZipFile(io.BytesIO(content)) as archive:
+            self.assertIsNone(archive.testzip())
+            self.assertEqual(
+                sorted(archive.namelist()),
+                sorted(ticket.qr_code_filename for ticket in self.tickets),
+            )
+            png = archive.read(self.tickets[0].qr_code_filename)
+        self.assertTrue(png.startswith(b"\x89PNG"))
+
+    def test_download_sets_attachment_filename(self):
+        """Verify that the response is sent as an attachment named after the order."""
+        response = self.client.get(self.url, {"format": "zip"})
+        self.assertEqual(
+            response["Content-Disposition"],
+            f'attachment; filename="billets-commande-{self.order.id}.zip"',
+        )
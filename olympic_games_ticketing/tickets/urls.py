@@ -1,9 +1,9 @@
 from django.urls import path
 
-from .views import generate_tickets_for_order
+from .views import download_order_tickets
 
 app_name = "tickets"
 
 urlpatterns = [
-    path("generate/<int:order_id>/", generate_tickets_for_order, name="generate"),
+    path("download/<uuid:order_key>/", download_order_tickets, name="download"),
 ]
@@ -1,3 +1,40 @@
-from django.shortcuts import render
+from django.contrib.auth.decorators import login_required
+from django.http import Http404, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from orders.models import Order
 
-# Create your views here.
+from tickets.downloads import TICKET_ARCHIVE_FORMATS
+
+TICKET_DOWNLOAD_CHUNK_SIZE = 200
+
+
+@login_required
+def download_order_tickets(request, order_key):
+    """
+    Stream every ticket of one of the user's orders as a single download.
+
+    - Only the owner of the order can download its tickets; other users get a 404.
+    - The `format` query parameter selects a multi-page PDF ("pdf", default)
+      or a ZIP archive of PNG images ("zip").
+    - QR codes are rendered lazily from each ticket's `final_key` while the
+      response is streamed, instead of being fetched from the media storage.
+    """
+    order = get_object_or_404(Order, order_key=order_key, user=request.user)
+
+    file_format = request.GET.get("format", "pdf")
+    if file_format not in TICKET_ARCHIVE_FORMATS:
+        raise Http404("Format de téléchargement inconnu.")
+    iter_archive, content_type = TICKET_ARCHIVE_FORMATS[file_format]
+
+    tickets = (
+        order.tickets.only(
+            "order_id", "offer_id", "unique_suffix", "final_key", "created_at"
+        )
+        .order_by("id")
+        .iterator(chunk_size=TICKET_DOWNLOAD_CHUNK_SIZE)
+    )
+    response = StreamingHttpResponse(iter_archive(tickets), content_type=content_type)
+    response["Content-Disposition"] = (
+        f'attachment; filename="billets-commande-{order.id}.{file_format}"'
+    )
+    return response